@@ -0,0 +1,182 @@
+import json
+import numpy as np
+
+from trajectory import Trajectory
+from typing import List, Dict
+from struct import Struct, error as StructError
+from mmap import mmap, ACCESS_READ
+from robot import Robot
+
+
+class Bundle:
+    """
+    A class for reading a trajectory bundle - a single file that packs many generated trajectories together with the
+    robot profile they were generated for. The file's layout is:
+      [magic: 4 bytes][version: uint32][header length: uint32][header: JSON][padding][tables]
+    The JSON header holds the robot profile, the table's columns and an index entry for each trajectory with its name,
+    dtype, byte offset (relative to the start of the tables) and number of rows. Every table is aligned to 8 bytes.
+    The bundle is memory-mapped when opened, so loading a trajectory only slices its table out of the mapping - nothing
+    but the selected table is ever read from the disk. Close the bundle (or use it as a context manager) to release the
+    mapping, so the file can be rewritten or deleted.
+    """
+
+    MAGIC = b'DBTB'
+    VERSION = 1
+    PREFIX = Struct('<4sII')
+    ALIGNMENT = 8
+
+    def __init__(self, filename: str):
+        """
+        Opens a bundle file.
+        :param filename: The filename of the bundle
+        """
+        self.filename = filename
+        self.file = open(filename, 'rb')
+        try:
+            self.mapping = mmap(self.file.fileno(), 0, access=ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise ValueError('{} is not a trajectory bundle'.format(filename))
+        self.data = np.frombuffer(self.mapping, dtype=np.uint8)
+
+        # The file and the mapping are released if the header can't be read
+        try:
+            self.read_header()
+        except ValueError:
+            self.close()
+            raise
+        except (StructError, KeyError, TypeError) as e:
+            self.close()
+            raise ValueError('{} is a truncated or corrupted trajectory bundle'.format(filename)) from e
+
+    def read_header(self):
+        magic, version, header_length = Bundle.PREFIX.unpack_from(self.data, 0)
+        if magic != Bundle.MAGIC:
+            raise ValueError('{} is not a trajectory bundle'.format(self.filename))
+        if version != Bundle.VERSION:
+            raise ValueError('Unsupported bundle version: {}'.format(version))
+
+        start = Bundle.PREFIX.size
+        if start + header_length > len(self.data):
+            raise ValueError('{} is a truncated trajectory bundle'.format(self.filename))
+
+        self.header = json.loads(bytes(self.data[start:start + header_length]).decode('utf-8'))
+        self.tables_offset = Bundle.align(start + header_length)
+        self.index = {entry['name']: entry for entry in self.header['paths']}
+
+    def close(self):
+        """
+        Releases the memory mapping and the file. The loaded tables are views into the mapping, so they should be
+        released (or copied) before closing the bundle.
+        """
+        if self.mapping is None:
+            return
+
+        self.data = None
+        try:
+            self.mapping.close()
+        except BufferError:
+            self.data = np.frombuffer(self.mapping, dtype=np.uint8)
+            raise ValueError('Some of the tables loaded from {} are still in use'.format(self.filename))
+
+        self.mapping = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @staticmethod
+    def align(offset: int) -> int:
+        return -(-offset // Bundle.ALIGNMENT) * Bundle.ALIGNMENT
+
+    @staticmethod
+    def write(filename: str, trajectories: List[Trajectory], robot: Robot = None):
+        """
+        Generates the given trajectories and packs them into a bundle file.
+        :param filename: The filename of the bundle
+        :param trajectories: The trajectories to pack. Their names should be unique
+        :param robot: The robot profile to store. Defaults to the robot of the first trajectory
+        """
+        names = [trajectory.name for trajectory in trajectories]
+        if len(set(names)) != len(names):
+            raise ValueError('The bundled trajectories should have unique names')
+
+        Bundle.write_tables(
+            filename,
+            {trajectory.name: trajectory.table() for trajectory in trajectories},
+            trajectories[0].robot if robot is None else robot
+        )
+
+    @staticmethod
+    def write_tables(filename: str, tables: Dict[str, np.ndarray], robot: Robot):
+        """
+        Packs already generated tables into a bundle file.
+        :param filename: The filename of the bundle
+        :param tables: The tables to pack, by their trajectory's name
+        :param robot: The robot profile to store
+        """
+        entries = []
+        offset = 0
+        for (name, table) in tables.items():
+            entries.append({
+                'name': name,
+                'dtype': table.dtype.str,
+                'offset': offset,
+                'rows': len(table)
+            })
+            offset = Bundle.align(offset + table.nbytes)
+
+        header = json.dumps({
+            'robot': robot.to_dict(),
+            'fields': Trajectory.TABLE_FIELDS,
+            'paths': entries
+        }).encode('utf-8')
+
+        with open(filename, 'wb') as file:
+            file.write(Bundle.PREFIX.pack(Bundle.MAGIC, Bundle.VERSION, len(header)))
+            file.write(header)
+            start = Bundle.align(file.tell())
+            file.write(bytes(start - file.tell()))
+
+            for (entry, table) in zip(entries, tables.values()):
+                file.write(bytes(start + entry['offset'] - file.tell()))
+                file.write(np.ascontiguousarray(table).tobytes())
+
+    @property
+    def names(self) -> List[str]:
+        return [entry['name'] for entry in self.header['paths']]
+
+    @property
+    def fields(self) -> List[str]:
+        return self.header['fields']
+
+    def robot(self) -> Robot:
+        """
+        :return: The robot profile the bundled trajectories were generated for
+        """
+        return Robot.from_dict(self.header['robot'])
+
+    def load(self, name: str) -> np.ndarray:
+        """
+        Loads the table of a single trajectory. The result is a read-only view into the memory-mapped file.
+        :param name: The name of the trajectory
+        :return: The trajectory's table, shaped (rows, len(fields))
+        """
+        if self.mapping is None:
+            raise ValueError('The bundle {} is closed'.format(self.filename))
+
+        entry = self.index[name]
+        dtype = np.dtype(entry['dtype'])
+        start = self.tables_offset + entry['offset']
+        count = entry['rows'] * len(self.fields)
+
+        return np.frombuffer(self.data, dtype=dtype, count=count, offset=start).reshape(-1, len(self.fields))
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.load(name)
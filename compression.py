@@ -0,0 +1,112 @@
+import json
+import zlib
+import numpy as np
+
+from typing import Dict, List, Tuple, Union
+from struct import Struct
+
+# The integer types the encoded columns may be stored in, from the smallest
+INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+# A compressed file starts with the length of its JSON header
+HEADER_PREFIX = Struct('<I')
+
+# Keeps the quantization step a hair under 2 * max_error, so the rounding of x / step can't push the error over it
+STEP_MARGIN = 1 - 1e-6
+
+
+def encode_column(column: np.ndarray, max_error: float) -> Tuple[np.ndarray, float]:
+    """
+    Encodes a column of smooth samples within the given maximum error. The column is quantized to integer multiples of
+    a step of 2 * max_error (so rounding errs by at most max_error), and then the second order differences of the
+    integers are taken - for densely sampled smooth functions they're tiny, so they fit in a small integer type and
+    compress very well.
+    :param column: The column to encode
+    :param max_error: The maximum absolute error of the decoded values
+    :return: A tuple: (the encoded differences, the quantization step)
+    """
+    if not max_error > 0:
+        raise ValueError('The maximum error should be positive, got {}'.format(max_error))
+    column = np.asarray(column, dtype=float)
+    if not np.isfinite(column).all():
+        raise ValueError('Only finite values can be encoded')
+
+    step = 2 * max_error * STEP_MARGIN
+
+    # The second order differences are up to 4 times the largest code, and they must not overflow the int64 type
+    if len(column) > 0 and np.abs(column).max() / step > np.iinfo(np.int64).max / 4:
+        raise ValueError('The values are too large to encode within a maximum error of {}'.format(max_error))
+    codes = np.rint(column / step).astype(np.int64)
+    differences = np.diff(codes, n=2, prepend=[0, 0]) if len(codes) > 0 else codes
+
+    for dtype in INTEGER_TYPES:
+        info = np.iinfo(dtype)
+        if len(differences) == 0 or (differences.min() >= info.min and differences.max() <= info.max):
+            return differences.astype(dtype), step
+
+
+def decode_column(differences: np.ndarray, step: float) -> np.ndarray:
+    """
+    Decodes a column that was encoded by encode_column.
+    :param differences: The encoded differences
+    :param step: The quantization step
+    :return: The decoded column
+    """
+    codes = np.cumsum(np.cumsum(differences, dtype=np.int64))
+    return codes * step
+
+
+def compress(filename: str, table: np.ndarray, fields: List[str], max_error: Union[float, Dict[str, float]]):
+    """
+    Compresses a table to a file, where every value is within max_error from the original one. The file's layout is:
+      [header length: uint32][header: JSON][zlib compressed encoded columns]
+    where the header holds the columns' names, quantization steps and integer types.
+    :param filename: The filename of the compressed file
+    :param table: The table to compress, shaped (rows, len(fields))
+    :param fields: The names of the table's columns
+    :param max_error: The maximum absolute error of the decoded values - either one for all columns or one per column
+    """
+    errors = max_error if isinstance(max_error, dict) else {field: max_error for field in fields}
+    columns = []
+    steps = []
+    for (i, field) in enumerate(fields):
+        column, step = encode_column(table[:, i], errors[field])
+        columns.append(column)
+        steps.append(step)
+
+    header = json.dumps({
+        'fields': fields,
+        'steps': steps,
+        'dtypes': [column.dtype.str for column in columns],
+        'rows': len(table)
+    }).encode('utf-8')
+
+    with open(filename, 'wb') as file:
+        file.write(HEADER_PREFIX.pack(len(header)))
+        file.write(header)
+        file.write(zlib.compress(b''.join(column.tobytes() for column in columns), 9))
+
+
+def decompress(filename: str) -> Tuple[np.ndarray, List[str]]:
+    """
+    Loads a compressed table.
+    :param filename: The filename of the compressed file
+    :return: A tuple: (table, fields)
+    """
+    with open(filename, 'rb') as file:
+        data = file.read()
+
+    header_length, = HEADER_PREFIX.unpack_from(data)
+    start = HEADER_PREFIX.size + header_length
+    header = json.loads(data[HEADER_PREFIX.size:start].decode('utf-8'))
+    payload = zlib.decompress(data[start:])
+
+    rows = header['rows']
+    table = np.empty((rows, len(header['fields'])))
+    offset = 0
+    for (i, (step, dtype)) in enumerate(zip(header['steps'], header['dtypes'])):
+        differences = np.frombuffer(payload, dtype=dtype, count=rows, offset=offset)
+        table[:, i] = decode_column(differences, step)
+        offset += differences.nbytes
+
+    return table, header['fields']
@@ -0,0 +1,182 @@
+import numpy as np
+
+from trajectory import Trajectory
+from typing import Dict, List, Union
+from time import perf_counter
+
+
+class ConvergenceStudy:
+    """
+    A class for measuring how the accuracy and the cost of a trajectory's outputs depend on its sample sizes. Each
+    setting (sample_size, length_sample_size) is compared against a high resolution reference of the same trajectory:
+    the setting's samples are interpolated linearly (like the robot does between consecutive table rows) to the
+    reference's samples of every segment, and the largest deviation of each quantity is its error:
+    - position - the distance between the interpolated and the reference points
+    - heading - the difference of the headings, in degrees
+    - wheel_speeds - the difference of the left and right wheel speeds
+    - distance - the difference of the distances passed, which also includes the length integrals' error
+    The setting's runtime is the best time of generating both the table and the distance. Since it depends on the
+    machine and its load, the settings are ranked by a deterministic cost model instead (see cost()).
+    """
+
+    # The quantities whose errors are measured
+    QUANTITIES = ['position', 'heading', 'wheel_speeds', 'distance']
+
+    # The curve evaluations a table row takes, relative to a single evaluation of a length integral's node
+    TABLE_COST = 10
+
+    def __init__(self,
+                 trajectory: Trajectory,
+                 reference_sample_size: int = 2000,
+                 reference_length_sample_size: int = 4000,
+                 repeats: int = 3):
+        """
+        Initializes a new study, and calculates its reference.
+        :param trajectory: The trajectory to study
+        :param reference_sample_size: The sample size of the reference
+        :param reference_length_sample_size: The length integral's sample size of the reference
+        :param repeats: The number of times to generate each setting when measuring its runtime
+        """
+        self.trajectory = trajectory
+        self.repeats = repeats
+        self.reference = ConvergenceStudy.sample(self.variant(reference_sample_size, reference_length_sample_size))
+        self.reference_params = np.linspace(0, 1, reference_sample_size + 1)
+
+    def variant(self, sample_size: int, length_sample_size: int) -> Trajectory:
+        """
+        Creates a copy of the studied trajectory with the given sample sizes.
+        """
+        return Trajectory(
+            self.trajectory.waypoints,
+            self.trajectory.robot,
+            self.trajectory.name,
+            self.trajectory.precision,
+            sample_size=sample_size,
+            length_sample_size=length_sample_size,
+            spline_type=self.trajectory.spline_type,
+            tangent_mode=self.trajectory.tangent_mode
+        )
+
+    @staticmethod
+    def cost(sample_size: int, length_sample_size: int) -> int:
+        """
+        Estimates the cost of generating a segment with the given setting, in curve evaluations. The distance takes a
+        length integral of length_sample_size nodes for each of the sample_size + 1 samples, and the table takes a
+        few evaluations per sample.
+        """
+        return (sample_size + 1) * (length_sample_size + ConvergenceStudy.TABLE_COST)
+
+    @staticmethod
+    def cheapest(measurements: List[Dict[str, float]]) -> Dict[str, float]:
+        """
+        Picks the measurement of the cheapest setting by the cost model, breaking ties by the sample sizes.
+        """
+        return min(measurements, key=lambda measurement: (
+            ConvergenceStudy.cost(measurement['sample_size'], measurement['length_sample_size']),
+            measurement['sample_size'],
+            measurement['length_sample_size']
+        ))
+
+    @staticmethod
+    def sample(trajectory: Trajectory) -> Dict[str, np.ndarray]:
+        """
+        Samples the studied quantities of a trajectory.
+        :param trajectory: The trajectory to sample
+        :return: A dictionary of arrays shaped (segments, sample_size + 1, columns), one for each quantity
+        """
+        shape = (trajectory.num_of_segments, trajectory.sample_size + 1, -1)
+        table = trajectory.table().astype(float).reshape(shape)
+        distance = np.array(trajectory.distance(concat=False))[..., 1:]
+        fields = Trajectory.TABLE_FIELDS
+
+        return {
+            'position': table[..., [fields.index('x'), fields.index('y')]],
+            'heading': np.unwrap(table[..., [fields.index('heading')]], period=360, axis=1),
+            'wheel_speeds': table[..., [fields.index('vleft'), fields.index('vright')]],
+            'distance': distance
+        }
+
+    def resample(self, values: np.ndarray) -> np.ndarray:
+        """
+        Interpolates sampled values linearly to the reference's samples, segment by segment.
+        :param values: The values to interpolate, shaped (segments, samples, columns)
+        :return: The interpolated values, shaped like the reference's values
+        """
+        params = np.linspace(0, 1, values.shape[1])
+        return np.array([
+            np.column_stack([np.interp(self.reference_params, params, column) for column in segment.T])
+            for segment in values
+        ])
+
+    def errors(self, sample_size: int, length_sample_size: int) -> Dict[str, float]:
+        """
+        Measures a single setting.
+        :param sample_size: The sample size to measure
+        :param length_sample_size: The length integral's sample size to measure
+        :return: A dictionary with the setting, its cost (see cost()), its runtime (in seconds) and the error of each
+                 quantity
+        """
+        trajectory = self.variant(sample_size, length_sample_size)
+
+        runtime = np.inf
+        for _ in range(self.repeats):
+            start = perf_counter()
+            trajectory.table()
+            trajectory.distance()
+            runtime = min(runtime, perf_counter() - start)
+
+        sampled = ConvergenceStudy.sample(trajectory)
+        differences = {name: self.resample(sampled[name]) - self.reference[name] for name in self.reference}
+        heading = np.abs(differences['heading']) % 360
+
+        return {
+            'sample_size': sample_size,
+            'length_sample_size': length_sample_size,
+            'cost': ConvergenceStudy.cost(sample_size, length_sample_size),
+            'runtime': runtime,
+            'position': np.sqrt((differences['position'] ** 2).sum(axis=-1)).max(),
+            'heading': np.minimum(heading, 360 - heading).max(),
+            'wheel_speeds': np.abs(differences['wheel_speeds']).max(),
+            'distance': np.abs(differences['distance']).max()
+        }
+
+    def run(self, sample_sizes: List[int], length_sample_sizes: List[int]) -> List[Dict[str, float]]:
+        """
+        Measures every combination of the given sample sizes.
+        :param sample_sizes: The sample sizes to measure
+        :param length_sample_sizes: The length integral's sample sizes to measure
+        :return: A list of the measurements (see errors()), one for each setting
+        """
+        return [
+            self.errors(sample_size, length_sample_size)
+            for sample_size in sample_sizes
+            for length_sample_size in length_sample_sizes
+        ]
+
+    def recommend(self,
+                  tolerance: Union[float, Dict[str, float]],
+                  sample_sizes: List[int] = (25, 50, 100, 200, 400),
+                  length_sample_sizes: List[int] = (50, 100, 200, 400, 600)) -> Dict[str, float]:
+        """
+        Finds the cheapest setting whose errors are all within the tolerance. The settings are ranked by the cost model
+        rather than by the measured runtime, so the recommendation is the same on every run and machine.
+        :param tolerance: The maximal error - either one for all quantities or one per quantity, by its name in
+                          QUANTITIES. Quantities without a tolerance aren't checked
+        :param sample_sizes: The sample sizes to consider
+        :param length_sample_sizes: The length integral's sample sizes to consider. Simpson's rule needs them even
+        :return: The measurement of the cheapest setting that meets the tolerance (see errors())
+        """
+        tolerances = tolerance if isinstance(tolerance, dict) else {name: tolerance for name in self.QUANTITIES}
+        for name in tolerances:
+            if name not in ConvergenceStudy.QUANTITIES:
+                raise ValueError('Unknown quantity: {}'.format(name))
+
+        candidates = [
+            measurement
+            for measurement in self.run(sample_sizes, length_sample_sizes)
+            if all(measurement[name] <= value for (name, value) in tolerances.items())
+        ]
+        if len(candidates) == 0:
+            raise ValueError('None of the settings meets the tolerance')
+
+        return ConvergenceStudy.cheapest(candidates)
@@ -0,0 +1,280 @@
+import json
+import numpy as np
+
+from trajectory import Trajectory, RobotSide
+from typing import List, Optional, Tuple
+from curve import CurveType
+from robot import Robot
+
+
+class Obstacle:
+    """
+    A class representing an axis-aligned rectangular obstacle on the field.
+    """
+
+    def __init__(self, x: float, y: float, width: float, height: float, color: str = None, name: str = 'obstacle'):
+        """
+        Initializes a new obstacle.
+        :param x: The x coordinate of the obstacle's bottom left corner, in meters
+        :param y: The y coordinate of the obstacle's bottom left corner, in meters
+        :param width: The obstacle's size in the x direction, in meters
+        :param height: The obstacle's size in the y direction, in meters
+        :param color: The color to draw the obstacle in
+        :param name: The name of the obstacle
+        """
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.color = color
+        self.name = name
+
+    @property
+    def bounds(self) -> Tuple[float, float, float, float]:
+        """
+        :return: The obstacle's bounds: (x0, y0, x1, y1)
+        """
+        return self.x, self.y, self.x + self.width, self.y + self.height
+
+
+class Collision:
+    """
+    A class describing the first collision of a robot's swept footprint with the field.
+    """
+
+    def __init__(self, index: int, left: np.ndarray, right: np.ndarray, obstacle: Optional[Obstacle]):
+        """
+        :param index: The index of the sample the colliding sweep starts from
+        :param left: The position of the robot's left side in the sample
+        :param right: The position of the robot's right side in the sample
+        :param obstacle: The obstacle the robot collided with. None if the robot left the field
+        """
+        self.index = index
+        self.left = left
+        self.right = right
+        self.obstacle = obstacle
+
+    def __repr__(self):
+        return 'Collision(index={}, obstacle={})'.format(
+            self.index,
+            'field border' if self.obstacle is None else self.obstacle.name
+        )
+
+
+class Field:
+    """
+    A class representing the field and its obstacles. The obstacles are stored in a uniform grid, where each cell
+    holds a mask of the obstacles that overlap it, so finding the obstacles near a sample costs a few lookups no matter
+    how many obstacles the field has.
+    Collisions are checked against the robot's footprint swept between every two consecutive samples of the robot's
+    left and right curves - the quad (L_i, R_i, R_i+1, L_i+1), split into two triangles. Each triangle is tested
+    against its candidate obstacles using the separating axis theorem, for all samples at once.
+    """
+
+    FEET_IN_METER = 0.3048
+
+    # The distance from the field's side wall to the left side of the robot in the start of every path, in meters
+    START_OFFSET = 0.91
+
+    # The tolerance of the field border checks, since paths usually start touching the wall
+    EPSILON = 1e-6
+
+    def __init__(self,
+                 width: float,
+                 height: float,
+                 obstacles: List[Obstacle],
+                 cell_size: float = 0.5,
+                 clearance: float = 0):
+        """
+        Initializes a new field.
+        :param width: The field's size in the x direction, in meters
+        :param height: The field's size in the y direction, in meters
+        :param obstacles: The obstacles on the field
+        :param cell_size: The size of each of the index's cells, in meters
+        :param clearance: The distance to keep from each obstacle, in meters
+        """
+        self.width = width
+        self.height = height
+        self.obstacles = obstacles
+        self.cell_size = cell_size
+        self.clearance = clearance
+
+        self.boxes = np.array([o.bounds for o in obstacles], dtype=float).reshape(-1, 4) + \
+            clearance * np.array([-1, -1, 1, 1])
+        self.shape = (max(int(np.ceil(width / cell_size)), 1), max(int(np.ceil(height / cell_size)), 1))
+
+        self.cells = np.zeros(self.shape + (len(obstacles),), dtype=bool)
+        lower = self.cell_of(self.boxes[:, :2])
+        upper = self.cell_of(self.boxes[:, 2:])
+        for (i, (l, u)) in enumerate(zip(lower, upper)):
+            self.cells[l[0]:u[0] + 1, l[1]:u[1] + 1, i] = True
+
+    @classmethod
+    def power_up(cls, **kwargs):
+        """
+        Creates the 2018 Power Up field, with the obstacles that are drawn in the plot output.
+        :return: A new Field instance
+        """
+        ft_m = cls.FEET_IN_METER
+        return cls(
+            width=8.21,
+            height=8.23 + 3 * ft_m,
+            obstacles=[
+                Obstacle(2.165, 3.556, 3.89, 1.4224, name='switch'),
+                Obstacle(2.41935, 6.6413, 3.2893, 4.5 * ft_m, color='r', name='platform'),
+                Obstacle(1.8179, 7.61, 3 * ft_m, 4 * ft_m, color='#00FF00', name='scale-left'),
+                Obstacle(1.8179 + 12 * ft_m, 7.61, 3 * ft_m, 4 * ft_m, color='#00FF00', name='scale-right')
+            ],
+            **kwargs
+        )
+
+    @classmethod
+    def from_json(cls, filename: str, **kwargs):
+        """
+        Creates a new field using a given JSON file.
+        :param filename: The filename of the JSON file
+        :return: A new Field instance
+        """
+        field = json.loads(open(filename, 'r').read())
+        return cls(
+            width=field['width'],
+            height=field['height'],
+            obstacles=[
+                Obstacle(
+                    x=obstacle['x'],
+                    y=obstacle['y'],
+                    width=obstacle['width'],
+                    height=obstacle['height'],
+                    color=obstacle.get('color'),
+                    name=obstacle.get('name', 'obstacle')
+                )
+                for obstacle in field['obstacles']
+            ],
+            **kwargs
+        )
+
+    @staticmethod
+    def path_offset(robot: Robot) -> np.ndarray:
+        """
+        Returns the offset between the trajectory's coordinates and the field's coordinates.
+        :param robot: The robot profile driving the trajectory
+        :return: The vector to add to the trajectory's points
+        """
+        return np.array([Field.START_OFFSET + robot.base_width / 2, 0])
+
+    def cell_of(self, points: np.ndarray) -> np.ndarray:
+        """
+        Returns the index's cells containing the given points, clipped to the grid.
+        :param points: The points, shaped (n, 2)
+        :return: The cells' indices, shaped (n, 2)
+        """
+        cells = np.floor(points / self.cell_size).astype(int)
+        return np.clip(cells, 0, np.array(self.shape) - 1)
+
+    def candidates(self, mins: np.ndarray, maxs: np.ndarray) -> np.ndarray:
+        """
+        Finds the obstacles that might overlap the given bounding boxes, using the grid.
+        :param mins: The bounding boxes' lower corners, shaped (n, 2)
+        :param maxs: The bounding boxes' upper corners, shaped (n, 2)
+        :return: A boolean mask shaped (n, obstacles)
+        """
+        lower = self.cell_of(mins)
+        upper = self.cell_of(maxs)
+        span = (upper - lower).max(axis=0) + 1
+
+        mask = np.zeros((len(mins), len(self.obstacles)), dtype=bool)
+        for dx in range(span[0]):
+            for dy in range(span[1]):
+                cx = lower[:, 0] + dx
+                cy = lower[:, 1] + dy
+                valid = (cx <= upper[:, 0]) & (cy <= upper[:, 1])
+                mask[valid] |= self.cells[cx[valid], cy[valid]]
+
+        return mask
+
+    @staticmethod
+    def triangles_overlap(triangles: np.ndarray, boxes: np.ndarray) -> np.ndarray:
+        """
+        Tests triangles against axis-aligned boxes using the separating axis theorem.
+        :param triangles: The triangles' vertices, shaped (n, 3, 2)
+        :param boxes: The boxes' bounds (x0, y0, x1, y1), shaped (n, 4)
+        :return: A boolean array shaped (n,), True where the triangle and the box overlap
+        """
+        tmin = triangles.min(axis=1)
+        tmax = triangles.max(axis=1)
+        overlap = (tmin[:, 0] <= boxes[:, 2]) & (tmax[:, 0] >= boxes[:, 0]) & \
+                  (tmin[:, 1] <= boxes[:, 3]) & (tmax[:, 1] >= boxes[:, 1])
+
+        edges = np.roll(triangles, -1, axis=1) - triangles
+        axes = np.stack([-edges[..., 1], edges[..., 0]], axis=-1)
+        corners = np.stack([
+            boxes[:, [0, 1]],
+            boxes[:, [2, 1]],
+            boxes[:, [2, 3]],
+            boxes[:, [0, 3]]
+        ], axis=1)
+
+        tproj = np.einsum('nad,nvd->nav', axes, triangles)
+        bproj = np.einsum('nad,nvd->nav', axes, corners)
+        separated = (tproj.max(axis=2) < bproj.min(axis=2)) | (bproj.max(axis=2) < tproj.min(axis=2))
+
+        return overlap & ~separated.any(axis=1)
+
+    def collisions(self, left: np.ndarray, right: np.ndarray, check_bounds: bool = True) -> np.ndarray:
+        """
+        Checks the swept footprint between every two consecutive samples for collisions.
+        :param left: The robot's left side positions, in field coordinates, shaped (n, 2)
+        :param right: The robot's right side positions, in field coordinates, shaped (n, 2)
+        :param check_bounds: Should leaving the field count as a collision
+        :return: An array shaped (n - 1,), holding the index of the obstacle each sweep collides with, -1 if it
+                 doesn't collide and len(obstacles) if it leaves the field
+        """
+        quads = np.stack([left[:-1], right[:-1], right[1:], left[1:]], axis=1)
+        mins = quads.min(axis=1)
+        maxs = quads.max(axis=1)
+        hits = np.full(len(quads), -1)
+
+        if len(self.obstacles) > 0:
+            sweeps, obstacles = np.nonzero(self.candidates(mins, maxs))
+            boxes = self.boxes[obstacles]
+            hit = self.triangles_overlap(quads[sweeps][:, [0, 1, 2]], boxes) | \
+                self.triangles_overlap(quads[sweeps][:, [0, 2, 3]], boxes)
+            # Assigning in reverse order keeps the first obstacle for sweeps that hit several
+            hits[sweeps[hit][::-1]] = obstacles[hit][::-1]
+
+        if check_bounds:
+            eps = Field.EPSILON
+            outside = (mins < -eps).any(axis=1) | (maxs[:, 0] > self.width + eps) | (maxs[:, 1] > self.height + eps)
+            hits[outside & (hits < 0)] = len(self.obstacles)
+
+        return hits
+
+    def first_collision(self, left: np.ndarray, right: np.ndarray, check_bounds: bool = True) -> Optional[Collision]:
+        """
+        Finds the first collision of the swept footprint.
+        :param left: The robot's left side positions, in field coordinates, shaped (n, 2)
+        :param right: The robot's right side positions, in field coordinates, shaped (n, 2)
+        :param check_bounds: Should leaving the field count as a collision
+        :return: The first collision, or None if the path is clear
+        """
+        hits = self.collisions(left, right, check_bounds)
+        colliding = np.flatnonzero(hits >= 0)
+        if len(colliding) == 0:
+            return None
+
+        i = colliding[0]
+        obstacle = self.obstacles[hits[i]] if hits[i] < len(self.obstacles) else None
+        return Collision(int(i), left[i], right[i], obstacle)
+
+    def check(self, trajectory: Trajectory, check_bounds: bool = True) -> Optional[Collision]:
+        """
+        Checks the given trajectory for collisions with the field.
+        :param trajectory: The trajectory to check
+        :param check_bounds: Should leaving the field count as a collision
+        :return: The first collision, or None if the path is clear
+        """
+        offset = Field.path_offset(trajectory.robot)
+        left = trajectory.robot_curve(CurveType.POSITION, RobotSide.LEFT) + offset
+        right = trajectory.robot_curve(CurveType.POSITION, RobotSide.RIGHT) + offset
+
+        return self.first_collision(left, right, check_bounds)
@@ -5,6 +5,7 @@ if __name__ == '__main__':
     traj = Trajectory.from_json('path1.json', 'mars.json')
     print(traj.robot.max_acceleration())
 
+    # The plot is saved as <trajectory name>.png (it used to be graph.png) - pass filename='graph.png' for the old name
     # plot = PlotOutput(trajectory=traj, field_width=8.23, field_height=8.21)
     # plot.render()
     #
@@ -0,0 +1,128 @@
+import numpy as np
+
+from trajectory import Trajectory
+from typing import Tuple
+from robot import Robot
+
+
+class MotorModel:
+    """
+    A DC motor model for calculating the feedforward voltages and currents of a trajectory's wheels ahead of time, so
+    the robot only has to look them up. Each motor is modeled as:
+      V = I * R + ke * v,    I = tau / kt + sign(v) * I_free
+    where v is the wheel's linear velocity and tau is the motor's torque. The motor constants are derived from the
+    robot's profile and the motor's datasheet currents:
+    - R = V_nominal / I_stall
+    - kt = stall_torque / I_stall, the torque per amp
+    - ke = (V_nominal - I_free * R) / free_speed, the back-EMF per m/s of the wheel
+    Each side of the drivetrain has half of the motors and carries half of the robot's mass, so the force needed for
+    a wheel acceleration a is (mass / 2) * a, and each of the side's motors supplies its share of it through the
+    gearbox: tau = (mass / 2) * a * wheel_radius / (gear_ratio * motors / 2).
+    """
+
+    # The columns of the feedforward table
+    FIELDS = ['aleft', 'aright', 'voltleft', 'voltright', 'currentleft', 'currentright', 'limits']
+
+    # The flags of the limits column
+    VOLTAGE_LIMIT = 1
+    CURRENT_LIMIT = 2
+
+    def __init__(self,
+                 stall_current: float = 131,
+                 free_current: float = 2.7,
+                 nominal_voltage: float = 12,
+                 current_limit: float = None):
+        """
+        Initializes a new motor model. The defaults are the CIM motor's specification.
+        :param stall_current: The motor's stall current, in A
+        :param free_current: The motor's free current, in A
+        :param nominal_voltage: The voltage the motor's specification is given for, which is also the highest voltage
+                                the motor can get
+        :param current_limit: The highest current each motor may draw, in A. Defaults to the stall current
+        """
+        self.stall_current = stall_current
+        self.free_current = free_current
+        self.nominal_voltage = nominal_voltage
+        self.current_limit = stall_current if current_limit is None else current_limit
+
+    @classmethod
+    def from_dict(cls, motor: dict):
+        return cls(
+            stall_current=motor['stall-current'],
+            free_current=motor['free-current'],
+            nominal_voltage=motor['nominal-voltage'],
+            current_limit=motor.get('current-limit')
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            'stall-current': self.stall_current,
+            'free-current': self.free_current,
+            'nominal-voltage': self.nominal_voltage,
+            'current-limit': self.current_limit
+        }
+
+    def constants(self, robot: Robot) -> Tuple[float, float, float]:
+        """
+        Calculates the motor's constants for the given robot.
+        :param robot: The robot profile
+        :return: A tuple: (resistance, kt, ke)
+        """
+        resistance = self.nominal_voltage / self.stall_current
+        kt = robot.stall_torque / self.stall_current
+        ke = (self.nominal_voltage - self.free_current * resistance) / robot.free_speed
+        return resistance, kt, ke
+
+    def voltages(self, robot: Robot, velocity: np.ndarray, acceleration: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Calculates the voltage and the current of each of a side's motors.
+        :param robot: The robot profile
+        :param velocity: The wheel's velocities, in m/s
+        :param acceleration: The wheel's accelerations, in m/s^2
+        :return: A tuple: (voltages, currents)
+        """
+        resistance, kt, ke = self.constants(robot)
+        motors = robot.num_of_drive_motors / 2
+        torque = (robot.mass / 2) * acceleration * robot.wheel_radius / (robot.gear_ratio * motors)
+        current = torque / kt + np.sign(velocity) * self.free_current
+        return current * resistance + ke * velocity, current
+
+    def feedforward(self, trajectory: Trajectory, table: np.ndarray = None) -> np.ndarray:
+        """
+        Calculates the feedforward table of a trajectory. The wheel accelerations are the time derivatives of the
+        table's wheel speeds, taken segment by segment (the boundary samples of consecutive segments share their time).
+        :param trajectory: The trajectory
+        :param table: The trajectory's table, if it was already generated
+        :return: An array shaped (samples, len(FIELDS)), with a row for each row of the trajectory's table. The limits
+                 column holds the VOLTAGE_LIMIT and CURRENT_LIMIT flags of the samples that exceed them
+        """
+        table = trajectory.table() if table is None else table
+        fields = Trajectory.TABLE_FIELDS
+        shape = (trajectory.num_of_segments, trajectory.sample_size + 1)
+
+        # The samples of each segment are evenly spaced in time
+        time = table[:, fields.index('time')].astype(float).reshape(shape)
+        step = (time[:, -1] - time[:, 0]) / trajectory.sample_size
+
+        speed = np.stack([table[:, fields.index(field)].astype(float).reshape(shape) for field in ['vleft', 'vright']])
+        acceleration = np.gradient(speed, axis=2) / step[:, None]
+        voltage, current = self.voltages(trajectory.robot, speed, acceleration)
+
+        voltage = voltage.reshape(2, -1)
+        current = current.reshape(2, -1)
+        acceleration = acceleration.reshape(2, -1)
+
+        limits = (
+            (np.abs(voltage) > self.nominal_voltage).any(axis=0) * MotorModel.VOLTAGE_LIMIT
+            + (np.abs(current) > self.current_limit).any(axis=0) * MotorModel.CURRENT_LIMIT
+        )
+
+        return np.column_stack([
+            acceleration[0],
+            acceleration[1],
+            voltage[0],
+            voltage[1],
+            current[0],
+            current[1],
+            limits
+        ])
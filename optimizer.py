@@ -0,0 +1,203 @@
+import numpy as np
+
+from curve import Curve, SplineType, CurveType
+from trajectory import Trajectory
+from waypoint import TangentMode
+from utils import linspace
+from typing import Tuple
+from enum import Enum
+
+
+class CostType(Enum):
+    CURVATURE = 1
+    DRIVE_TIME = 2
+
+
+class TangentOptimizer:
+    """
+    A class that chooses the derivative magnitudes of each of the trajectory's waypoints (the tangent and curvature
+    scales) in order to minimize a cost function over the whole path. The optimized variables are the vector
+    x = [a_0, ..., a_n, b_0, ..., b_n], where a_j is the first derivative's scale relative to the segment's length
+    and b_j is the second derivative's scale in the j-th waypoint.
+    Since the control points are linear in x, and the curve derivatives are linear in the control points, the gradient
+    of the cost is calculated analytically, for all segments at once:
+      dC/dx = dC/d(x', y', x'', y'') * d(x', y', x'', y'')/dP * dP/dx
+    The supported costs are:
+    1. CURVATURE - The integrated curvature squared, I k(s)^2 ds = I (x'y'' - y'x'')^2 / |p'|^5 du
+    2. DRIVE_TIME - The time it takes to drive the path when the outer wheel is capped by the free speed:
+       I (1 + |k(s)| * base_width / 2) / free_speed ds
+    """
+
+    # The bounds of the first derivative's scale, relative to the segment's length
+    TANGENT_BOUNDS = (0.25, 3.0)
+
+    # The bounds of the second derivative's scale
+    CURVATURE_BOUNDS = (-1.0, 1.0)
+
+    # Used to smooth the absolute value of the curvature in the drive time cost
+    EPSILON = 1e-9
+
+    def __init__(self,
+                 trajectory: Trajectory,
+                 cost_type: CostType = CostType.CURVATURE,
+                 samples: int = 65,
+                 regularization: float = 1e-3):
+        """
+        Initializes a new optimizer for the given trajectory.
+        :param trajectory: The trajectory to optimize the waypoints of
+        :param cost_type: The cost function to minimize
+        :param samples: The number of samples to use in each segment's integral
+        :param regularization: The weight of the penalty for drifting away from the initial scales
+        """
+        if trajectory.spline_type != SplineType.QUINTIC_HERMITE:
+            raise ValueError('The tangent optimizer only supports quintic Hermite trajectories')
+        if trajectory.tangent_mode != TangentMode.LOCAL:
+            raise ValueError('The tangent optimizer only supports trajectories with local tangents')
+
+        self.trajectory = trajectory
+        self.cost_type = cost_type
+        self.regularization = regularization
+
+        waypoints = trajectory.waypoints
+        self.points = waypoints.points
+        self.directions = waypoints.directions()
+        self.normals = waypoints.normals()
+        self.lengths = waypoints.distances()
+        self.initial = np.concatenate([waypoints.tangent_scales, waypoints.curvature_scales])
+
+        num_of_waypoints = len(waypoints)
+        self.lower = np.repeat([self.TANGENT_BOUNDS[0], self.CURVATURE_BOUNDS[0]], num_of_waypoints)
+        self.upper = np.repeat([self.TANGENT_BOUNDS[1], self.CURVATURE_BOUNDS[1]], num_of_waypoints)
+
+        # The basis rows for the first and second derivatives, shaped (samples, 6)
+        t = linspace(0, 1, samples=samples)
+        M = Curve.basis_matrix_for_type(SplineType.QUINTIC_HERMITE)
+        velocity = Curve.time_vector_for_type(SplineType.QUINTIC_HERMITE, CurveType.VELOCITY)
+        acceleration = Curve.time_vector_for_type(SplineType.QUINTIC_HERMITE, CurveType.ACCELERATION)
+        self.velocity_basis = velocity(t)[:, 0, :].T @ M
+        self.acceleration_basis = acceleration(t)[:, 0, :].T @ M
+
+        # Trapezoid integration weights
+        self.weights = np.full(samples, 1 / (samples - 1))
+        self.weights[[0, -1]] /= 2
+
+    def split(self, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Splits the optimization vector into the tangent scales and the curvature scales.
+        :param x: The optimization vector
+        :return: A tuple: (tangent_scales, curvature_scales)
+        """
+        n = len(self.points)
+        return x[:n], x[n:]
+
+    def control_points(self, x: np.ndarray) -> np.ndarray:
+        """
+        Calculates the control points of all segments for the given scales.
+        :param x: The optimization vector
+        :return: The control points, shaped (segments, 6, 2)
+        """
+        a, b = self.split(x)
+        lengths = self.lengths[:, None]
+        return np.stack([
+            self.points[:-1],
+            (a[:-1, None] * lengths) * self.directions[:-1],
+            b[:-1, None] * self.normals[:-1],
+            self.points[1:],
+            (a[1:, None] * lengths) * self.directions[1:],
+            b[1:, None] * self.normals[1:]
+        ], axis=1)
+
+    def cost(self, x: np.ndarray) -> Tuple[float, np.ndarray]:
+        """
+        Calculates the cost and its gradient for the given scales.
+        :param x: The optimization vector
+        :return: A tuple: (cost, gradient)
+        """
+        P = self.control_points(x)
+        d1 = np.einsum('nk,skd->snd', self.velocity_basis, P)
+        d2 = np.einsum('nk,skd->snd', self.acceleration_basis, P)
+        dx, dy = d1[..., 0], d1[..., 1]
+        d2x, d2y = d2[..., 0], d2[..., 1]
+
+        cross = dx * d2y - dy * d2x
+        q = dx ** 2 + dy ** 2
+
+        if self.cost_type == CostType.CURVATURE:
+            f = cross ** 2 * q ** -2.5
+            df_dcross = 2 * cross * q ** -2.5
+            df_dq = -2.5 * cross ** 2 * q ** -3.5
+        else:
+            free_speed = self.trajectory.robot.free_speed
+            c = self.trajectory.robot.base_width / 2
+            g = np.sqrt(cross ** 2 + TangentOptimizer.EPSILON)
+            f = (np.sqrt(q) + c * g / q) / free_speed
+            df_dcross = (c * (cross / g) / q) / free_speed
+            df_dq = (0.5 / np.sqrt(q) - c * g / q ** 2) / free_speed
+
+        w = self.weights
+        g1 = w[:, None] * np.stack([df_dcross * d2y + 2 * df_dq * dx, -df_dcross * d2x + 2 * df_dq * dy], axis=-1)
+        g2 = w[:, None] * np.stack([-df_dcross * dy, df_dcross * dx], axis=-1)
+        dP = np.einsum('snd,nk->skd', g1, self.velocity_basis) + np.einsum('snd,nk->skd', g2, self.acceleration_basis)
+
+        lengths = self.lengths[:, None]
+        da = np.zeros(len(self.points))
+        da[:-1] += ((dP[:, 1] * lengths) * self.directions[:-1]).sum(axis=1)
+        da[1:] += ((dP[:, 4] * lengths) * self.directions[1:]).sum(axis=1)
+
+        db = np.zeros(len(self.points))
+        db[:-1] += (dP[:, 2] * self.normals[:-1]).sum(axis=1)
+        db[1:] += (dP[:, 5] * self.normals[1:]).sum(axis=1)
+
+        delta = x - self.initial
+        value = (f * w).sum() + self.regularization * (delta ** 2).sum()
+        gradient = np.concatenate([da, db]) + 2 * self.regularization * delta
+
+        return value, gradient
+
+    def optimize(self, max_iterations: int = 500, tolerance: float = 1e-9, apply: bool = True) -> np.ndarray:
+        """
+        Minimizes the cost using projected gradient descent, with Barzilai-Borwein step sizes and an Armijo
+        backtracking line search that keeps the scales inside their bounds.
+        :param max_iterations: The maximum number of iterations
+        :param tolerance: The relative cost decrease under which the optimization stops
+        :param apply: Should the optimized scales be written to the trajectory's waypoints
+        :return: The optimized vector [tangent_scales, curvature_scales]
+        """
+        x = np.clip(self.initial, self.lower, self.upper)
+        value, gradient = self.cost(x)
+        step = 1e-2 / max(np.abs(gradient).max(), 1e-12)
+
+        for _ in range(max_iterations):
+            while True:
+                candidate = np.clip(x - step * gradient, self.lower, self.upper)
+                s = candidate - x
+                candidate_value, candidate_gradient = self.cost(candidate)
+                if np.isfinite(candidate_value) and candidate_value <= value + 1e-4 * gradient.dot(s):
+                    break
+                step /= 2
+                if step < 1e-16:
+                    break
+
+            y = candidate_gradient - gradient
+            converged = value - candidate_value <= tolerance * max(abs(value), 1)
+            if np.isfinite(candidate_value) and candidate_value <= value:
+                x, value, gradient = candidate, candidate_value, candidate_gradient
+            if converged or step < 1e-16:
+                break
+
+            sy = s.dot(y)
+            step = s.dot(s) / sy if sy > 0 else step * 2
+
+        if apply:
+            self.apply(x)
+
+        return x
+
+    def apply(self, x: np.ndarray):
+        """
+        Writes the given scales to the trajectory's waypoints.
+        :param x: The optimization vector
+        """
+        a, b = self.split(x)
+        self.trajectory.waypoints.tangent_scales[:] = a
+        self.trajectory.waypoints.curvature_scales[:] = b
@@ -1,19 +1,31 @@
 import matplotlib.pyplot as plot
 
-from numpy import arange, ndarray, array as nparray, concatenate as npconcat
+from numpy import arange, ndarray, array as nparray, concatenate as npconcat, interp, sqrt as npsqrt, \
+    column_stack as npcolumns
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from os import makedirs, path
 from utils import clamp_to_bounds, NpCompatible
 from simulation.simulator import DBugSimulator
 from trajectory import Trajectory, RobotSide
 from matplotlib.patches import Rectangle
 from simulation.particle import Particle
-from math import sin, cos, radians, sqrt
+from math import sin, cos, radians
 from abc import ABC, abstractmethod
 from typing import List, Tuple
-from curve import CurveType
+from curve import CurveType, SplineType
 from csv import DictWriter
+from json import dump
+from field import Field
+from compression import compress
+from motor import MotorModel
 
 
 class Output(ABC):
+    # Is rendering the output dominated by calculations rather than by writing files. Used by pipeline.RenderPipeline
+    # to pick the kind of worker that renders the output
+    CPU_BOUND = False
+
     def __init__(self, trajectory: Trajectory):
         self.trajectory = trajectory
 
@@ -24,12 +36,28 @@ class Output(ABC):
 
 class PlotOutput(Output, ABC):
     FEET_IN_METER = 0.3048
-
-    def __init__(self, trajectory: Trajectory, field_width: float, field_height: float):
+    CPU_BOUND = True
+
+    def __init__(self,
+                 trajectory: Trajectory,
+                 field_width: float,
+                 field_height: float,
+                 field: Field = None,
+                 filename: str = None):
+        """
+        An output that plots the trajectory on the field and saves the plot to an image file.
+        :param trajectory: The trajectory to output
+        :param field_width: The field's width, in meters
+        :param field_height: The field's height, in meters
+        :param field: The field to draw. Defaults to the Power Up field
+        :param filename: The filename of the output image. Defaults to the trajectory's name
+        """
         super(PlotOutput, self).__init__(trajectory)
 
         self.width = field_width
         self.height = field_height
+        self.field = Field.power_up() if field is None else field
+        self.filename = trajectory.name + '.png' if filename is None else filename
 
         self.fig = plot.figure(figsize=(15, 14.96), dpi=300)
         self.axes = plot.axes()
@@ -59,19 +87,13 @@ class PlotOutput(Output, ABC):
         self.axes.plot(ty[0:2], tx[0:2], 'k-')
 
     def setup_obstacles(self):
-        ft_m = PlotOutput.FEET_IN_METER
-
-        # Switch
-        switch = Rectangle((2.165, 3.556), 3.89, 1.4224)
-        self.axes.add_patch(switch)
-
-        # Scale
-        platform = Rectangle((2.41935, 6.6413), 3.2893, 4.5 * ft_m, color='r')
-        self.axes.add_patch(platform)
-        scale_left = Rectangle((1.8179, 7.61), 3 * ft_m, 4 * ft_m, color='#00FF00')
-        self.axes.add_patch(scale_left)
-        scale_right = Rectangle((1.8179 + 12 * ft_m, 7.61), 3 * ft_m, 4 * ft_m, color='#00FF00')
-        self.axes.add_patch(scale_right)
+        for obstacle in self.field.obstacles:
+            self.axes.add_patch(Rectangle(
+                (obstacle.x, obstacle.y),
+                obstacle.width,
+                obstacle.height,
+                color=obstacle.color
+            ))
 
     def plot_headings(self, shift_x: float, curve: ndarray, headings: List[float], resolution: int = 10):
         lh = len(headings)
@@ -89,22 +111,32 @@ class PlotOutput(Output, ABC):
             )
 
     def plot_control_points(self, shift_x: float, control_points: ndarray):
+        spline_type = self.trajectory.spline_type
+
         for points in control_points:
-            p0, v0, a0, p1, v1, a1 = points
+            if spline_type == SplineType.CUBIC_BEZIER:
+                # The Bézier control points are already absolute - plot the control polygon
+                self.axes.plot(points[:, 0] + shift_x, points[:, 1], 'rx--')
+                continue
+
+            if spline_type == SplineType.CUBIC_HERMITE:
+                p0, p1, v0, v1 = points
+            else:
+                p0, v0, a0, p1, v1, a1 = points
+                self.axes.plot(a0[0] + p0[0] + shift_x, a0[1] + p0[1], 'g8')
+                self.axes.plot(a1[0] + p1[0] + shift_x, a1[1] + p1[1], 'g8')
 
             self.axes.plot(p0[0] + shift_x, p0[1], 'bo')
             self.axes.plot(v0[0] + p0[0] + shift_x, v0[1] + p0[1], 'rx')
-            self.axes.plot(a0[0] + p0[0] + shift_x, a0[1] + p0[1], 'g8')
 
             self.axes.plot(p1[0] + shift_x, p1[1], 'bo')
             self.axes.plot(v1[0] + p1[0] + shift_x, v1[1] + p1[1], 'rx')
-            self.axes.plot(a1[0] + p1[0] + shift_x, a1[1] + p1[1], 'g8')
 
     def render(self):
         self.setup_plot()
         self.setup_obstacles()
 
-        shift_x = 0.91 + self.trajectory.robot.robot_info[3] / 2
+        shift_x = 0.91 + self.trajectory.robot.base_width / 2
 
         left_curve = self.trajectory.robot_curve(CurveType.POSITION, RobotSide.LEFT)
         middle_curve = self.trajectory.curve(CurveType.POSITION)
@@ -117,7 +149,8 @@ class PlotOutput(Output, ABC):
         self.plot_headings(shift_x, middle_curve, self.trajectory.headings()[0])
         self.plot_control_points(shift_x, self.trajectory.control_points())
 
-        self.fig.savefig('graph.png')
+        self.fig.savefig(self.filename)
+        plot.close(self.fig)
 
 
 class DesmosOutput(Output):
@@ -142,7 +175,7 @@ class DesmosOutput(Output):
         print('Right position:')
         print(self.format(self.trajectory.robot_curve(CurveType.POSITION, RobotSide.RIGHT)))
 
-        free_speed = self.trajectory.robot.chassis_info[0]
+        free_speed = self.trajectory.robot.free_speed
         vleft = self.trajectory.robot_speeds(RobotSide.LEFT)
         vright = self.trajectory.robot_speeds(RobotSide.RIGHT)
 
@@ -195,66 +228,122 @@ class DesmosOutput(Output):
 
 
 class CSVOutput(Output):
-    FIELDS = ['time', 'x', 'y', 'dx', 'dy', 'heading', 'vleft', 'vright', 'acceleration']
-
-    def __init__(self, trajectory: Trajectory, filename: str = None):
+    FIELDS = Trajectory.TABLE_FIELDS
+
+    def __init__(self, trajectory: Trajectory, filename: str = None, motor: MotorModel = None):
+        """
+        An output that writes the trajectory's table to a CSV file.
+        :param trajectory: The trajectory to output
+        :param filename: The filename of the output file. Defaults to the trajectory's name
+        :param motor: A motor model. If given, the feedforward columns (MotorModel.FIELDS) are added to the table
+        """
         super().__init__(trajectory)
 
         fname = trajectory.name + '.csv' if filename is None else filename
+        self.motor = motor
+        self.fields = CSVOutput.FIELDS + (MotorModel.FIELDS if motor is not None else [])
         self.file = open(fname, 'w', newline='')
-        self.writer = DictWriter(self.file, fieldnames=CSVOutput.FIELDS)
+        self.writer = DictWriter(self.file, fieldnames=self.fields)
 
     def render(self):
         self.writer.writeheader()
 
-        num_of_samples = self.trajectory.num_of_segments * (Trajectory.SAMPLE_SIZE + 1)
-
-        middle_position = self.trajectory.curve(CurveType.POSITION, concat=True)
-        middle_velocity = self.trajectory.curve(CurveType.VELOCITY, concat=True)
-        middle_acceleration = self.trajectory.curve(CurveType.ACCELERATION, concat=True)
-        headings = self.trajectory.headings()[0]
-        left_speed = self.trajectory.robot_speeds(RobotSide.LEFT)
-        right_speed = self.trajectory.robot_speeds(RobotSide.RIGHT)
-
-        for i in range(num_of_samples):
-            self.writer.writerow({
-                'time': left_speed[i][0],
-                'x': middle_position[i, 0],
-                'y': middle_position[i, 1],
-                'dx': middle_velocity[i, 0],
-                'dy': middle_velocity[i, 1],
-                'heading': 90 - headings[i],
-                'vleft': left_speed[i][1],
-                'vright': right_speed[i][1],
-                'acceleration': sqrt(middle_acceleration[i, 0] ** 2 + middle_acceleration[i, 1] ** 2)
-            })
+        table = self.trajectory.table()
+        if self.motor is not None:
+            table = npcolumns([table, self.motor.feedforward(self.trajectory, table)])
+
+        for row in table:
+            self.writer.writerow(dict(zip(self.fields, row)))
+
+        self.file.flush()
+
+
+class CompressedOutput(Output):
+    def __init__(self, trajectory: Trajectory, max_error: float = 1e-4, filename: str = None):
+        """
+        An output that writes the same table as CSVOutput, compressed so that every value is within max_error from
+        the CSV's value. Load it back using compression.decompress.
+        :param trajectory: The trajectory to output
+        :param max_error: The maximum absolute error of each value - either one for all columns or a dictionary of
+                          one per column
+        :param filename: The filename of the output file. Defaults to the trajectory's name
+        """
+        super().__init__(trajectory)
+
+        self.max_error = max_error
+        self.filename = trajectory.name + '.dtc' if filename is None else filename
+
+    def render(self):
+        compress(self.filename, self.trajectory.table(), Trajectory.TABLE_FIELDS, self.max_error)
+
+
+class CoefficientOutput(Output):
+    def __init__(self, trajectory: Trajectory, filename: str = None):
+        """
+        An output that writes the polynomial coefficients of each of the trajectory's segments instead of samples,
+        together with the segments' time spans and the robot profile. The robot evaluates the curves on its own using
+        spline_evaluator.SplineEvaluator, so the file's size doesn't depend on the sample size.
+        :param trajectory: The trajectory to output
+        :param filename: The filename of the output file. Defaults to the trajectory's name
+        """
+        super().__init__(trajectory)
+
+        self.filename = trajectory.name + '.coef.json' if filename is None else filename
+
+    def render(self):
+        times = self.trajectory.waypoints.times
+        segments = [
+            {
+                'start': float(times[i]),
+                'end': float(times[i + 1]),
+                'x': coefficients[:, 0].tolist(),
+                'y': coefficients[:, 1].tolist()
+            }
+            for (i, coefficients) in enumerate(c.coefficients() for c in self.trajectory.curves())
+        ]
+
+        with open(self.filename, 'w') as file:
+            dump({
+                'name': self.trajectory.name,
+                'robot': self.trajectory.robot.to_dict(),
+                'segments': segments
+            }, file, separators=(',', ':'))
 
 
 class SimpulationOutput(Output):
     FEET_IN_METER = 0.3048
 
-    def __init__(self, trajectory: Trajectory, field_width: float, field_height: float):
+    def __init__(self,
+                 trajectory: Trajectory,
+                 field_width: float,
+                 field_height: float,
+                 show_frame_times: bool = False,
+                 offscreen: bool = False):
         super(SimpulationOutput, self).__init__(trajectory)
 
         self.width = field_width
         self.height = field_height
         self.window_dimensions = (round(100 * field_width), round(100 * field_height))
-        self.sim = DBugSimulator(graph_dimensions=self.window_dimensions, name=trajectory.name, border=50)
+        self.sim = DBugSimulator(
+            graph_dimensions=self.window_dimensions,
+            name=trajectory.name,
+            border=50,
+            show_frame_times=show_frame_times,
+            offscreen=offscreen
+        )
 
-    def render_curve_output(self, points: NpCompatible, shift_x: float, color: Tuple[int, int ,int]):
-        self.sim.render_points([
-            Particle(
-                ((p[0] + shift_x) * 100, -p[1] * 100),
-                1,
-                origin=(50, self.window_dimensions[1] - 50),
-                color=color
-            )
-            for p in points
-        ])
+    def particle(self, point: NpCompatible, shift_x: float, color: Tuple[int, int, int]) -> Particle:
+        return Particle(
+            ((point[0] + shift_x) * 100, -point[1] * 100),
+            1,
+            origin=(50, self.window_dimensions[1] - 50),
+            color=color
+        )
 
-    def render(self):
-        shift_x = 0.91 + self.trajectory.robot.robot_info[3] / 2
+    def render_curve_output(self, points: NpCompatible, shift_x: float, color: Tuple[int, int ,int]):
+        self.sim.render_points([self.particle(p, shift_x, color) for p in points])
 
+    def render_curves(self, shift_x: float):
         self.render_curve_output(
             points=self.trajectory.robot_curve(CurveType.POSITION, RobotSide.LEFT),
             shift_x=shift_x,
@@ -273,4 +362,122 @@ class SimpulationOutput(Output):
             color=(0, 255, 0)
         )
 
+    def render(self):
+        self.render_curves(shift_x=0.91 + self.trajectory.robot.base_width / 2)
         self.sim.loop()
+
+
+class RecordingOutput(SimpulationOutput):
+    IMAGE_FORMATS = ['png', 'bmp', 'tga', 'jpg']
+    CPU_BOUND = True
+
+    def __init__(self,
+                 trajectory: Trajectory,
+                 field_width: float,
+                 field_height: float,
+                 directory: str = None,
+                 timestep: float = 0.02,
+                 image_format: str = 'png'):
+        """
+        An output that renders the simulation offscreen, without a window, and writes it as a sequence of images.
+        The robot is stepped through the trajectory at a fixed simulated timestep, and the frames are rendered as fast
+        as possible instead of in real time.
+        :param trajectory: The trajectory to output
+        :param field_width: The width of the field
+        :param field_height: The height of the field
+        :param directory: The directory to write the frames to. Defaults to the trajectory's name with a -frames suffix
+        :param timestep: The simulated time between consecutive frames, in seconds
+        :param image_format: The format of the frames, one of IMAGE_FORMATS. Encoding PNG takes most of the rendering
+                             time, while the uncompressed BMP and TGA are several times faster to write
+        """
+        super(RecordingOutput, self).__init__(trajectory, field_width, field_height, offscreen=True)
+
+        if image_format not in RecordingOutput.IMAGE_FORMATS:
+            raise ValueError('Unsupported image format: {}'.format(image_format))
+
+        self.directory = trajectory.name + '-frames' if directory is None else directory
+        self.timestep = timestep
+        self.image_format = image_format
+
+    def render(self) -> List[str]:
+        """
+        Renders the frames.
+        :return: The filenames of the frames, by their order
+        """
+        shift_x = 0.91 + self.trajectory.robot.base_width / 2
+        self.render_curves(shift_x)
+
+        fields = Trajectory.TABLE_FIELDS
+        table = self.trajectory.table().astype(float)
+        time = table[:, fields.index('time')]
+        times = arange(time[0], time[-1] + self.timestep / 2, self.timestep)
+        x, y, dx, dy = [interp(times, time, table[:, fields.index(field)]) for field in ['x', 'y', 'dx', 'dy']]
+        norm = npsqrt(dx ** 2 + dy ** 2)
+        radius = self.trajectory.robot.base_width / 2
+
+        makedirs(self.directory, exist_ok=True)
+        filenames = []
+        for i in range(len(times)):
+            center = (x[i], y[i])
+            front = (x[i] + radius * dx[i] / norm[i], y[i] + radius * dy[i] / norm[i])
+            self.sim.render_background()
+            self.sim.render_robot(
+                self.particle(center, shift_x, (0, 0, 255)),
+                self.particle(front, shift_x, (0, 0, 255)),
+                round(radius * 100)
+            )
+
+            filename = path.join(self.directory, '%s-%05d.%s' % (self.trajectory.name, i, self.image_format))
+            self.sim.save_frame(filename)
+            filenames.append(filename)
+
+        return filenames
+
+
+def record_trajectory(trajectory: Trajectory,
+                      field_width: float,
+                      field_height: float,
+                      directory: str,
+                      timestep: float = 0.02,
+                      image_format: str = 'png') -> List[str]:
+    """
+    Records a single trajectory with a RecordingOutput. Defined in the module level so it could be sent to a worker
+    process.
+    :return: The filenames of the recorded frames
+    """
+    return RecordingOutput(trajectory, field_width, field_height, directory, timestep, image_format).render()
+
+
+def record_trajectories(trajectories: List[Trajectory],
+                        field_width: float,
+                        field_height: float,
+                        directory: str,
+                        timestep: float = 0.02,
+                        image_format: str = 'png',
+                        workers: int = None) -> List[List[str]]:
+    """
+    Records several trajectories, each one in a different process. The frames of each trajectory are written to a
+    sub-directory named after it.
+    :param trajectories: The trajectories to record. Their names should be unique
+    :param field_width: The width of the field
+    :param field_height: The height of the field
+    :param directory: The directory to write the recordings to
+    :param timestep: The simulated time between consecutive frames, in seconds
+    :param image_format: The format of the frames, one of RecordingOutput.IMAGE_FORMATS
+    :param workers: The maximum number of worker processes. 1 records the trajectories in the current process.
+    :return: The filenames of the recorded frames, for each trajectory
+    """
+    arguments = (
+        trajectories,
+        repeat(field_width),
+        repeat(field_height),
+        [path.join(directory, trajectory.name) for trajectory in trajectories],
+        repeat(timestep),
+        repeat(image_format)
+    )
+
+    if workers == 1:
+        return list(map(record_trajectory, *arguments))
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(record_trajectory, *arguments))
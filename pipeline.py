@@ -0,0 +1,223 @@
+import numpy as np
+
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+from trajectory import Trajectory, RobotSide
+from curve import Curve, CurveType, Precision
+from typing import Any, Dict, List, Tuple
+from utils import angle_from_slope
+from outputs import Output
+
+
+class SampleSet:
+    """
+    An immutable set of a trajectory's samples, calculated once and shared by any number of outputs. A sample set
+    stands in for the trajectory it was sampled from - it has the same attributes and sampling methods (table, curve,
+    robot_curve, headings, speed, robot_speeds, distance, control_points and curves), which return (read-only) slices of
+    the stored arrays instead of recalculating them, so the outputs render it without any change.
+    The arrays can be placed in shared memory (see share and attach), so worker processes read them without copying.
+    """
+
+    # The stored arrays
+    ARRAYS = ['table', 'left', 'right', 'angular', 'distance']
+
+    # The trajectory's attributes that are kept
+    ATTRIBUTES = [
+        'name', 'robot', 'waypoints', 'num_of_segments', 'precision', 'sample_size', 'length_sample_size',
+        'spline_type', 'tangent_mode'
+    ]
+
+    def __init__(self, attributes: Dict[str, Any], arrays: Dict[str, np.ndarray]):
+        """
+        Initializes a new sample set. Use from_trajectory to sample a trajectory.
+        :param attributes: The sampled trajectory's attributes, by their name in ATTRIBUTES
+        :param arrays: The sampled arrays, by their name in ARRAYS
+        """
+        for name in SampleSet.ATTRIBUTES:
+            setattr(self, name, attributes[name])
+
+        self.arrays = {}
+        for name in SampleSet.ARRAYS:
+            array = arrays[name].view()
+            array.flags.writeable = False
+            self.arrays[name] = array
+
+    @classmethod
+    def from_trajectory(cls, trajectory: Trajectory):
+        """
+        Samples a trajectory.
+        :param trajectory: The trajectory to sample
+        :return: A new instance of SampleSet
+        """
+        return cls({name: getattr(trajectory, name) for name in SampleSet.ATTRIBUTES}, {
+            'table': trajectory.table(),
+            'left': trajectory.robot_curve(CurveType.POSITION, RobotSide.LEFT),
+            'right': trajectory.robot_curve(CurveType.POSITION, RobotSide.RIGHT),
+            'angular': trajectory.headings()[1],
+            'distance': trajectory.distance()
+        })
+
+    def share(self) -> Tuple[SharedMemory, dict]:
+        """
+        Copies the arrays to a new shared memory block. The caller owns the block, and should close and unlink it
+        once the workers are done with it.
+        :return: A tuple: (block, handle), where the handle is a small picklable description of the sample set that
+                 attach accepts
+        """
+        layout = []
+        offset = 0
+        for name in SampleSet.ARRAYS:
+            array = self.arrays[name]
+            layout.append((name, array.dtype.str, array.shape, offset))
+            offset += -(-array.nbytes // 8) * 8
+
+        block = SharedMemory(create=True, size=max(offset, 1))
+        for (name, dtype, shape, start) in layout:
+            np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=start)[...] = self.arrays[name]
+
+        attributes = {name: getattr(self, name) for name in SampleSet.ATTRIBUTES}
+        return block, {'block': block.name, 'layout': layout, 'attributes': attributes}
+
+    @classmethod
+    def attach(cls, handle: dict) -> Tuple[SharedMemory, 'SampleSet']:
+        """
+        Attaches to a sample set that was shared by another process. The arrays are views into the shared block.
+        :param handle: The handle returned by share
+        :return: A tuple: (block, sample_set). Close the block after the sample set is no longer used
+        """
+        block = SharedMemory(name=handle['block'])
+        arrays = {
+            name: np.ndarray(shape, dtype=dtype, buffer=block.buf, offset=offset)
+            for (name, dtype, shape, offset) in handle['layout']
+        }
+        return block, cls(handle['attributes'], arrays)
+
+    def split(self, array: np.ndarray, concat: bool):
+        return array if concat else np.split(array, self.num_of_segments)
+
+    def column(self, *fields: str) -> np.ndarray:
+        return self.arrays['table'][:, [Trajectory.TABLE_FIELDS.index(field) for field in fields]]
+
+    def table(self) -> np.ndarray:
+        return self.arrays['table']
+
+    def control_points(self) -> np.ndarray:
+        return self.waypoints.control_points(self.spline_type, self.tangent_mode)
+
+    def curves(self, precision: Precision = None) -> List[Curve]:
+        precision = self.precision if precision is None else precision
+        return [
+            Curve(control_points=points, spline_type=self.spline_type, precision=precision)
+            for points in self.control_points()
+        ]
+
+    def curve(self, curve_type: CurveType, concat: bool = True):
+        if curve_type == CurveType.POSITION:
+            return self.split(self.column('x', 'y'), concat)
+        if curve_type == CurveType.VELOCITY:
+            return self.split(self.column('dx', 'dy'), concat)
+        raise ValueError('A sample set only holds the position and velocity curves')
+
+    def speed(self, concat: bool = True):
+        dx, dy = self.column('dx', 'dy').astype(float).T
+        return self.split(np.column_stack([self.column('time')[:, 0], np.sqrt(dx ** 2 + dy ** 2)]), concat)
+
+    def headings(self):
+        dx, dy = self.column('dx', 'dy').astype(float).T
+        return angle_from_slope(dx, dy), self.arrays['angular']
+
+    def robot_curve(self, curve_type: CurveType, side: RobotSide):
+        if curve_type != CurveType.POSITION:
+            raise ValueError('A sample set only holds the robot position curves')
+        return self.arrays['left' if side == RobotSide.LEFT else 'right']
+
+    def robot_speeds(self, side: RobotSide):
+        return self.column('time', 'vleft' if side == RobotSide.LEFT else 'vright')
+
+    def distance(self, concat: bool = True):
+        return self.split(self.arrays['distance'], concat)
+
+
+def render_output(output_class: type, kwargs: dict, samples: SampleSet):
+    """
+    Renders a single output of a sample set.
+    :param output_class: The output's class
+    :param kwargs: The keyword arguments of the output's constructor, other than the trajectory
+    :param samples: The sample set to render
+    :return: The value returned by the output's render
+    """
+    return output_class(samples, **kwargs).render()
+
+
+def render_shared_output(output_class: type, kwargs: dict, handle: dict):
+    """
+    Renders a single output of a shared sample set. Defined in the module level so it could be sent to a worker
+    process.
+    """
+    block, samples = SampleSet.attach(handle)
+    try:
+        return render_output(output_class, kwargs, samples)
+    finally:
+        del samples
+        block.close()
+
+
+class RenderPipeline:
+    """
+    A pipeline that renders several outputs of each trajectory out of a single sample set. The trajectory is sampled
+    once, and the outputs are rendered concurrently: outputs that mostly write files (Output.CPU_BOUND is False) run
+    on a thread pool and read the sample set directly, while the CPU bound ones run on a process pool and read it from
+    shared memory, so the samples are never copied or pickled. The total time approaches the time of the slowest
+    output rather than the sum of all of them.
+    """
+
+    def __init__(self, outputs: List[Tuple[type, dict]], threads: int = None, processes: int = None):
+        """
+        Initializes a new pipeline.
+        :param outputs: The outputs to render for each trajectory, as (output_class, kwargs) pairs, where kwargs are
+                        the constructor's arguments other than the trajectory. Note that the filenames of most outputs
+                        default to the trajectory's name, so the same kwargs fit all of the trajectories
+        :param threads: The maximum number of threads for the I/O bound outputs
+        :param processes: The maximum number of processes for the CPU bound outputs
+        """
+        for (output_class, _) in outputs:
+            if not issubclass(output_class, Output):
+                raise ValueError('{} is not an output'.format(output_class.__name__))
+
+        self.outputs = outputs
+        self.threads = threads
+        self.processes = processes
+
+    def render(self, trajectories: List[Trajectory]) -> List[List[Any]]:
+        """
+        Samples the trajectories and renders all of the outputs of each of them.
+        :param trajectories: The trajectories to render
+        :return: The values returned by the outputs' render, for each trajectory by the order of the outputs
+        """
+        samples = [SampleSet.from_trajectory(trajectory) for trajectory in trajectories]
+        blocks = []
+        try:
+            # The worker processes are spawned rather than forked, since the thread pool's threads are live meanwhile
+            processes = ProcessPoolExecutor(self.processes, mp_context=get_context('spawn'))
+            with ThreadPoolExecutor(self.threads) as threads, processes:
+                futures = []
+                for sample_set in samples:
+                    handle = None
+                    for (output_class, kwargs) in self.outputs:
+                        if not output_class.CPU_BOUND:
+                            futures.append(threads.submit(render_output, output_class, kwargs, sample_set))
+                            continue
+
+                        if handle is None:
+                            block, handle = sample_set.share()
+                            blocks.append(block)
+                        futures.append(processes.submit(render_shared_output, output_class, kwargs, handle))
+
+                results = [future.result() for future in futures]
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+
+        return [results[i:i + len(self.outputs)] for i in range(0, len(results), len(self.outputs))]
@@ -0,0 +1,291 @@
+import numpy as np
+
+from heapq import heappush, heappop
+from typing import List, Optional, Tuple
+from math import sqrt, degrees, atan2
+from waypoint import Waypoint
+from field import Field
+from robot import Robot
+from utils import Point
+
+
+class GridPlanner:
+    """
+    A class that finds a path between two points on the field and turns it into waypoints for a Trajectory.
+    The field is rasterized into an occupancy grid, where a cell is occupied if its center is within half of the
+    robot's base width from an obstacle. The grid is searched using A* over the 8-connected cells, with the octile
+    distance as an admissible heuristic, and the resulting chain of cells is simplified into a few waypoints by
+    keeping only the cells that the robot can't drive straight between. Corners that end up closer than a minimum
+    spacing are merged, since a sharp turn over a few centimeters makes the segments' curvature spike.
+    """
+
+    # The neighbours of a cell and the cost of moving to them, in cells
+    NEIGHBOURS = [
+        (1, 0, 1), (-1, 0, 1), (0, 1, 1), (0, -1, 1),
+        (1, 1, sqrt(2)), (1, -1, sqrt(2)), (-1, 1, sqrt(2)), (-1, -1, sqrt(2))
+    ]
+
+    def __init__(self,
+                 field: Field,
+                 robot: Robot,
+                 resolution: float = 0.1,
+                 speed: float = None,
+                 min_spacing: float = None):
+        """
+        Initializes a new planner, rasterizing the given field.
+        :param field: The field to plan the paths in
+        :param robot: The robot profile to plan the paths for
+        :param resolution: The size of each of the grid's cells, in meters
+        :param speed: The average speed used to calculate the waypoints' times, in m/s. Defaults to half of the
+                      robot's free speed
+        :param min_spacing: The minimum distance between two waypoints, in meters. Defaults to the robot's base width
+        """
+        self.field = field
+        self.robot = robot
+        self.resolution = resolution
+        self.offset = Field.path_offset(robot)
+        self.min_spacing = robot.base_width if min_spacing is None else min_spacing
+
+        free_speed = robot.free_speed
+        self.speed = speed if speed is not None else (free_speed / 2 if free_speed > 0 else 1)
+
+        self.shape = (int(np.ceil(field.width / resolution)), int(np.ceil(field.height / resolution)))
+        xs = (np.arange(self.shape[0]) + 0.5) * resolution
+        ys = (np.arange(self.shape[1]) + 0.5) * resolution
+        x, y = np.meshgrid(xs, ys, indexing='ij')
+
+        radius = robot.base_width / 2
+        boxes = field.boxes + radius * np.array([-1, -1, 1, 1])
+        self.occupancy = np.zeros(self.shape, dtype=bool)
+        for (x0, y0, x1, y1) in boxes:
+            self.occupancy |= (x >= x0) & (x <= x1) & (y >= y0) & (y <= y1)
+
+    def cell_of(self, point: Point) -> Tuple[int, int]:
+        """
+        Returns the grid cell that contains the given point.
+        :param point: The point, in field coordinates
+        :return: The cell's indices
+        """
+        return int(point[0] // self.resolution), int(point[1] // self.resolution)
+
+    def center_of(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Returns the centers of the given cells.
+        :param cells: The cells' indices, shaped (n, 2)
+        :return: The cells' centers in field coordinates, shaped (n, 2)
+        """
+        return (np.asarray(cells) + 0.5) * self.resolution
+
+    def is_free(self, cell: Tuple[int, int]) -> bool:
+        return 0 <= cell[0] < self.shape[0] and 0 <= cell[1] < self.shape[1] and not self.occupancy[cell]
+
+    def search(self, start: Tuple[int, int], goal: Tuple[int, int]) -> Optional[List[Tuple[int, int]]]:
+        """
+        Searches for the shortest chain of cells between the start and the goal, using A*.
+        :param start: The starting cell
+        :param goal: The goal cell
+        :return: The chain of cells from the start to the goal, or None if the goal can't be reached
+        """
+        if not self.is_free(start):
+            raise ValueError('The starting cell {} is blocked'.format(start))
+        if not self.is_free(goal):
+            raise ValueError('The goal cell {} is blocked'.format(goal))
+
+        nx, ny = self.shape
+        blocked = self.occupancy.ravel().tolist()
+        start_index = start[0] * ny + start[1]
+        goal_index = goal[0] * ny + goal[1]
+        gx, gy = goal
+        diagonal = sqrt(2) - 2
+
+        costs = {start_index: 0}
+        parents = {start_index: -1}
+        closed = bytearray(nx * ny)
+        heap = [(0, 0, start_index)]
+
+        while len(heap) > 0:
+            _, cost, index = heappop(heap)
+            if closed[index]:
+                continue
+            if index == goal_index:
+                break
+            closed[index] = 1
+
+            cx, cy = divmod(index, ny)
+            for (dx, dy, step) in GridPlanner.NEIGHBOURS:
+                x = cx + dx
+                y = cy + dy
+                if x < 0 or y < 0 or x >= nx or y >= ny:
+                    continue
+                neighbour = x * ny + y
+                if blocked[neighbour] or closed[neighbour]:
+                    continue
+                new_cost = cost + step
+                if new_cost < costs.get(neighbour, float('inf')):
+                    costs[neighbour] = new_cost
+                    parents[neighbour] = index
+                    ex = abs(x - gx)
+                    ey = abs(y - gy)
+                    heuristic = ex + ey + diagonal * min(ex, ey)
+                    heappush(heap, (new_cost + heuristic, new_cost, neighbour))
+        else:
+            return None
+
+        cells = []
+        index = goal_index
+        while index != -1:
+            cells.append(divmod(index, ny))
+            index = parents[index]
+
+        return cells[::-1]
+
+    def visible(self, p0: np.ndarray, targets: np.ndarray) -> np.ndarray:
+        """
+        Checks whether the straight lines from a point to each of the targets only pass through free cells.
+        :param p0: The starting point, in field coordinates
+        :param targets: The target points, in field coordinates, shaped (n, 2)
+        :return: A boolean array shaped (n,), True where the line is clear
+        """
+        deltas = targets - p0
+        samples = int(np.ceil(2 * np.hypot(deltas[:, 0], deltas[:, 1]).max() / self.resolution)) + 1
+        points = p0 + np.linspace(0, 1, samples)[None, :, None] * deltas[:, None, :]
+        cells = np.floor(points / self.resolution).astype(int)
+        inside = (cells >= 0).all(axis=2) & (cells[..., 0] < self.shape[0]) & (cells[..., 1] < self.shape[1])
+        cells = np.where(inside[..., None], cells, 0)
+
+        return (inside & ~self.occupancy[cells[..., 0], cells[..., 1]]).all(axis=1)
+
+    def simplify(self, points: np.ndarray) -> np.ndarray:
+        """
+        Simplifies a chain of points by jumping from each kept point to the furthest point that can be reached from it
+        in a straight line.
+        :param points: The chain of points, in field coordinates, shaped (n, 2)
+        :return: The simplified chain of points
+        """
+        kept = [0]
+        anchor = 0
+        while anchor < len(points) - 1:
+            visible = np.flatnonzero(self.visible(points[anchor], points[anchor + 1:]))
+            anchor += 1 + (visible[-1] if len(visible) > 0 else 0)
+            kept.append(anchor)
+
+        # Jumping greedily might keep redundant corners, so drop every kept point whose neighbours see each other
+        i = 1
+        while i < len(kept) - 1:
+            if self.visible(points[kept[i - 1]], points[kept[i + 1]][None, :])[0]:
+                del kept[i]
+            else:
+                i += 1
+
+        return points[kept]
+
+    @staticmethod
+    def intersection(a0: np.ndarray, a1: np.ndarray, b0: np.ndarray, b1: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Finds the intersection of the line through a0 and a1 with the line through b0 and b1.
+        :return: The intersection point, or None if the lines are parallel
+        """
+        da = a1 - a0
+        db = b1 - b0
+        cross = da[0] * db[1] - da[1] * db[0]
+        if abs(cross) < 1e-12:
+            return None
+        offset = b0 - a0
+        return a0 + da * (offset[0] * db[1] - offset[1] * db[0]) / cross
+
+    def merge(self, points: np.ndarray) -> np.ndarray:
+        """
+        Merges the consecutive points that are closer than the minimum spacing. A close pair is replaced by its
+        midpoint, by the corner where the lines from its neighbours meet, or by one of its points - whichever keeps the
+        lines to its neighbours clear. The first and the last points are never moved.
+        :param points: The chain of points, in field coordinates, shaped (n, 2)
+        :return: The merged chain of points
+        """
+        points = list(points)
+        i = 0
+        while i < len(points) - 1 and len(points) > 2:
+            if np.hypot(*(points[i + 1] - points[i])) >= self.min_spacing:
+                i += 1
+                continue
+
+            if i == 0:
+                candidates = [points[0]]
+            elif i == len(points) - 2:
+                candidates = [points[-1]]
+            else:
+                candidates = [(points[i] + points[i + 1]) / 2, points[i], points[i + 1]]
+                corner = GridPlanner.intersection(points[i - 1], points[i], points[i + 1], points[i + 2])
+                if corner is not None and np.hypot(*(corner - candidates[0])) < self.min_spacing:
+                    candidates.insert(1, corner)
+
+            for candidate in candidates:
+                clear_before = i == 0 or self.visible(points[i - 1], candidate[None, :])[0]
+                clear_after = i == len(points) - 2 or self.visible(candidate, points[i + 2][None, :])[0]
+                if clear_before and clear_after:
+                    points[i:i + 2] = [candidate]
+                    break
+            else:
+                i += 1
+
+        return np.array(points)
+
+    @staticmethod
+    def heading(direction: np.ndarray) -> float:
+        """
+        Converts a direction vector to a waypoint heading angle, which is measured from the y axis.
+        :param direction: The direction vector
+        :return: The heading angle, in degrees
+        """
+        return 90 - degrees(atan2(direction[1], direction[0]))
+
+    def plan(self,
+             start: Point,
+             goal: Point,
+             start_heading: float = None,
+             goal_heading: float = None,
+             start_time: float = 0) -> Optional[List[Waypoint]]:
+        """
+        Plans a path between two points on the field.
+        :param start: The starting point, in field coordinates
+        :param goal: The goal point, in field coordinates
+        :param start_heading: The robot's heading in the start. Defaults to the direction of the path
+        :param goal_heading: The robot's heading in the goal. Defaults to the direction of the path
+        :param start_time: The time of the first waypoint
+        :return: The waypoints of the path in trajectory coordinates, or None if the goal can't be reached
+        """
+        start_cell = self.cell_of(start)
+        goal_cell = self.cell_of(goal)
+        if not self.is_free(goal_cell):
+            raise ValueError('The goal point {} is blocked'.format(goal))
+        if not (0 <= start_cell[0] < self.shape[0] and 0 <= start_cell[1] < self.shape[1]):
+            raise ValueError('The starting point {} is outside the field'.format(start))
+        if not self.is_free(start_cell):
+            raise ValueError('The starting point {} is blocked'.format(start))
+
+        cells = self.search(start_cell, goal_cell)
+        if cells is None:
+            return None
+
+        points = self.center_of(cells)
+        points[0] = start
+        points[-1] = goal
+        points = self.merge(self.simplify(points))
+        if len(points) == 1:
+            points = np.array([start, goal], dtype=float)
+
+        headings = [
+            GridPlanner.heading(points[min(i + 1, len(points) - 1)] - points[max(i - 1, 0)])
+            for i in range(len(points))
+        ]
+        if start_heading is not None:
+            headings[0] = start_heading
+        if goal_heading is not None:
+            headings[-1] = goal_heading
+
+        lengths = np.hypot(*(points[1:] - points[:-1]).T)
+        times = start_time + np.concatenate([[0], np.cumsum(lengths)]) / self.speed
+
+        return [
+            Waypoint(point=(point - self.offset).tolist(), angle=headings[i], time=float(times[i]))
+            for (i, point) in enumerate(points)
+        ]
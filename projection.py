@@ -0,0 +1,233 @@
+import numpy as np
+
+from curve import CurveType, Precision
+from trajectory import Trajectory
+from typing import Dict, List, Union
+
+
+class ProjectionIndex:
+    """
+    A spatial index of a trajectory's path, for finding the point of the path that is closest to a given point (like
+    the robot's position in pure pursuit or cross track control). The index is built once over the sampled path (the
+    polyline of Trajectory.curve(CurveType.POSITION)):
+    - The polyline's pieces are put in a uniform grid, each piece in every cell its bounding box touches. A query scans
+      the rings of cells around the point's cell, until the closest piece found is closer than any unscanned cell, so
+      it only looks at the pieces near the point rather than the whole path.
+    - In the windowed mode, the query only looks at the pieces of the segments around the previous projection (the
+      robot doesn't skip segments between two control loops), which is cheaper and never jumps to another part of a
+      path that crosses itself.
+    The parameter of the closest piece is then refined with Newton iterations on the segment's polynomial, minimizing
+    |C(u) - p|^2, so the projection is on the spline itself and not on its samples.
+    """
+
+    def __init__(self, trajectory: Trajectory, cell_size: float = None, iterations: int = 4):
+        """
+        Initializes a new index.
+        :param trajectory: The trajectory to index
+        :param cell_size: The size of the grid's cells. Defaults to 4 times the average length of the path's pieces
+        :param iterations: The number of Newton iterations for refining each projection
+        """
+        self.trajectory = trajectory
+        self.iterations = iterations
+        self.sample_size = trajectory.sample_size
+        self.times = np.asarray(trajectory.waypoints.times, dtype=float)
+
+        # The polynomials of each segment and of their derivatives, the highest power first
+        coefficients = np.array([curve.coefficients() for curve in trajectory.curves(Precision.DOUBLE)])
+        degree = coefficients.shape[1] - 1
+        first = coefficients[:, :-1] * np.arange(degree, 0, -1)[None, :, None]
+        second = first[:, :-1] * np.arange(degree - 1, 0, -1)[None, :, None]
+        self.polynomials = [coefficients, first, second]
+
+        samples = np.array(trajectory.curve(CurveType.POSITION, concat=False), dtype=float)
+        self.starts = samples[:, :-1].reshape(-1, 2)
+        self.deltas = samples[:, 1:].reshape(-1, 2) - self.starts
+        self.squared_lengths = (self.deltas ** 2).sum(axis=1)
+
+        lengths = np.sqrt(self.squared_lengths)
+        self.cell_size = 4 * lengths.mean() if cell_size is None else cell_size
+        if not self.cell_size > 0:
+            self.cell_size = 1.0
+
+        # The cells each piece's bounding box touches
+        ends = self.starts + self.deltas
+        self.origin = np.minimum(self.starts, ends).min(axis=0)
+        first_cells = self.cell_of(np.minimum(self.starts, ends))
+        last_cells = self.cell_of(np.maximum(self.starts, ends))
+        self.shape = last_cells.max(axis=0) + 1
+
+        spans = last_cells - first_cells + 1
+        counts = spans[:, 0] * spans[:, 1]
+        pieces = np.repeat(np.arange(len(counts)), counts)
+        offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        cells_x = first_cells[pieces, 0] + offsets % spans[pieces, 0]
+        cells_y = first_cells[pieces, 1] + offsets // spans[pieces, 0]
+
+        # The pieces are sorted by their cell, and each occupied cell keeps the range of its pieces
+        keys = cells_x * self.shape[1] + cells_y
+        order = np.argsort(keys, kind='stable')
+        self.cell_pieces = pieces[order]
+        occupied, first_indices, sizes = np.unique(keys[order], return_index=True, return_counts=True)
+        self.cells = {
+            key: (start, start + size)
+            for (key, start, size) in zip(occupied.tolist(), first_indices.tolist(), sizes.tolist())
+        }
+
+    def cell_of(self, points: np.ndarray) -> np.ndarray:
+        return np.floor((points - self.origin) / self.cell_size).astype(int)
+
+    def ring(self, cell_x: int, cell_y: int, radius: int) -> np.ndarray:
+        """
+        Finds the pieces in the ring of cells at the given Chebyshev distance from a cell.
+        :return: The indices of the pieces, possibly repeated
+        """
+        if radius == 0:
+            cells = [(cell_x, cell_y)]
+        else:
+            columns = range(max(cell_x - radius, 0), min(cell_x + radius, self.shape[0] - 1) + 1)
+            rows = range(max(cell_y - radius + 1, 0), min(cell_y + radius - 1, self.shape[1] - 1) + 1)
+            cells = [(x, y) for y in (cell_y - radius, cell_y + radius) for x in columns]
+            cells += [(x, y) for x in (cell_x - radius, cell_x + radius) for y in rows]
+
+        ranges = [
+            self.cells.get(x * self.shape[1] + y)
+            for (x, y) in cells
+            if 0 <= x < self.shape[0] and 0 <= y < self.shape[1]
+        ]
+        ranges = [r for r in ranges if r is not None]
+        if len(ranges) == 0:
+            return np.zeros(0, dtype=int)
+        return np.concatenate([self.cell_pieces[start:end] for (start, end) in ranges])
+
+    def closest_pieces(self, points: np.ndarray, pieces: np.ndarray):
+        """
+        Finds the closest piece of each point, out of its candidate pieces.
+        :param points: The points, shaped (m, 2)
+        :param pieces: The candidate pieces of each point, shaped (m, k)
+        :return: A tuple: (pieces, t, distances), where t is the parameter of the closest point on the piece, in [0, 1]
+        """
+        offsets = points[:, None, :] - self.starts[pieces]
+        deltas = self.deltas[pieces]
+        squared_lengths = self.squared_lengths[pieces]
+        dots = (offsets * deltas).sum(axis=2)
+        t = np.clip(np.divide(dots, squared_lengths, out=np.zeros_like(dots), where=squared_lengths > 0), 0, 1)
+        distances = np.sqrt(((offsets - t[..., None] * deltas) ** 2).sum(axis=2))
+
+        closest = distances.argmin(axis=1)
+        rows = np.arange(len(points))
+        return pieces[rows, closest], t[rows, closest], distances[rows, closest]
+
+    def search(self, point: np.ndarray):
+        """
+        Finds the closest piece of a single point using the grid.
+        :return: A tuple: (piece, t, distance), like closest_pieces
+        """
+        cell_x, cell_y = self.cell_of(point).tolist()
+        outside = [-cell_x, cell_x - self.shape[0] + 1, -cell_y, cell_y - self.shape[1] + 1]
+        nearest_ring = max(max(outside), 0)
+        farthest_ring = max(abs(cell_x), abs(cell_x - self.shape[0] + 1), abs(cell_y), abs(cell_y - self.shape[1] + 1))
+
+        best = None
+        for radius in range(nearest_ring, farthest_ring + 1):
+            pieces = self.ring(cell_x, cell_y, radius)
+            if len(pieces) > 0:
+                found = [value[0] for value in self.closest_pieces(point[None, :], pieces[None, :])]
+                if best is None or found[2] < best[2]:
+                    best = found
+
+            # Any piece that wasn't scanned yet is at least radius cells away
+            if best is not None and best[2] <= radius * self.cell_size:
+                break
+
+        return best
+
+    def evaluate(self, segments: np.ndarray, u: np.ndarray, order: int) -> np.ndarray:
+        """
+        Evaluates the segments' curves (or their derivatives) with Horner's method.
+        :param segments: The index of the segment of each parameter, shaped (m,)
+        :param u: The parameters, shaped (m,)
+        :param order: 0 for the position, 1 for the velocity and 2 for the acceleration
+        :return: The values, shaped (m, 2)
+        """
+        coefficients = self.polynomials[order][segments]
+        result = np.zeros((len(segments), 2))
+        for i in range(coefficients.shape[1]):
+            result = result * u[:, None] + coefficients[:, i]
+        return result
+
+    def refine(self, points: np.ndarray, segments: np.ndarray, u: np.ndarray) -> np.ndarray:
+        """
+        Refines the parameters of the projections with Newton's method on f(u) = (C(u) - p) . C'(u), the derivative
+        of half the squared distance. The parameters are kept in their segments, and a refined parameter is only kept if
+        it's closer than the initial one.
+        :param points: The projected points, shaped (m, 2)
+        :param segments: The segment of each projection, shaped (m,)
+        :param u: The initial parameters, shaped (m,)
+        :return: The refined parameters, shaped (m,)
+        """
+        refined = u.copy()
+        for _ in range(self.iterations):
+            offsets = self.evaluate(segments, refined, 0) - points
+            velocity = self.evaluate(segments, refined, 1)
+            acceleration = self.evaluate(segments, refined, 2)
+            f = (offsets * velocity).sum(axis=1)
+            df = (velocity ** 2).sum(axis=1) + (offsets * acceleration).sum(axis=1)
+            step = np.divide(f, df, out=np.zeros_like(f), where=df > 0)
+            refined = np.clip(refined - step, 0, 1)
+
+        initial = ((self.evaluate(segments, u, 0) - points) ** 2).sum(axis=1)
+        final = ((self.evaluate(segments, refined, 0) - points) ** 2).sum(axis=1)
+        return np.where(final <= initial, refined, u)
+
+    def project(self,
+                points: Union[List[float], np.ndarray],
+                segments: Union[int, List[int], np.ndarray] = None,
+                window: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Projects points onto the path.
+        :param points: A single point, or a batch of points shaped (m, 2)
+        :param segments: The segments of the previous projections, for the windowed mode - either one for all points or
+                         one for each point. If not given, the grid is used to search the whole path
+        :param window: The number of segments to search before and after the previous segment, in the windowed mode
+        :return: A dictionary of the projections, each an array with a value for each point (or a single value for a
+                 single point):
+                 segment - the index of the closest segment
+                 u - the parameter of the closest point in its segment, in [0, 1]
+                 time - the trajectory's time in the closest point
+                 point - the closest point of the path
+                 distance - the distance to the path
+                 cross_track - the signed distance to the path, positive if the point is to the left of the path
+        """
+        points = np.asarray(points, dtype=float)
+        single = points.ndim == 1
+        points = points.reshape(-1, 2)
+
+        if segments is None:
+            pieces, t, _ = (np.array(values) for values in zip(*[self.search(point) for point in points]))
+        else:
+            # The window has a constant size, so it's shifted (rather than cut) in the ends of the path
+            num_of_segments = len(self.polynomials[0])
+            size = min(2 * window + 1, num_of_segments)
+            first = np.clip(np.broadcast_to(np.asarray(segments), (len(points),)) - window, 0, num_of_segments - size)
+            candidates = first[:, None] * self.sample_size + np.arange(size * self.sample_size)[None, :]
+            pieces, t, _ = self.closest_pieces(points, candidates)
+
+        found_segments = pieces // self.sample_size
+        u = self.refine(points, found_segments, (pieces % self.sample_size + t) / self.sample_size)
+
+        closest = self.evaluate(found_segments, u, 0)
+        velocity = self.evaluate(found_segments, u, 1)
+        offsets = points - closest
+        distance = np.sqrt((offsets ** 2).sum(axis=1))
+        side = np.sign(velocity[:, 0] * offsets[:, 1] - velocity[:, 1] * offsets[:, 0])
+        start_times, end_times = self.times[found_segments], self.times[found_segments + 1]
+
+        result = {
+            'segment': found_segments,
+            'u': u,
+            'time': start_times + u * (end_times - start_times),
+            'point': closest,
+            'distance': distance,
+            'cross_track': side * distance
+        }
+        return {name: value[0] for (name, value) in result.items()} if single else result
@@ -0,0 +1,151 @@
+import numpy as np
+
+from curve import Curve, SplineType, CurveType
+from typing import Dict, Tuple
+from time import perf_counter
+from waypoint import Waypoint
+from utils import linspace
+from robot import Robot
+from math import cos, sin, radians, sqrt
+
+
+class Replanner:
+    """
+    A class for regenerating a single segment path from the robot's current pose to a target waypoint in real time,
+    for example after the robot was knocked off its course. Everything that doesn't depend on the query is prepared
+    once: the basis rows of the velocity and acceleration curves (v(t)^T * M) and all of the output buffers, so a
+    query is a handful of small in-place numpy operations. Only the wheel setpoints are calculated - they're the same as
+    Trajectory.robot_speeds of the two waypoint trajectory [start, target].
+    """
+
+    # The minimal first derivative's scale in the start, relative to the segment's length. Keeps the curve regular
+    # when the robot is standing still
+    MIN_TANGENT_SCALE = 0.25
+
+    def __init__(self, robot: Robot, samples: int = 100):
+        """
+        Initializes a new replanner.
+        :param robot: The robot profile to plan for
+        :param samples: The number of samples in the replanned segment
+        """
+        self.robot = robot
+        self.samples = samples
+
+        t = linspace(0, 1, samples=samples + 1)
+        M = Curve.basis_matrix_for_type(SplineType.QUINTIC_HERMITE)
+        velocity = Curve.time_vector_for_type(SplineType.QUINTIC_HERMITE, CurveType.VELOCITY)
+        acceleration = Curve.time_vector_for_type(SplineType.QUINTIC_HERMITE, CurveType.ACCELERATION)
+        self.velocity_basis = np.ascontiguousarray(velocity(t)[:, 0, :].T @ M)
+        self.acceleration_basis = np.ascontiguousarray(acceleration(t)[:, 0, :].T @ M)
+        self.ratios = np.arange(samples + 1) / samples
+
+        self.control_points = np.zeros((6, 2))
+        self.velocity = np.zeros((samples + 1, 2))
+        self.acceleration = np.zeros((samples + 1, 2))
+        self.speed = np.zeros(samples + 1)
+        self.angular = np.zeros(samples + 1)
+        self.buffer = np.zeros(samples + 1)
+        self.scratch = np.zeros(samples + 1)
+        self.setpoints = np.zeros((samples + 1, 3))
+
+    def start_waypoint(self, pose: Tuple[float, float, float], velocity: float, target: Waypoint, time: float):
+        """
+        Creates the waypoint of the robot's current state. Its first derivative matches the robot's current velocity.
+        :param pose: The robot's pose: (x, y, heading)
+        :param velocity: The robot's current linear velocity, in m/s
+        :param target: The target waypoint
+        :param time: The current time
+        :return: The starting waypoint
+        """
+        x, y, heading = pose
+        dist = sqrt((target.point[0] - x) ** 2 + (target.point[1] - y) ** 2)
+        scale = velocity * (target.time - time) / dist if dist > 0 else 0
+        return Waypoint(
+            point=[x, y],
+            angle=heading,
+            time=time,
+            tangent_scale=max(scale, Replanner.MIN_TANGENT_SCALE)
+        )
+
+    def replan(self,
+               pose: Tuple[float, float, float],
+               velocity: float,
+               target: Waypoint,
+               time: float = 0) -> np.ndarray:
+        """
+        Replans the path from the robot's current state to the target waypoint.
+        :param pose: The robot's pose: (x, y, heading), in the trajectory's coordinates
+        :param velocity: The robot's current linear velocity, in m/s
+        :param target: The target waypoint
+        :param time: The current time
+        :return: The setpoints, shaped (samples + 1, 3): [time, left_velocity, right_velocity]. This is a buffer owned
+                 by the replanner, which is overwritten by the next call - copy it if it should be kept
+        """
+        start = self.start_waypoint(pose, velocity, target, time)
+        dist = start.distance_to(target)
+
+        cp = self.control_points
+        cp[0] = start.point
+        cp[3] = target.point
+        for (i, waypoint) in ((0, start), (3, target)):
+            rads = radians(90 - waypoint.angle)
+            scale = waypoint.tangent_scale * dist
+            cp[i + 1, 0] = cos(rads) * scale
+            cp[i + 1, 1] = sin(rads) * scale
+            cp[i + 2, 0] = -sin(rads) * waypoint.curvature_scale
+            cp[i + 2, 1] = cos(rads) * waypoint.curvature_scale
+
+        d1 = np.dot(self.velocity_basis, cp, out=self.velocity)
+        d2 = np.dot(self.acceleration_basis, cp, out=self.acceleration)
+        dx, dy = d1[:, 0], d1[:, 1]
+        d2x, d2y = d2[:, 0], d2[:, 1]
+
+        # speed = |p'|, angular = (x'y'' - y'x'') / |p'|^2
+        q = np.add(np.square(dx, out=self.speed), np.square(dy, out=self.buffer), out=self.buffer)
+        np.sqrt(q, out=self.speed)
+        angular = np.multiply(d2y, dx, out=self.angular)
+        np.subtract(angular, np.multiply(d2x, dy, out=self.scratch), out=angular)
+        angular /= q
+        angular *= self.robot.base_width / 2
+
+        free_speed = self.robot.free_speed
+        out = self.setpoints
+        np.multiply(self.ratios, target.time - time, out=out[:, 0])
+        out[:, 0] += time
+        for (column, sign) in ((1, -1), (2, 1)):
+            wheel = out[:, column]
+            np.multiply(angular, sign, out=wheel)
+            wheel += self.speed
+            wheel -= wheel[0]
+            np.clip(wheel, -free_speed, free_speed, out=wheel)
+
+        return out
+
+
+def benchmark(replanner: Replanner,
+              pose: Tuple[float, float, float],
+              velocity: float,
+              target: Waypoint,
+              iterations: int = 1000,
+              budget: float = None) -> Dict[str, float]:
+    """
+    Measures the latency of the replanner, and enforces its p99 latency budget.
+    :param replanner: The replanner to measure
+    :param pose: The robot's pose in the queries
+    :param velocity: The robot's velocity in the queries
+    :param target: The target waypoint in the queries
+    :param iterations: The number of queries to measure
+    :param budget: The maximal p99 latency, in seconds. If given, a ValueError is raised when it's exceeded
+    :return: A dictionary of the latency's percentiles, in seconds
+    """
+    latencies = np.zeros(iterations)
+    for i in range(iterations):
+        start = perf_counter()
+        replanner.replan(pose, velocity, target)
+        latencies[i] = perf_counter() - start
+
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    if budget is not None and p99 > budget:
+        raise ValueError('The p99 latency {:.3f} ms exceeds the budget of {:.3f} ms'.format(p99 * 1e3, budget * 1e3))
+
+    return {'p50': p50, 'p95': p95, 'p99': p99, 'max': latencies.max()}
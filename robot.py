@@ -10,8 +10,16 @@ class Robot(object):
     A class that keeps information about a given robot, in order to generate paths and trajectories based on the robot's
     specifications. It can also generate these paths using the Bézier-based implementation, specified in `trajectory.py`.
     IMPORTANT - This profiling is currently only suited for transmissions with one kind of motor.
+    The robot's parameters are kept in named slots, and the constants derived from them (like the maximum acceleration)
+    are cached until one of the parameters changes.
     """
 
+    __slots__ = (
+        'name', 'year', 'mass', 'base_width',
+        'free_speed', 'stall_torque', 'gear_ratio', 'wheel_radius', 'num_of_drive_motors',
+        '_max_acceleration'
+    )
+
     def __init__(self,
                  name: str = "Base Robot",
                  year: int = 2018,
@@ -35,8 +43,34 @@ class Robot(object):
         :param wheel_radius: The robot wheels' radius, in m.
         :param num_of_drive_motors: The number of motors used in the drivetrain.
         """
-        self.robot_info = (name, year, mass, base_width)
-        self.chassis_info = (free_speed, stall_torque, gear_ratio, wheel_radius, num_of_drive_motors)
+        self.name = name
+        self.year = year
+        self.mass = mass
+        self.base_width = base_width
+        self.free_speed = free_speed
+        self.stall_torque = stall_torque
+        self.gear_ratio = gear_ratio
+        self.wheel_radius = wheel_radius
+        self.num_of_drive_motors = num_of_drive_motors
+
+    def __setattr__(self, key, value):
+        object.__setattr__(self, key, value)
+        if not key.startswith('_'):
+            object.__setattr__(self, '_max_acceleration', None)
+
+    @property
+    def robot_info(self) -> Tuple[str, int, float, float]:
+        """
+        :return: A tuple: (name, year, mass, base_width)
+        """
+        return self.name, self.year, self.mass, self.base_width
+
+    @property
+    def chassis_info(self) -> Tuple[float, float, float, float, int]:
+        """
+        :return: A tuple: (free_speed, stall_torque, gear_ratio, wheel_radius, num_of_drive_motors)
+        """
+        return self.free_speed, self.stall_torque, self.gear_ratio, self.wheel_radius, self.num_of_drive_motors
 
     @classmethod
     def from_json(cls, filename: str = 'robot.json'):
@@ -45,7 +79,15 @@ class Robot(object):
         :param filename: The filename of the JSON file
         :return: A new instance of Robot
         """
-        robot = json.loads(open(filename, 'r').read())
+        return cls.from_dict(json.loads(open(filename, 'r').read()))
+
+    @classmethod
+    def from_dict(cls, robot: dict):
+        """
+        Creates a new robot profile using a dictionary in the robot JSON file's format.
+        :param robot: The decoded robot profile
+        :return: A new instance of Robot
+        """
         return cls(
             name=robot['name'],
             year=robot['year'],
@@ -58,6 +100,23 @@ class Robot(object):
             num_of_drive_motors=robot['motors']
         )
 
+    def to_dict(self) -> dict:
+        """
+        Returns the robot profile as a dictionary in the robot JSON file's format.
+        :return: The robot profile dictionary
+        """
+        return {
+            'name': self.name,
+            'year': self.year,
+            'mass': self.mass,
+            'base-width': self.base_width,
+            'free-speed': self.free_speed,
+            'stall-torque': self.stall_torque,
+            'gear-ratio': self.gear_ratio,
+            'wheel-radius': self.wheel_radius,
+            'motors': self.num_of_drive_motors
+        }
+
     def time_to_max(self, i: int = 4) -> float:
         """
         This calculates the time required to get the robot to 99.75% of its free speed, based on solving the ODE
@@ -66,9 +125,7 @@ class Robot(object):
         :param i: The number to multiply the time constant in. 5 results in 99.32% of free speed, 4 (default) is 98.17%.
         :return: The time to reach 98.17% of the robot's free speed using full power, in seconds.
         """
-        _, _, m, _ = self.robot_info
-        vf, ts, g, r, n = self.chassis_info
-        k1 = (2 * n * ts * g) / (r * m * vf)
+        k1 = self.max_acceleration() / self.free_speed
         return i / k1
 
     def max_acceleration(self) -> float:
@@ -77,9 +134,11 @@ class Robot(object):
         F_max = ma ==> a_max = F_max / m
         :return: The maximum acceleration
         """
-        _, _, m, _ = self.robot_info
-        _, ts, g, r, n = self.chassis_info
-        return (2 * n * ts * g) / (r * m)
+        if self._max_acceleration is None:
+            n, ts, g = self.num_of_drive_motors, self.stall_torque, self.gear_ratio
+            self._max_acceleration = (2 * n * ts * g) / (self.wheel_radius * self.mass)
+
+        return self._max_acceleration
 
     def rotational_inertia(self, linear_velocity: float, angular_velocity: float) -> float:
         """
@@ -90,10 +149,9 @@ class Robot(object):
         :param angular_velocity: The current angular velocity
         :return: The current rotational inertia of the robot.
         """
-        _, _, m, _ = self.robot_info
         r = linear_velocity / angular_velocity
 
-        return m * (r ** 2)
+        return self.mass * (r ** 2)
 
     def dist_to_vel(self, end_vel: float, start_vel: float = 0):
         """
@@ -118,9 +176,8 @@ class Robot(object):
         :param right_velocity: The velocity of the right side of the robot
         :return: A tuple: (linear_velocity, angular_velocity)
         """
-        _, _, _, base_width = self.robot_info
         linear = (left_velocity + right_velocity) / 2
-        angular = (right_velocity - left_velocity) / base_width
+        angular = (right_velocity - left_velocity) / self.base_width
 
         return linear, angular
 
@@ -132,10 +189,7 @@ class Robot(object):
         :param angular_velocity: The robot's middle angular velocity
         :return: A tuple: (left_velocity, right_velocity)
         """
-        _, _, _, base_width = self.robot_info
-        _, _, _, wheel_radius, _ = self.chassis_info
-
-        w = angular_velocity * (base_width / 2)
+        w = angular_velocity * (self.base_width / 2)
 
         left_velocity = linear_velocity - w
         right_velocity = linear_velocity + w
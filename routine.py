@@ -0,0 +1,170 @@
+import json
+
+from numpy import ndarray, concatenate as npconcat, full as npfull, column_stack as npcolumns
+from concurrent.futures import ProcessPoolExecutor
+from trajectory import Trajectory
+from curve import CurveType, Precision
+from csv import DictWriter
+from typing import List
+from robot import Robot
+from math import hypot
+
+
+def generate_table(trajectory: Trajectory) -> ndarray:
+    """
+    Generates the output table of a single trajectory. Defined in the module level so it could be sent to a worker
+    process.
+    :param trajectory: The trajectory to generate
+    :return: The trajectory's output table
+    """
+    return trajectory.table()
+
+
+class Routine:
+    """
+    A class representing an autonomous routine - several trajectories that are driven back to back. The routine's
+    trajectories are generated in parallel and compiled into one contiguous table, where the times of each trajectory
+    are offset by the duration of the trajectories before it.
+    """
+
+    # The columns of the routine's output table
+    FIELDS = Trajectory.TABLE_FIELDS + ['segment']
+
+    def __init__(self,
+                 trajectories: List[Trajectory],
+                 name: str = 'generic-routine',
+                 position_tolerance: float = 1e-3,
+                 heading_tolerance: float = 0.5,
+                 velocity_tolerance: float = 0.05):
+        """
+        Creates a new Routine.
+        :param trajectories: The trajectories of the routine, by the order they should be driven
+        :param name: The name of the routine
+        :param position_tolerance: The maximum allowed distance between two joined waypoints, in meters
+        :param heading_tolerance: The maximum allowed heading difference between two joined waypoints, in degrees
+        :param velocity_tolerance: The maximum allowed velocity difference in a join, in m/s
+        """
+        self.trajectories = trajectories
+        self.name = name
+        self.position_tolerance = position_tolerance
+        self.heading_tolerance = heading_tolerance
+        self.velocity_tolerance = velocity_tolerance
+
+    @classmethod
+    def from_json(cls, routine_filename: str, robot_filename: str):
+        """
+        Initializes a new Routine using data defined in a given JSON file. The file should contain the routine's name
+        and a list of trajectory filenames under "paths".
+        :param routine_filename: The filename of the routine data file
+        :param robot_filename: The filename of the robot profile data file
+        :return: A new Routine instance
+        """
+        decoded = json.loads(open(routine_filename, 'r').read())
+        trajectories = [Trajectory.from_json(path, robot_filename) for path in decoded['paths']]
+        for trajectory in trajectories[1:]:
+            trajectory.robot = trajectories[0].robot
+
+        return cls(trajectories, decoded['name'])
+
+    @property
+    def robot(self) -> Robot:
+        return self.trajectories[0].robot
+
+    @staticmethod
+    def end_velocity(trajectory: Trajectory, end: int) -> ndarray:
+        """
+        Calculates the middle velocity vector of the trajectory in one of its ends, in m/s.
+        :param trajectory: The trajectory to calculate the velocity of
+        :param end: 0 for the start of the trajectory, 1 for its end
+        :return: The velocity vector [vx, vy]
+        """
+        segment = 0 if end == 0 else trajectory.num_of_segments - 1
+        duration = trajectory.waypoints[segment + 1].time - trajectory.waypoints[segment].time
+        curve = trajectory.curves(Precision.DOUBLE)[segment]
+
+        return curve.calculate(float(end), CurveType.VELOCITY)[0] / duration
+
+    def continuity_errors(self) -> List[str]:
+        """
+        Checks the pose and velocity continuity in each of the joins between two consecutive trajectories.
+        :return: A list of descriptions of the found discontinuities. Empty if the routine is continuous.
+        """
+        errors = []
+        for i in range(len(self.trajectories) - 1):
+            first = self.trajectories[i]
+            second = self.trajectories[i + 1]
+            end = first.waypoints[-1]
+            start = second.waypoints[0]
+            join = '{} -> {}'.format(first.name, second.name)
+
+            distance = end.distance_to(start)
+            if distance > self.position_tolerance:
+                errors.append('{}: positions are {:.4f} m apart'.format(join, distance))
+
+            heading = abs((end.angle - start.angle + 180) % 360 - 180)
+            if heading > self.heading_tolerance:
+                errors.append('{}: headings differ by {:.2f} degrees'.format(join, heading))
+
+            dv = Routine.end_velocity(first, 1) - Routine.end_velocity(second, 0)
+            if hypot(dv[0], dv[1]) > self.velocity_tolerance:
+                errors.append('{}: velocities differ by {:.3f} m/s'.format(join, hypot(dv[0], dv[1])))
+
+        return errors
+
+    def check_continuity(self):
+        """
+        Raises a ValueError if one of the routine's joins is discontinuous.
+        """
+        errors = self.continuity_errors()
+        if len(errors) > 0:
+            raise ValueError('The routine {} is discontinuous:\n{}'.format(self.name, '\n'.join(errors)))
+
+    def generate(self, workers: int = None) -> List[ndarray]:
+        """
+        Generates the output tables of all of the routine's trajectories, each one in a different process.
+        :param workers: The maximum number of worker processes. 1 generates the tables in the current process.
+        :return: A list of the trajectories' tables
+        """
+        if workers == 1:
+            return [generate_table(trajectory) for trajectory in self.trajectories]
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(generate_table, self.trajectories))
+
+    def compile(self, check: bool = True, workers: int = None) -> ndarray:
+        """
+        Compiles the routine into one contiguous table. The times of each trajectory are offset so they start where
+        the previous trajectory ended, and the first sample of each trajectory (which duplicates the last sample of
+        the previous one) is dropped.
+        :param check: Should the continuity of the joins be checked before compiling
+        :param workers: The maximum number of worker processes used for the generation
+        :return: A numpy array of shape (samples, len(FIELDS))
+        """
+        if check:
+            self.check_continuity()
+
+        tables = self.generate(workers)
+        offset = 0
+        compiled = []
+        for (i, table) in enumerate(tables):
+            times = table[:, 0]
+            table = npcolumns([times - times[0] + offset, table[:, 1:], npfull(len(table), i)])
+            offset = table[-1, 0]
+            compiled.append(table if i == 0 else table[1:])
+
+        return npconcat(compiled)
+
+    def export(self, filename: str = None, check: bool = True, workers: int = None):
+        """
+        Compiles the routine and writes it to a single CSV file, to be loaded by the robot for the whole autonomous
+        period.
+        :param filename: The filename of the output file. Defaults to the routine's name
+        :param check: Should the continuity of the joins be checked before compiling
+        :param workers: The maximum number of worker processes used for the generation
+        """
+        fname = self.name + '.csv' if filename is None else filename
+        with open(fname, 'w', newline='') as file:
+            writer = DictWriter(file, fieldnames=Routine.FIELDS)
+            writer.writeheader()
+            for row in self.compile(check, workers):
+                writer.writerow(dict(zip(Routine.FIELDS, row[:-1].tolist() + [int(row[-1])])))
@@ -0,0 +1,99 @@
+import numpy as np
+
+from time import perf_counter
+from typing import Callable, Dict, List
+from enum import IntEnum
+
+
+class Phase(IntEnum):
+    EVENTS = 0
+    DRAW = 1
+    FLIP = 2
+
+
+class FrameTimer:
+    """
+    Records the durations of the simulator's frames, split to phases, in a ring buffer of the last frames. A frame is
+    timed by calling begin() when it starts and lap(phase) when each of its phases ends - every lap is charged with the
+    time since the previous one. A frame that takes longer than the frame budget (1 / target_fps) is counted as dropped.
+    """
+
+    def __init__(self, capacity: int = 600, target_fps: float = 60, clock: Callable[[], float] = perf_counter):
+        """
+        Initializes a new frame timer.
+        :param capacity: The number of last frames to keep
+        :param target_fps: The frame rate the simulator aims for, which sets the frame budget
+        :param clock: The clock to time the frames with, in seconds
+        """
+        self.capacity = capacity
+        self.budget = 1 / target_fps
+        self.clock = clock
+
+        self.durations = np.zeros((capacity, len(Phase)))
+        self.index = 0
+        self.frames = 0
+        self.dropped = 0
+        self.last = None
+
+    def begin(self):
+        """
+        Starts timing a new frame.
+        """
+        self.durations[self.index] = 0
+        self.last = self.clock()
+
+    def lap(self, phase: Phase):
+        """
+        Ends a phase of the current frame.
+        :param phase: The phase that ended
+        """
+        now = self.clock()
+        self.durations[self.index, phase] += now - self.last
+        self.last = now
+
+    def end(self):
+        """
+        Ends the current frame, after all of its phases.
+        """
+        if self.durations[self.index].sum() > self.budget:
+            self.dropped += 1
+
+        self.frames += 1
+        self.index = (self.index + 1) % self.capacity
+        self.last = None
+
+    def frame_durations(self) -> np.ndarray:
+        """
+        :return: The durations of the recorded frames, from the oldest, shaped (frames, len(Phase)), in seconds
+        """
+        if self.frames < self.capacity:
+            return self.durations[:self.frames]
+        return np.roll(self.durations, -self.index, axis=0)
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Summarizes the recorded frames.
+        :return: A dictionary with the 50th, 95th and 99th percentiles of the frame time and the mean duration of each
+                 phase (all in milliseconds), the total number of frames and the number of dropped frames
+        """
+        durations = self.frame_durations() * 1000
+        if len(durations) == 0:
+            durations = np.zeros((1, len(Phase)))
+
+        p50, p95, p99 = np.percentile(durations.sum(axis=1), [50, 95, 99])
+        stats = {'p50': p50, 'p95': p95, 'p99': p99, 'frames': self.frames, 'dropped': self.dropped}
+        for phase in Phase:
+            stats[phase.name.lower()] = durations[:, phase].mean()
+
+        return stats
+
+    def overlay_lines(self) -> List[str]:
+        """
+        :return: The lines of text the simulator's overlay shows
+        """
+        stats = self.stats()
+        return [
+            'frame p50 %.2f ms, p95 %.2f ms, p99 %.2f ms' % (stats['p50'], stats['p95'], stats['p99']),
+            'events %.2f ms, draw %.2f ms, flip %.2f ms' % (stats['events'], stats['draw'], stats['flip']),
+            'dropped %d / %d frames' % (stats['dropped'], stats['frames'])
+        ]
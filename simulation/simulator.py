@@ -1,21 +1,33 @@
 import pygame
 import pygame.gfxdraw
 
-from .fps_counter import FpsCounter
+from .frame_timer import FrameTimer, Phase
 from .particle import Particle
 from typing import Tuple, List
 
 class DBugSimulator:
-    def __init__(self, graph_dimensions: Tuple[int, int], border: int, name: str):
+    def __init__(
+            self,
+            graph_dimensions: Tuple[int, int],
+            border: int,
+            name: str,
+            show_frame_times: bool = False,
+            offscreen: bool = False
+    ):
         win_dimensions = (graph_dimensions[0] + border, graph_dimensions[1] + border)
 
         self.name = name
-        self.screen = pygame.display.set_mode(win_dimensions)
+        self.offscreen = offscreen
+        # An offscreen simulator draws on a plain surface, so it doesn't need a display (or a video driver) at all
+        self.screen = pygame.Surface(win_dimensions) if offscreen else pygame.display.set_mode(win_dimensions)
+        self.background = None
         self.running = False
         self.dims = win_dimensions
         self.border = border
 
-        self.counter = FpsCounter()
+        self.frame_timer = FrameTimer()
+        self.show_frame_times = show_frame_times
+        self.font = None
 
         self.curves = []
         self.timer = 0
@@ -23,6 +35,8 @@ class DBugSimulator:
     def configure(self):
         pygame.init()
         pygame.display.set_caption('Trajectory: %s' % self.name)
+        if self.show_frame_times:
+            self.font = pygame.font.Font(None, 18)
 
     def render_frame(self, offset: int):
         border = offset / 2
@@ -33,6 +47,7 @@ class DBugSimulator:
 
     def render_points(self, points: List[Particle]):
         self.curves.append(points)
+        self.background = None
 
     def render(self):
         self.timer += 1
@@ -49,16 +64,45 @@ class DBugSimulator:
 
         self.render_frame(offset=(2 * self.border))
 
+        if self.show_frame_times:
+            self.render_frame_times()
+
+    def render_background(self):
+        # The curves don't change between frames, so they're drawn once and then copied to every frame
+        if self.background is None:
+            self.screen.fill((255, 255, 255))
+            self.render()
+            self.background = self.screen.copy()
+        else:
+            self.screen.blit(self.background, (0, 0))
+
+    def render_robot(self, center: Particle, front: Particle, radius: int):
+        pygame.draw.circle(self.screen, center.color, (int(center.x), int(center.y)), radius, 2)
+        pygame.draw.line(self.screen, center.color, (int(center.x), int(center.y)), (int(front.x), int(front.y)), 2)
+
+    def save_frame(self, filename: str):
+        pygame.image.save(self.screen, filename)
+
+    def render_frame_times(self):
+        for (i, line) in enumerate(self.frame_timer.overlay_lines()):
+            self.screen.blit(self.font.render(line, True, (0, 0, 0)), (5, 5 + 15 * i))
+
     def loop(self):
         self.configure()
 
         self.running = True
         while self.running:
+            self.frame_timer.begin()
+
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     self.running = False
+            self.frame_timer.lap(Phase.EVENTS)
 
             self.screen.fill((255, 255, 255))
             self.render()
+            self.frame_timer.lap(Phase.DRAW)
+
             pygame.display.flip()
-            self.counter.nexttick()
+            self.frame_timer.lap(Phase.FLIP)
+            self.frame_timer.end()
@@ -0,0 +1,68 @@
+import numpy as np
+
+from curve import SplineType, CurveType
+from trajectory import Trajectory
+from waypoint import Waypoint, TangentMode
+from typing import Dict, List
+from time import perf_counter
+from robot import Robot
+
+
+def curvature_jumps(trajectory: Trajectory) -> np.ndarray:
+    """
+    Calculates the jumps of the curvature in the joins between the trajectory's segments. The curvature doesn't depend
+    on the curve's parametrization, so it's comparable between segments of different lengths and durations.
+    :param trajectory: The trajectory to check
+    :return: The absolute difference of the curvature in each join, shaped (segments - 1,)
+    """
+    curves = trajectory.curves()
+
+    def curvature(u: float) -> np.ndarray:
+        dx, dy = np.array([c.calculate(u, CurveType.VELOCITY)[0] for c in curves], dtype=float).T
+        d2x, d2y = np.array([c.calculate(u, CurveType.ACCELERATION)[0] for c in curves], dtype=float).T
+        return (dx * d2y - dy * d2x) / (dx ** 2 + dy ** 2) ** 1.5
+
+    return np.abs(curvature(1.0)[:-1] - curvature(0.0)[1:])
+
+
+def benchmark(waypoints: List[Waypoint],
+              robot: Robot,
+              spline_types: List[SplineType] = tuple(SplineType),
+              repeats: int = 20,
+              tangent_mode: TangentMode = TangentMode.LOCAL) -> Dict[str, Dict[str, float]]:
+    """
+    Compares the spline types on the same waypoints.
+    :param waypoints: The waypoints of the compared trajectories
+    :param robot: The robot profile of the compared trajectories
+    :param spline_types: The spline types to compare
+    :param repeats: The number of times to repeat each measurement. The best time is kept
+    :param tangent_mode: The way to set the derivatives in the waypoints
+    :return: A dictionary of measurements for each spline type (by its name):
+             generation - the time it takes to generate the trajectory's table, in seconds
+             evaluation - the time it takes to evaluate the position, velocity and acceleration curves, in seconds
+             curvature_jump - the largest jump of the curvature in the joins between segments, in 1/m
+    """
+    results = {}
+    for spline_type in spline_types:
+        trajectory = Trajectory(waypoints, robot, spline_type=spline_type, tangent_mode=tangent_mode)
+
+        generation = np.inf
+        evaluation = np.inf
+        for _ in range(repeats):
+            start = perf_counter()
+            trajectory.table()
+            generation = min(generation, perf_counter() - start)
+
+            start = perf_counter()
+            for curve_type in CurveType:
+                trajectory.curve(curve_type)
+            evaluation = min(evaluation, perf_counter() - start)
+
+        jumps = curvature_jumps(trajectory)
+        results[spline_type.name] = {
+            'generation': generation,
+            'evaluation': evaluation,
+            'curvature_jump': jumps.max() if len(jumps) > 0 else 0
+        }
+
+    return results
@@ -0,0 +1,117 @@
+import json
+
+from bisect import bisect_right
+from math import atan2, degrees, sqrt
+from typing import List, Tuple
+
+
+class SplineEvaluator:
+    """
+    A tiny, dependency-free evaluator of the trajectory coefficient files written by outputs.CoefficientOutput, meant
+    to run on the robot. Each segment is a polynomial in u = (t - start) / (end - start), and every quantity is
+    calculated exactly like the matching Trajectory output:
+    - velocity and acceleration are the curve's derivatives by u (like Trajectory.curve)
+    - heading is measured from the y axis, in degrees (like the CSV's heading column)
+    - the wheel speeds are the forward kinematics of the middle speed and the angular speed, minus the wheel speeds in
+      the start of the trajectory and clamped to the free speed (like Trajectory.robot_speeds)
+    """
+
+    def __init__(self, segments: List[dict], base_width: float, free_speed: float):
+        """
+        Initializes a new evaluator.
+        :param segments: The segments, each with its start and end times and its x and y polynomial coefficients
+                         (the highest power first)
+        :param base_width: The robot's base width
+        :param free_speed: The robot's free speed
+        """
+        self.starts = [segment['start'] for segment in segments]
+        self.ends = [segment['end'] for segment in segments]
+        self.polynomials = [
+            (SplineEvaluator.derivatives(segment['x']), SplineEvaluator.derivatives(segment['y']))
+            for segment in segments
+        ]
+        self.base_width = base_width
+        self.free_speed = free_speed
+        self.deduction = (0, 0)
+        self.deduction = self.raw_wheel_speeds(self.starts[0])
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data['segments'], data['robot']['base-width'], data['robot']['free-speed'])
+
+    @classmethod
+    def from_json(cls, filename: str):
+        with open(filename, 'r') as file:
+            return cls.from_dict(json.load(file))
+
+    @staticmethod
+    def derivatives(coefficients: List[float]) -> List[List[float]]:
+        """
+        Calculates the coefficients of a polynomial's first and second derivatives.
+        :param coefficients: The polynomial's coefficients, the highest power first
+        :return: A list: [coefficients, first derivative's coefficients, second derivative's coefficients]
+        """
+        degree = len(coefficients) - 1
+        first = [(degree - i) * c for (i, c) in enumerate(coefficients[:-1])]
+        second = [(degree - 1 - i) * c for (i, c) in enumerate(first[:-1])]
+        return [list(coefficients), first, second]
+
+    @staticmethod
+    def horner(coefficients: List[float], u: float) -> float:
+        result = 0
+        for c in coefficients:
+            result = result * u + c
+        return result
+
+    def locate(self, t: float) -> Tuple[int, float]:
+        """
+        Finds the segment of the given time and the segment's parameter in it.
+        :param t: The time
+        :return: A tuple: (segment_index, u)
+        """
+        i = min(max(bisect_right(self.starts, t) - 1, 0), len(self.starts) - 1)
+        u = (t - self.starts[i]) / (self.ends[i] - self.starts[i])
+        return i, min(max(u, 0), 1)
+
+    def evaluate(self, t: float, order: int) -> Tuple[float, float]:
+        """
+        Evaluates the curve or one of its derivatives.
+        :param t: The time
+        :param order: 0 for the position, 1 for the velocity, 2 for the acceleration
+        :return: The vector (x, y)
+        """
+        i, u = self.locate(t)
+        xs, ys = self.polynomials[i]
+        return SplineEvaluator.horner(xs[order], u), SplineEvaluator.horner(ys[order], u)
+
+    def position(self, t: float) -> Tuple[float, float]:
+        return self.evaluate(t, 0)
+
+    def velocity(self, t: float) -> Tuple[float, float]:
+        return self.evaluate(t, 1)
+
+    def acceleration(self, t: float) -> Tuple[float, float]:
+        return self.evaluate(t, 2)
+
+    def heading(self, t: float) -> float:
+        dx, dy = self.velocity(t)
+        return 90 - degrees(atan2(dy, dx))
+
+    def raw_wheel_speeds(self, t: float) -> Tuple[float, float]:
+        dx, dy = self.velocity(t)
+        d2x, d2y = self.acceleration(t)
+        speed = sqrt(dx ** 2 + dy ** 2)
+        w = ((d2y * dx - d2x * dy) / (dx ** 2 + dy ** 2)) * (self.base_width / 2)
+        return speed - w - self.deduction[0], speed + w - self.deduction[1]
+
+    def wheel_speeds(self, t: float) -> Tuple[float, float]:
+        """
+        Calculates the wheel speeds.
+        :param t: The time
+        :return: A tuple: (left_velocity, right_velocity)
+        """
+        left, right = self.raw_wheel_speeds(t)
+        return (
+            max(min(left, self.free_speed), -self.free_speed),
+            max(min(right, self.free_speed), -self.free_speed)
+        )
@@ -0,0 +1,265 @@
+import asyncio
+import json
+import numpy as np
+
+from trajectory import Trajectory
+from typing import Dict, List
+from struct import Struct
+from time import perf_counter
+from enum import IntEnum
+
+
+class FrameType(IntEnum):
+    LIST = 1
+    GET = 2
+    REBUILD = 3
+    TABLE = 4
+    NAMES = 5
+    ERROR = 6
+    NOT_FOUND = 7
+
+
+class TrajectoryServerError(Exception):
+    """
+    Raised by the client when the server fails to serve a request, other than for an unknown trajectory.
+    """
+    pass
+
+
+# Every frame starts with its payload's length and its type
+FRAME_PREFIX = Struct('!IB')
+
+# A table frame's payload starts with the length of its JSON metadata, followed by the metadata and the table's bytes
+META_PREFIX = Struct('!I')
+
+
+async def read_frame(reader: asyncio.StreamReader):
+    """
+    Reads a single frame from the stream.
+    :param reader: The stream to read from
+    :return: A tuple: (frame_type, payload)
+    """
+    length, frame_type = FRAME_PREFIX.unpack(await reader.readexactly(FRAME_PREFIX.size))
+    return frame_type, await reader.readexactly(length)
+
+
+def write_frame(writer: asyncio.StreamWriter, frame_type: int, *buffers):
+    """
+    Writes a single frame to the stream. The buffers are handed to the transport as they are, so arrays are sent
+    straight from their memory without being serialized.
+    :param writer: The stream to write to
+    :param frame_type: The type of the frame
+    :param buffers: The buffers that make up the frame's payload
+    """
+    views = [memoryview(buffer).cast('B') for buffer in buffers]
+    writer.write(FRAME_PREFIX.pack(sum(len(view) for view in views), frame_type))
+    for view in views:
+        writer.write(view)
+
+
+class TrajectoryServer:
+    """
+    An asyncio server that streams generated trajectory tables to any number of clients, for tuning on the practice
+    field without copying files to the robot. The server keeps the Trajectory objects and generates their tables on
+    demand - a REBUILD request regenerates the table from the (possibly updated) cached trajectory.
+    Requests are frames whose payload is the trajectory's name, and tables are sent as TABLE frames:
+      [length: uint32][type: uint8][metadata length: uint32][metadata: JSON][table: raw array bytes]
+    where the metadata holds the name, dtype, shape and columns of the table.
+    """
+
+    def __init__(self, trajectories: List[Trajectory], host: str = '127.0.0.1', port: int = 5800):
+        """
+        Initializes a new server.
+        :param trajectories: The trajectories to serve
+        :param host: The host to listen on
+        :param port: The port to listen on. 0 picks a free port
+        """
+        self.trajectories = {trajectory.name: trajectory for trajectory in trajectories}
+        self.host = host
+        self.port = port
+        self.tables = {}
+        self.builds = {}
+        self.server = None
+
+    def update(self, trajectory: Trajectory):
+        """
+        Replaces a cached trajectory (or adds a new one). Its table is regenerated on the next request.
+        :param trajectory: The new trajectory
+        """
+        self.trajectories[trajectory.name] = trajectory
+        self.tables.pop(trajectory.name, None)
+
+    async def table(self, name: str, rebuild: bool = False) -> np.ndarray:
+        """
+        Returns the table of the given trajectory, generating it in a worker thread if needed. Concurrent requests for
+        the same table share a single generation.
+        :param name: The name of the trajectory
+        :param rebuild: Should the table be regenerated even if it's cached
+        :return: The trajectory's table
+        """
+        if name not in self.trajectories:
+            raise KeyError('Unknown trajectory: {}'.format(name))
+
+        if name in self.builds:
+            return await self.builds[name]
+        if not rebuild and name in self.tables:
+            return self.tables[name]
+
+        build = asyncio.get_running_loop().run_in_executor(None, self.trajectories[name].table)
+        self.builds[name] = build
+        try:
+            table = np.ascontiguousarray(await build)
+        finally:
+            del self.builds[name]
+
+        self.tables[name] = table
+        return table
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        Serves a single client until it disconnects.
+        """
+        try:
+            while True:
+                frame_type, payload = await read_frame(reader)
+
+                if frame_type == FrameType.LIST:
+                    write_frame(writer, FrameType.NAMES, json.dumps(list(self.trajectories)).encode('utf-8'))
+                elif frame_type in (FrameType.GET, FrameType.REBUILD):
+                    # A failed request is reported to the client, and the connection keeps serving
+                    try:
+                        name = payload.decode('utf-8')
+                        table = await self.table(name, rebuild=frame_type == FrameType.REBUILD)
+                        meta = json.dumps({
+                            'name': name,
+                            'dtype': table.dtype.str,
+                            'shape': table.shape,
+                            'fields': Trajectory.TABLE_FIELDS
+                        }).encode('utf-8')
+                    except KeyError as e:
+                        write_frame(writer, FrameType.NOT_FOUND, str(e.args[0]).encode('utf-8'))
+                    except Exception as e:
+                        write_frame(writer, FrameType.ERROR, (str(e) or type(e).__name__).encode('utf-8'))
+                    else:
+                        write_frame(writer, FrameType.TABLE, META_PREFIX.pack(len(meta)), meta, table)
+                else:
+                    write_frame(writer, FrameType.ERROR, 'Unknown frame type: {}'.format(frame_type).encode('utf-8'))
+
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self):
+        """
+        Starts listening. The actual port is available in self.port afterwards.
+        """
+        self.server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self.server is None:
+            await self.start()
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+class TrajectoryClient:
+    """
+    A local client that stands in for the robot - it requests tables from a TrajectoryServer and decodes them back
+    into arrays, without copying the received bytes.
+    """
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 5800):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+    async def close(self):
+        self.writer.close()
+        await self.writer.wait_closed()
+
+    async def request(self, frame_type: int, payload: bytes = b''):
+        """
+        Sends a request and waits for its response.
+        :param frame_type: The type of the request
+        :param payload: The payload of the request
+        :return: A tuple: (response_type, payload)
+        :raises KeyError: If the requested trajectory is unknown to the server
+        :raises TrajectoryServerError: If the server failed to serve the request
+        """
+        write_frame(self.writer, frame_type, payload)
+        await self.writer.drain()
+        response_type, response = await read_frame(self.reader)
+        if response_type == FrameType.NOT_FOUND:
+            raise KeyError(response.decode('utf-8'))
+        if response_type == FrameType.ERROR:
+            raise TrajectoryServerError(response.decode('utf-8'))
+
+        return response_type, response
+
+    async def names(self) -> List[str]:
+        _, payload = await self.request(FrameType.LIST)
+        return json.loads(payload.decode('utf-8'))
+
+    async def get(self, name: str, rebuild: bool = False) -> np.ndarray:
+        """
+        Requests the table of a trajectory.
+        :param name: The name of the trajectory
+        :param rebuild: Should the server regenerate the table first
+        :return: The trajectory's table
+        """
+        _, payload = await self.request(FrameType.REBUILD if rebuild else FrameType.GET, name.encode('utf-8'))
+        meta_length, = META_PREFIX.unpack_from(payload)
+        start = META_PREFIX.size + meta_length
+        meta = json.loads(payload[META_PREFIX.size:start].decode('utf-8'))
+
+        return np.frombuffer(payload, dtype=meta['dtype'], offset=start).reshape(meta['shape'])
+
+
+async def benchmark(host: str, port: int, name: str, clients: int = 8, requests: int = 100) -> Dict[str, float]:
+    """
+    Measures the server's throughput and latency, using several concurrent clients that repeatedly request the same
+    table.
+    :param host: The server's host
+    :param port: The server's port
+    :param name: The name of the trajectory to request
+    :param clients: The number of concurrent clients
+    :param requests: The number of requests each client sends
+    :return: A dictionary with the total throughput (requests/s and MB/s) and the latency percentiles (ms)
+    """
+    async def run(client: TrajectoryClient):
+        latencies = []
+        size = 0
+        await client.connect()
+        for _ in range(requests):
+            start = perf_counter()
+            size += (await client.get(name)).nbytes
+            latencies.append(perf_counter() - start)
+        await client.close()
+        return latencies, size
+
+    start = perf_counter()
+    results = await asyncio.gather(*[run(TrajectoryClient(host, port)) for _ in range(clients)])
+    elapsed = perf_counter() - start
+
+    latencies = np.concatenate([r[0] for r in results]) * 1000
+    size = sum(r[1] for r in results)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+
+    return {
+        'requests_per_second': len(latencies) / elapsed,
+        'megabytes_per_second': size / elapsed / 1e6,
+        'latency_p50': p50,
+        'latency_p95': p95,
+        'latency_p99': p99
+    }
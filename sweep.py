@@ -0,0 +1,171 @@
+import numpy as np
+
+from trajectory import Trajectory
+from typing import Dict, List
+from robot import Robot
+
+
+class SweepResult:
+    """
+    A class holding the results of a robot parameter sweep. Every metric is an array shaped
+    grid_shape + (num_of_trajectories,), where grid_shape is the shape of the swept parameter grid.
+    """
+
+    def __init__(self, parameters: Dict[str, np.ndarray], metrics: Dict[str, np.ndarray], names: List[str]):
+        """
+        :param parameters: The swept parameter grid, each value an array shaped grid_shape
+        :param metrics: The calculated metrics, each value an array shaped grid_shape + (num_of_trajectories,)
+        :param names: The names of the swept trajectories
+        """
+        self.parameters = parameters
+        self.metrics = metrics
+        self.names = names
+
+    @property
+    def shape(self):
+        return next(iter(self.parameters.values())).shape
+
+    def __getitem__(self, metric: str) -> np.ndarray:
+        return self.metrics[metric]
+
+    def feasible(self) -> np.ndarray:
+        """
+        :return: A boolean array shaped grid_shape, True for the variants that can drive all of the trajectories
+        """
+        return self.metrics['feasible'].all(axis=-1)
+
+    def variants(self, mask: np.ndarray = None) -> List[Dict[str, float]]:
+        """
+        Lists the parameters of the selected variants.
+        :param mask: A boolean array shaped grid_shape selecting the variants. Defaults to the feasible variants
+        :return: A list of {parameter: value} dictionaries
+        """
+        mask = self.feasible() if mask is None else mask
+        return [
+            {name: values[index].item() for (name, values) in self.parameters.items()}
+            for index in zip(*np.nonzero(mask))
+        ]
+
+
+class RobotSweep:
+    """
+    A class that evaluates a grid of robot parameter variants against one or more trajectories, in order to answer
+    design questions like "what if the gear ratio was X". The geometry of each trajectory - the middle speed, the
+    angular speed and the sample times - doesn't depend on the robot, so it's calculated once, and all of the
+    variants are evaluated together as broadcasted arrays shaped grid_shape + (samples,).
+    The free speed of each variant is scaled from the base robot's free speed, since the wheel's free speed is
+    proportional to wheel_radius / gear_ratio.
+    """
+
+    # The robot parameters that can be swept
+    PARAMETERS = ['gear_ratio', 'wheel_radius', 'mass', 'base_width', 'num_of_drive_motors']
+
+    def __init__(self, robot: Robot, trajectories: List[Trajectory]):
+        """
+        Initializes a new sweep.
+        :param robot: The base robot profile. Every parameter that isn't swept is taken from it
+        :param trajectories: The trajectories to evaluate the variants against
+        """
+        self.robot = robot
+        self.trajectories = trajectories
+        self.geometry = [RobotSweep.trajectory_geometry(trajectory) for trajectory in trajectories]
+
+    @staticmethod
+    def trajectory_geometry(trajectory: Trajectory) -> Dict[str, np.ndarray]:
+        """
+        Calculates the robot independent geometry of a trajectory.
+        :param trajectory: The trajectory to calculate the geometry of
+        :return: A dictionary of arrays shaped (segments, samples): the sample times, the middle speed and the
+                 angular speed
+        """
+        speed = np.array(trajectory.speed(concat=False))
+        _, angular_speed = trajectory.headings()
+
+        return {
+            'time': speed[..., 0],
+            'speed': speed[..., 1],
+            'angular_speed': angular_speed.reshape(speed.shape[:2])
+        }
+
+    def grid(self, **values) -> Dict[str, np.ndarray]:
+        """
+        Creates the parameter grid out of the swept values.
+        :param values: A list of values for each swept parameter, by its name in PARAMETERS
+        :return: A dictionary of arrays shaped grid_shape, one for each parameter in PARAMETERS
+        """
+        for name in values:
+            if name not in RobotSweep.PARAMETERS:
+                raise ValueError('Unknown robot parameter: {}'.format(name))
+
+        swept = [name for name in RobotSweep.PARAMETERS if name in values]
+        mesh = np.meshgrid(*[np.atleast_1d(np.asarray(values[name], dtype=float)) for name in swept], indexing='ij')
+        shape = mesh[0].shape if len(swept) > 0 else (1,)
+        swept_values = dict(zip(swept, mesh))
+
+        return {
+            name: swept_values[name] if name in swept_values else np.full(shape, getattr(self.robot, name), dtype=float)
+            for name in RobotSweep.PARAMETERS
+        }
+
+    def evaluate(self, **values) -> SweepResult:
+        """
+        Evaluates all of the variants of the given parameter grid against the sweep's trajectories.
+        :param values: A list of values for each swept parameter, by its name in PARAMETERS
+        :return: The sweep's results, with the metrics:
+                 free_speed, max_acceleration, time_to_max - the variant's derived constants, repeated for each
+                                                             trajectory
+                 peak_wheel_speed - the highest wheel speed the trajectory requires
+                 saturation - the fraction of samples where a wheel speed is clamped to the free speed
+                 peak_wheel_acceleration - the highest wheel acceleration the trajectory requires
+                 feasible - True if no wheel speed is clamped and the wheel accelerations are reachable
+        """
+        grid = self.grid(**values)
+        g = grid['gear_ratio'][..., None, None]
+        r = grid['wheel_radius'][..., None, None]
+        m = grid['mass'][..., None, None]
+        half_width = grid['base_width'][..., None, None] / 2
+        n = grid['num_of_drive_motors'][..., None, None]
+
+        base = self.robot
+        free_speed = base.free_speed * (r / base.wheel_radius) * (base.gear_ratio / g)
+        max_acceleration = (2 * n * base.stall_torque * g) / (r * m)
+        time_to_max = 4 * free_speed / max_acceleration
+
+        metrics = {
+            'peak_wheel_speed': [],
+            'saturation': [],
+            'peak_wheel_acceleration': []
+        }
+        for geometry in self.geometry:
+            speed = geometry['speed']
+            w = geometry['angular_speed'] * half_width
+            peak_speed = np.zeros(free_speed.shape[:-2])
+            saturation = np.zeros(free_speed.shape[:-2])
+            peak_acceleration = np.zeros(free_speed.shape[:-2])
+
+            for sign in (-1, 1):
+                # The same deduction of the first sample's wheel speed as in Trajectory.robot_speeds
+                wheel = speed + sign * w
+                wheel = wheel - wheel[..., :1, :1]
+                clamped = np.clip(wheel, -free_speed, free_speed)
+                acceleration = np.gradient(clamped, axis=-1) / np.gradient(geometry['time'], axis=-1)
+
+                peak_speed = np.maximum(peak_speed, np.abs(wheel).max(axis=(-2, -1)))
+                saturation = np.maximum(saturation, (np.abs(wheel) > free_speed).mean(axis=(-2, -1)))
+                peak_acceleration = np.maximum(peak_acceleration, np.abs(acceleration).max(axis=(-2, -1)))
+
+            metrics['peak_wheel_speed'].append(peak_speed)
+            metrics['saturation'].append(saturation)
+            metrics['peak_wheel_acceleration'].append(peak_acceleration)
+
+        metrics = {name: np.stack(values, axis=-1) for (name, values) in metrics.items()}
+
+        # The derived constants only depend on the variant, and are repeated for each trajectory
+        shape = metrics['saturation'].shape
+        metrics['free_speed'] = np.broadcast_to(free_speed[..., 0, 0, None], shape).copy()
+        metrics['max_acceleration'] = np.broadcast_to(max_acceleration[..., 0, 0, None], shape).copy()
+        metrics['time_to_max'] = np.broadcast_to(time_to_max[..., 0, 0, None], shape).copy()
+        metrics['feasible'] = (metrics['saturation'] == 0) & \
+                              (metrics['peak_wheel_acceleration'] <= metrics['max_acceleration'])
+
+        return SweepResult(grid, metrics, [trajectory.name for trajectory in self.trajectories])
@@ -1,9 +1,47 @@
 import unittest
 
 from tests.test_curve import CurveTests
+from tests.test_optimizer import TangentOptimizerTests
+from tests.test_field import FieldTests
+from tests.test_waypoint import WaypointArrayTests
+from tests.test_bundle import BundleTests
+from tests.test_streaming import StreamingTests
+from tests.test_replanning import ReplannerTests
+from tests.test_compression import CompressionTests
+from tests.test_spline_evaluator import SplineEvaluatorTests
+from tests.test_convergence import ConvergenceStudyTests
+from tests.test_frame_timer import FrameTimerTests
+from tests.test_recording import RecordingTests
+from tests.test_motor import MotorModelTests
+from tests.test_spline_benchmark import SplineBenchmarkTests
+from tests.test_pipeline import PipelineTests
+from tests.test_projection import ProjectionIndexTests
+from tests.test_routine import RoutineTests
+from tests.test_planner import GridPlannerTests
+from tests.test_sweep import RobotSweepTests
 
 if __name__ == '__main__':
-    suite = unittest.makeSuite(CurveTests, 'test')
+    suite = unittest.TestSuite([
+        unittest.makeSuite(CurveTests, 'test'),
+        unittest.makeSuite(TangentOptimizerTests, 'test'),
+        unittest.makeSuite(FieldTests, 'test'),
+        unittest.makeSuite(WaypointArrayTests, 'test'),
+        unittest.makeSuite(BundleTests, 'test'),
+        unittest.makeSuite(StreamingTests, 'test'),
+        unittest.makeSuite(ReplannerTests, 'test'),
+        unittest.makeSuite(CompressionTests, 'test'),
+        unittest.makeSuite(SplineEvaluatorTests, 'test'),
+        unittest.makeSuite(ConvergenceStudyTests, 'test'),
+        unittest.makeSuite(FrameTimerTests, 'test'),
+        unittest.makeSuite(RecordingTests, 'test'),
+        unittest.makeSuite(MotorModelTests, 'test'),
+        unittest.makeSuite(SplineBenchmarkTests, 'test'),
+        unittest.makeSuite(PipelineTests, 'test'),
+        unittest.makeSuite(ProjectionIndexTests, 'test'),
+        unittest.makeSuite(RoutineTests, 'test'),
+        unittest.makeSuite(GridPlannerTests, 'test'),
+        unittest.makeSuite(RobotSweepTests, 'test')
+    ])
 
     runner = unittest.TextTestRunner()
-    runner.run(suite)
\ No newline at end of file
+    runner.run(suite)
@@ -0,0 +1,90 @@
+import unittest
+import tempfile
+import warnings
+import gc
+import os
+
+from trajectory import Trajectory
+from curve import Precision
+from waypoint import Waypoint
+from bundle import Bundle
+from robot import Robot
+
+
+class BundleTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectories = [
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5)], self.robot, 'first'),
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([-1, 3], -30, 2)], self.robot, 'second', Precision.SINGLE),
+            Trajectory([
+                Waypoint([0, 0], 0, 0),
+                Waypoint([1, 2], 45, 1.5),
+                Waypoint([2.5, 2.5], 90, 2.5)
+            ], self.robot, 'third')
+        ]
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'paths.bundle')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_roundtrip(self):
+        Bundle.write(self.filename, self.trajectories)
+        with Bundle(self.filename) as bundle:
+            self.assertEqual(bundle.names, ['first', 'second', 'third'])
+            self.assertEqual(bundle.robot().to_dict(), self.robot.to_dict())
+            for trajectory in reversed(self.trajectories):
+                expected = trajectory.table()
+                self.assertEqual(bundle.load(trajectory.name).dtype, expected.dtype)
+                self.assertEqual(bundle.load(trajectory.name).tolist(), expected.tolist())
+
+    def test_close(self):
+        Bundle.write(self.filename, self.trajectories)
+        bundle = Bundle(self.filename)
+        table = bundle.load('first')
+        with self.assertRaises(ValueError):
+            bundle.close()
+
+        del table
+        bundle.close()
+        bundle.close()
+        with self.assertRaises(ValueError):
+            bundle.load('first')
+
+        # The file is released, so it can be rewritten and deleted
+        Bundle.write(self.filename, self.trajectories[:1])
+        with Bundle(self.filename) as bundle:
+            self.assertEqual(bundle.names, ['first'])
+        os.remove(self.filename)
+
+    def test_unique_names(self):
+        with self.assertRaises(ValueError):
+            Bundle.write(self.filename, self.trajectories + self.trajectories[:1])
+
+    def test_corrupted(self):
+        Bundle.write(self.filename, self.trajectories)
+        with open(self.filename, 'rb') as file:
+            data = file.read()
+
+        for corrupted in [b'', data[:6], data[:20], b'XXXX' + data[4:]]:
+            with open(self.filename, 'wb') as file:
+                file.write(corrupted)
+
+            # A bundle that fails to open releases its file, so no unclosed file is left for the garbage collector
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter('always')
+                with self.assertRaises(ValueError):
+                    Bundle(self.filename)
+                gc.collect()
+            self.assertFalse(any(issubclass(warning.category, ResourceWarning) for warning in caught))
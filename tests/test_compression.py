@@ -0,0 +1,70 @@
+import unittest
+import tempfile
+import os
+
+from numpy import linspace as nplinspace, column_stack as npcolumns, sin as npsin, abs as npabs, nan as npnan, \
+    array as nparray
+from numpy.random import default_rng
+from compression import compress, decompress, encode_column
+from trajectory import Trajectory
+from outputs import CompressedOutput
+from waypoint import Waypoint
+from robot import Robot
+
+
+class CompressionTests(unittest.TestCase):
+    def setUp(self):
+        t = nplinspace(0, 4, 2001)
+        noise = default_rng(3316).normal(scale=10, size=len(t))
+        self.table = npcolumns([t, npsin(t) * 3, 100 * t ** 2, noise])
+        self.fields = ['time', 'smooth', 'large', 'noise']
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'table.dtc')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_error_bound(self):
+        for max_error in [1e-2, 1e-4, 1e-7]:
+            compress(self.filename, self.table, self.fields, max_error)
+            table, fields = decompress(self.filename)
+            self.assertEqual(fields, self.fields)
+            self.assertLessEqual(npabs(table - self.table).max(), max_error)
+
+    def test_per_column_error(self):
+        errors = {'time': 1e-6, 'smooth': 1e-3, 'large': 1e-1, 'noise': 1}
+        compress(self.filename, self.table, self.fields, errors)
+        table, _ = decompress(self.filename)
+        for (i, field) in enumerate(self.fields):
+            self.assertLessEqual(npabs(table[:, i] - self.table[:, i]).max(), errors[field])
+
+    def test_invalid_input(self):
+        for max_error in [0, -1e-3]:
+            with self.assertRaises(ValueError):
+                encode_column(self.table[:, 0], max_error)
+
+        column = self.table[:, 1].copy()
+        column[10] = npnan
+        with self.assertRaises(ValueError):
+            encode_column(column, 1e-3)
+
+        # The quantized codes wouldn't fit in 64 bits
+        with self.assertRaises(ValueError):
+            encode_column(self.table[:, 2], 1e-18)
+        with self.assertRaises(ValueError):
+            encode_column(nparray([0, 1e20]), 1)
+
+    def test_output(self):
+        robot = Robot(mass=60, base_width=0.7, free_speed=3.5, stall_torque=2.4, gear_ratio=10.7, wheel_radius=0.076,
+                      num_of_drive_motors=4)
+        trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5)
+        ], robot, 'compressed')
+
+        CompressedOutput(trajectory, max_error=1e-5, filename=self.filename).render()
+        table, fields = decompress(self.filename)
+        self.assertEqual(fields, Trajectory.TABLE_FIELDS)
+        self.assertLessEqual(npabs(table - trajectory.table()).max(), 1e-5)
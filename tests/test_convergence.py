@@ -0,0 +1,66 @@
+import unittest
+
+from convergence import ConvergenceStudy
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+
+
+class ConvergenceStudyTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5)
+        ], self.robot, 'studied')
+        self.study = ConvergenceStudy(self.trajectory, reference_sample_size=400, reference_length_sample_size=800)
+
+    def test_sample_sizes(self):
+        trajectory = self.study.variant(sample_size=20, length_sample_size=40)
+        self.assertEqual(len(trajectory.table()), 2 * 21)
+        self.assertEqual(len(trajectory.distance()), 2 * 21)
+        self.assertEqual(self.trajectory.sample_size, Trajectory.SAMPLE_SIZE)
+
+    def test_errors_converge(self):
+        measurements = self.study.run([10, 20, 40], [100])
+        for (coarse, fine) in zip(measurements, measurements[1:]):
+            for name in ConvergenceStudy.QUANTITIES:
+                self.assertLess(fine[name], coarse[name])
+
+    def test_recommend(self):
+        tolerance = {'position': 1e-3, 'heading': 0.1}
+        recommended = self.study.recommend(tolerance, sample_sizes=[10, 20, 40, 80], length_sample_sizes=[100])
+        for (name, value) in tolerance.items():
+            self.assertLessEqual(recommended[name], value)
+        self.assertGreater(self.study.errors(10, 100)['position'], 1e-3)
+
+        # The recommendation is the cheapest passing setting by the cost model, whatever the runtimes are
+        for measurement in self.study.run([10, 20, 40, 80], [100]):
+            if measurement['cost'] < recommended['cost']:
+                self.assertTrue(any(measurement[name] > value for (name, value) in tolerance.items()))
+        again = self.study.recommend(tolerance, sample_sizes=[80, 40, 20, 10], length_sample_sizes=[100])
+        self.assertEqual(again['sample_size'], recommended['sample_size'])
+
+        with self.assertRaises(ValueError):
+            self.study.recommend(1e-12, sample_sizes=[10], length_sample_sizes=[100])
+
+    def test_cheapest(self):
+        # Fewer samples with long length integrals cost more than more samples with short ones
+        measurements = [
+            {'sample_size': 25, 'length_sample_size': 600, 'runtime': 0.001},
+            {'sample_size': 50, 'length_sample_size': 50, 'runtime': 0.002},
+            {'sample_size': 50, 'length_sample_size': 100, 'runtime': 0.003}
+        ]
+        cheapest = ConvergenceStudy.cheapest(measurements)
+        self.assertEqual((cheapest['sample_size'], cheapest['length_sample_size']), (50, 50))
+        self.assertGreater(ConvergenceStudy.cost(25, 600), ConvergenceStudy.cost(50, 50))
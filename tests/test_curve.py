@@ -1,7 +1,8 @@
 import unittest
 
-from curve import Curve, SplineType, CurveType
-from numpy import array as nparray
+from curve import Curve, SplineType, CurveType, Precision
+from numpy import array as nparray, abs as npabs, float32
+from utils import linspace
 from math import cos, sin, radians
 
 
@@ -70,3 +71,13 @@ class CurveTests(unittest.TestCase):
 
         v1 = curve.calculate(1, CurveType.VELOCITY)[0].tolist()
         self.assertEqual(v1, self.vel[1])
+
+    def test_single_precision(self):
+        t = linspace(0, 1, samples=101)
+        single = Curve(SplineType.QUINTIC_HERMITE, self.quintic_hermite.control_points, Precision.SINGLE)
+
+        for curve_type in CurveType:
+            expected = self.quintic_hermite.calculate(t, curve_type)
+            actual = single.calculate(t, curve_type)
+            self.assertEqual(actual.dtype, float32)
+            self.assertTrue((npabs(actual - expected) <= single.error_bound(t, curve_type)).all())
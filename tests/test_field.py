@@ -0,0 +1,50 @@
+import unittest
+
+from numpy import linspace as nplinspace, column_stack as npcolumns
+from field import Field, Obstacle
+
+
+class FieldTests(unittest.TestCase):
+    def setUp(self):
+        self.field = Field(
+            width=8,
+            height=8,
+            obstacles=[
+                Obstacle(2, 3, 1, 1, name='first'),
+                Obstacle(5, 5, 0.5, 2, name='second')
+            ],
+            cell_size=0.5
+        )
+
+    def sweep(self, start, end, width: float = 0.6):
+        ys = nplinspace(start[1], end[1], 50)
+        xs = nplinspace(start[0], end[0], 50)
+        left = npcolumns([xs - width / 2, ys])
+        right = npcolumns([xs + width / 2, ys])
+        return left, right
+
+    def test_clear_path(self):
+        left, right = self.sweep((1, 0.5), (1, 7.5))
+        self.assertIsNone(self.field.first_collision(left, right))
+
+    def test_obstacle_collision(self):
+        left, right = self.sweep((2.5, 0.5), (2.5, 7.5))
+        collision = self.field.first_collision(left, right)
+        self.assertEqual(collision.obstacle.name, 'first')
+        self.assertLess(right[collision.index][1], 3)
+        self.assertGreaterEqual(right[collision.index + 1][1], 3)
+
+    def test_border_collision(self):
+        left, right = self.sweep((0.5, 0.5), (-1, 4))
+        collision = self.field.first_collision(left, right)
+        self.assertIsNone(collision.obstacle)
+        self.assertIsNone(self.field.first_collision(left, right, check_bounds=False))
+
+    def test_grid_candidates(self):
+        brute_force = Field(8, 8, self.field.obstacles, cell_size=8)
+        for end in [(6, 7.5), (2.5, 7.5), (5.2, 7.5), (-1, 4)]:
+            left, right = self.sweep((0.5, 0.5), end, width=1)
+            self.assertEqual(
+                self.field.collisions(left, right).tolist(),
+                brute_force.collisions(left, right).tolist()
+            )
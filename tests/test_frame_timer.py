@@ -0,0 +1,48 @@
+import unittest
+
+from simulation.frame_timer import FrameTimer, Phase
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class FrameTimerTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.timer = FrameTimer(capacity=10, target_fps=50, clock=self.clock)
+
+    def frame(self, events: float, draw: float, flip: float):
+        self.timer.begin()
+        for (phase, duration) in ((Phase.EVENTS, events), (Phase.DRAW, draw), (Phase.FLIP, flip)):
+            self.clock.now += duration
+            self.timer.lap(phase)
+        self.timer.end()
+
+    def test_phases(self):
+        self.frame(0.001, 0.005, 0.002)
+        durations = self.timer.frame_durations()
+        self.assertEqual(durations.shape, (1, len(Phase)))
+        self.assertAlmostEqual(durations[0, Phase.EVENTS], 0.001)
+        self.assertAlmostEqual(durations[0, Phase.DRAW], 0.005)
+        self.assertAlmostEqual(durations[0, Phase.FLIP], 0.002)
+
+    def test_ring_buffer(self):
+        for i in range(25):
+            self.frame(0, (i + 1) / 1000, 0)
+
+        durations = self.timer.frame_durations()
+        self.assertEqual(len(durations), 10)
+        self.assertAlmostEqual(durations[0, Phase.DRAW], 0.016)
+        self.assertAlmostEqual(durations[-1, Phase.DRAW], 0.025)
+
+        stats = self.timer.stats()
+        self.assertEqual(stats['frames'], 25)
+        self.assertEqual(stats['dropped'], 5)
+        self.assertAlmostEqual(stats['p50'], 20.5)
+        self.assertLessEqual(stats['p95'], stats['p99'])
+        self.assertEqual(len(self.timer.overlay_lines()), 3)
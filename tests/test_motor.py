@@ -0,0 +1,62 @@
+import unittest
+
+from numpy import array as nparray
+from motor import MotorModel
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+
+
+class MotorModelTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.motor = MotorModel()
+
+    def test_operating_points(self):
+        # Free speed without acceleration draws the free current at the nominal voltage
+        voltage, current = self.motor.voltages(self.robot, nparray([3.5, -3.5]), nparray([0, 0]))
+        self.assertAlmostEqual(voltage[0], 12)
+        self.assertAlmostEqual(voltage[1], -12)
+        self.assertAlmostEqual(current[0], 2.7)
+
+        # Stalling at the highest torque draws the stall current at the nominal voltage
+        acceleration = self.robot.num_of_drive_motors * self.robot.stall_torque * self.robot.gear_ratio / \
+            (self.robot.wheel_radius * self.robot.mass)
+        voltage, current = self.motor.voltages(self.robot, nparray([0]), nparray([acceleration]))
+        self.assertAlmostEqual(voltage[0], 12)
+        self.assertAlmostEqual(current[0], 131)
+
+    def test_feedforward(self):
+        trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5)
+        ], self.robot)
+        table = trajectory.table()
+        feedforward = self.motor.feedforward(trajectory, table)
+        self.assertEqual(feedforward.shape, (len(table), len(MotorModel.FIELDS)))
+
+        fields = Trajectory.TABLE_FIELDS
+        self.assertAlmostEqual(
+            feedforward[50, MotorModel.FIELDS.index('aleft')],
+            (table[51, fields.index('vleft')] - table[49, fields.index('vleft')]) /
+            (table[51, fields.index('time')] - table[49, fields.index('time')])
+        )
+
+        voltage = feedforward[:, [MotorModel.FIELDS.index('voltleft'), MotorModel.FIELDS.index('voltright')]]
+        limited = (abs(voltage) > 12).any(axis=1)
+        flags = feedforward[:, MotorModel.FIELDS.index('limits')].astype(int)
+        self.assertEqual(((flags & MotorModel.VOLTAGE_LIMIT) > 0).tolist(), limited.tolist())
+
+        weak = MotorModel(current_limit=1)
+        flags = weak.feedforward(trajectory, table)[:, MotorModel.FIELDS.index('limits')].astype(int)
+        self.assertTrue(((flags & MotorModel.CURRENT_LIMIT) > 0).all())
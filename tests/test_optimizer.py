@@ -0,0 +1,48 @@
+import unittest
+
+from optimizer import TangentOptimizer, CostType
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+from numpy import eye, abs as npabs
+
+
+class TangentOptimizerTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1),
+            Waypoint([2.5, 2.5], 90, 2),
+            Waypoint([3, 4.5], 10, 3)
+        ], self.robot)
+
+    def test_gradient(self):
+        for cost_type in CostType:
+            optimizer = TangentOptimizer(self.trajectory, cost_type)
+            x = optimizer.initial
+            _, gradient = optimizer.cost(x)
+            numeric = [
+                (optimizer.cost(x + e)[0] - optimizer.cost(x - e)[0]) / 2e-6
+                for e in eye(len(x)) * 1e-6
+            ]
+            self.assertLess(npabs(numeric - gradient).max(), 1e-5 * npabs(gradient).max())
+
+    def test_optimize(self):
+        optimizer = TangentOptimizer(self.trajectory, CostType.CURVATURE)
+        initial, _ = optimizer.cost(optimizer.initial)
+        x = optimizer.optimize()
+        optimized, _ = optimizer.cost(x)
+        self.assertLess(optimized, initial)
+
+        tangent_scales, curvature_scales = optimizer.split(x)
+        self.assertEqual([w.tangent_scale for w in self.trajectory.waypoints], tangent_scales.tolist())
+        self.assertEqual([w.curvature_scale for w in self.trajectory.waypoints], curvature_scales.tolist())
@@ -0,0 +1,98 @@
+import unittest
+import tempfile
+import filecmp
+import os
+
+from numpy import array_equal
+from pipeline import SampleSet, RenderPipeline
+from outputs import CSVOutput, CoefficientOutput, RecordingOutput, PlotOutput
+from trajectory import Trajectory, RobotSide
+from waypoint import Waypoint
+from curve import CurveType
+from robot import Robot
+
+
+class PipelineTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectories = [
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5)], self.robot, 'first'),
+            Trajectory([
+                Waypoint([0, 0], 0, 0),
+                Waypoint([1, 2], 45, 1.5),
+                Waypoint([2.5, 2.5], 90, 2.5)
+            ], self.robot, 'second')
+        ]
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_sample_set(self):
+        trajectory = self.trajectories[1]
+        samples = SampleSet.from_trajectory(trajectory)
+        self.assertTrue(array_equal(samples.table(), trajectory.table()))
+        self.assertTrue(array_equal(samples.curve(CurveType.POSITION), trajectory.curve(CurveType.POSITION)))
+        self.assertTrue(array_equal(
+            samples.robot_curve(CurveType.POSITION, RobotSide.LEFT),
+            trajectory.robot_curve(CurveType.POSITION, RobotSide.LEFT)
+        ))
+        self.assertEqual(len(samples.distance(concat=False)), trajectory.num_of_segments)
+        with self.assertRaises(ValueError):
+            samples.table()[0, 0] = 1
+
+        block, handle = samples.share()
+        try:
+            attached_block, attached = SampleSet.attach(handle)
+            self.assertEqual(attached.name, trajectory.name)
+            for name in SampleSet.ARRAYS:
+                self.assertTrue(array_equal(attached.arrays[name], samples.arrays[name]))
+            del attached
+            attached_block.close()
+        finally:
+            block.close()
+            block.unlink()
+
+    def test_render(self):
+        def path(directory: str, trajectory: Trajectory, extension: str) -> str:
+            return os.path.join(self.directory.name, directory, trajectory.name + extension)
+
+        os.makedirs(os.path.join(self.directory.name, 'direct'))
+        for trajectory in self.trajectories:
+            CSVOutput(trajectory, path('direct', trajectory, '.csv')).render()
+
+        pipeline = RenderPipeline([
+            (CSVOutput, {}),
+            (CoefficientOutput, {}),
+            (RecordingOutput, {'field_width': 8.23, 'field_height': 8.21, 'timestep': 0.5, 'image_format': 'bmp'}),
+            (PlotOutput, {'field_width': 8.23, 'field_height': 8.21})
+        ])
+        cwd = os.getcwd()
+        os.makedirs(os.path.join(self.directory.name, 'pipeline'))
+        os.chdir(os.path.join(self.directory.name, 'pipeline'))
+        try:
+            results = pipeline.render(self.trajectories)
+        finally:
+            os.chdir(cwd)
+
+        self.assertEqual(len(results), 2)
+        for (trajectory, result) in zip(self.trajectories, results):
+            direct = path('direct', trajectory, '.csv')
+            self.assertTrue(filecmp.cmp(direct, path('pipeline', trajectory, '.csv'), shallow=False))
+            self.assertTrue(os.path.isfile(path('pipeline', trajectory, '.coef.json')))
+            self.assertEqual(len(result[2]), int(trajectory.waypoints.times[-1] / 0.5) + 1)
+
+            # Each trajectory's plot is saved to its own file
+            self.assertTrue(os.path.isfile(path('pipeline', trajectory, '.png')))
+
+        with self.assertRaises(ValueError):
+            RenderPipeline([(Trajectory, {})])
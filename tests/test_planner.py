@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+
+from field import Field, Obstacle
+from planner import GridPlanner
+from robot import Robot
+
+
+class GridPlannerTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.offset = Field.path_offset(self.robot)
+
+    def test_free_path(self):
+        planner = GridPlanner(Field(5, 5, []), self.robot)
+        waypoints = planner.plan([1, 1], [4, 4])
+
+        self.assertEqual(len(waypoints), 2)
+        self.assertTrue(np.allclose(waypoints[0].point, np.array([1, 1]) - self.offset))
+        self.assertTrue(np.allclose(waypoints[1].point, np.array([4, 4]) - self.offset))
+        self.assertAlmostEqual(waypoints[0].angle, 45)
+        self.assertAlmostEqual(waypoints[1].time, np.hypot(3, 3) / planner.speed)
+
+    def test_path_around_obstacle(self):
+        field = Field.power_up()
+        planner = GridPlanner(field, self.robot)
+        start, goal = [0.54, 7.64], [3.13, 2.98]
+        waypoints = planner.plan(start, goal)
+
+        points = np.array([waypoint.point for waypoint in waypoints]) + self.offset
+        self.assertTrue(np.allclose(points[[0, -1]], [start, goal]))
+        for (p0, p1) in zip(points[:-1], points[1:]):
+            self.assertTrue(planner.visible(p0, p1[None, :])[0])
+
+        # Corners closer than the minimum spacing are merged
+        self.assertTrue((np.hypot(*np.diff(points, axis=0).T) >= planner.min_spacing).all())
+
+    def test_blocked(self):
+        planner = GridPlanner(Field(5, 5, [Obstacle(2, 2, 1, 1)]), self.robot)
+        with self.assertRaises(ValueError):
+            planner.plan([1, 1], [2.5, 2.5])
+        with self.assertRaises(ValueError):
+            planner.plan([2.5, 2.5], [1, 1])
+        with self.assertRaises(ValueError):
+            planner.plan([-1, 1], [1, 1])
+
+    def test_unreachable(self):
+        walls = [Obstacle(2, 2, 3, 0.2), Obstacle(2, 4.8, 3, 0.2), Obstacle(2, 2, 0.2, 3), Obstacle(4.8, 2, 0.2, 3)]
+        planner = GridPlanner(Field(7, 7, walls), self.robot)
+        self.assertIsNone(planner.plan([1, 1], [3.5, 3.5]))
@@ -0,0 +1,69 @@
+import unittest
+import numpy as np
+
+from projection import ProjectionIndex
+from trajectory import Trajectory
+from curve import CurveType, Precision
+from waypoint import Waypoint
+from robot import Robot
+
+
+class ProjectionIndexTests(unittest.TestCase):
+    def setUp(self):
+        robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        waypoints = [
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5),
+            Waypoint([3, 4], 0, 3.5),
+            Waypoint([1, 5], -90, 5)
+        ]
+        self.trajectory = Trajectory(waypoints, robot, sample_size=50)
+        self.index = ProjectionIndex(self.trajectory)
+        self.generator = np.random.default_rng(0)
+
+    def test_points_on_path(self):
+        curves = self.trajectory.curves(Precision.DOUBLE)
+        for (segment, curve) in enumerate(curves):
+            for u in [0.1, 0.37, 0.8]:
+                point = curve.calculate(u, CurveType.POSITION)[0]
+                velocity = curve.calculate(u, CurveType.VELOCITY)[0]
+                normal = np.array([-velocity[1], velocity[0]]) / np.linalg.norm(velocity)
+
+                # A point slightly to the left of the path projects back onto the path
+                projection = self.index.project(point + 0.01 * normal)
+                self.assertEqual(projection['segment'], segment)
+                self.assertAlmostEqual(projection['u'], u, places=9)
+                self.assertAlmostEqual(projection['cross_track'], 0.01, places=9)
+                self.assertTrue(np.allclose(projection['point'], point, rtol=0, atol=1e-9))
+
+    def test_brute_force(self):
+        u = np.linspace(0, 1, 5001)[np.newaxis, :]
+        dense = np.concatenate([c.calculate(u, CurveType.POSITION) for c in self.trajectory.curves(Precision.DOUBLE)])
+        points = self.generator.uniform([-3, -3], [6, 8], size=(100, 2))
+
+        projections = self.index.project(points)
+        expected = np.array([np.sqrt(((dense - point) ** 2).sum(axis=1)).min() for point in points])
+        self.assertEqual(projections['point'].shape, (100, 2))
+        self.assertTrue((projections['distance'] <= expected + 1e-12).all())
+        self.assertTrue(np.allclose(projections['distance'], expected, rtol=0, atol=1e-5))
+
+    def test_windowed(self):
+        points = self.generator.uniform([0, 0], [3, 5], size=(50, 2))
+        projections = self.index.project(points)
+        windowed = self.index.project(points, segments=projections['segment'])
+        for name in ['segment', 'u', 'distance']:
+            self.assertTrue(np.allclose(windowed[name], projections[name]))
+
+        times = self.trajectory.waypoints.times
+        segments = projections['segment']
+        self.assertTrue(((times[segments] <= projections['time']) & (projections['time'] <= times[segments + 1])).all())
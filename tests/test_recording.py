@@ -0,0 +1,54 @@
+import unittest
+import tempfile
+import pygame
+import os
+
+from outputs import RecordingOutput, record_trajectories
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+
+
+class RecordingTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectories = [
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5)], self.robot, 'first'),
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([-1, 3], -30, 2)], self.robot, 'second')
+        ]
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_frames(self):
+        output = RecordingOutput(self.trajectories[0], 8.23, 8.21, self.directory.name, timestep=0.1)
+        filenames = output.render()
+        self.assertEqual(len(filenames), 16)
+
+        first = pygame.image.load(filenames[0])
+        last = pygame.image.load(filenames[-1])
+        self.assertEqual(first.get_size(), (873, 871))
+        self.assertNotEqual(pygame.image.tostring(first, 'RGB'), pygame.image.tostring(last, 'RGB'))
+
+    def test_batch(self):
+        recordings = record_trajectories(
+            self.trajectories, 8.23, 8.21, self.directory.name, timestep=0.25, image_format='bmp', workers=2
+        )
+        self.assertEqual([len(filenames) for filenames in recordings], [7, 9])
+        for (trajectory, filenames) in zip(self.trajectories, recordings):
+            for filename in filenames:
+                self.assertTrue(os.path.isfile(filename))
+                self.assertEqual(os.path.dirname(filename), os.path.join(self.directory.name, trajectory.name))
+
+        with self.assertRaises(ValueError):
+            RecordingOutput(self.trajectories[0], 8.23, 8.21, image_format='gif')
@@ -0,0 +1,44 @@
+import unittest
+
+from replanning import Replanner, benchmark
+from trajectory import Trajectory, RobotSide
+from numpy import array as nparray, allclose
+from waypoint import Waypoint
+from robot import Robot
+
+
+class ReplannerTests(unittest.TestCase):
+    # The p99 latency budget of a single replanning query, in seconds. A query takes about 60 us, and the budget
+    # leaves a wide margin for loaded CI machines while still catching real regressions
+    LATENCY_BUDGET = 0.015
+
+    def setUp(self):
+        self.robot = Robot(mass=60, base_width=0.7, free_speed=3.5, stall_torque=2.4, gear_ratio=10.7,
+                           wheel_radius=0.076, num_of_drive_motors=4)
+        self.replanner = Replanner(self.robot)
+        self.target = Waypoint([1.5, 3], 30, 2.5)
+
+    def test_matches_trajectory(self):
+        for (pose, velocity) in [((0.2, 0.1, -10), 1.2), ((0, 0, 0), 0), ((-1, 1, 60), 2.5)]:
+            setpoints = self.replanner.replan(pose, velocity, self.target, time=0.5).copy()
+            start = self.replanner.start_waypoint(pose, velocity, self.target, 0.5)
+            trajectory = Trajectory([start, self.target], self.robot)
+
+            self.assertTrue(allclose(setpoints[:, [0, 1]], nparray(trajectory.robot_speeds(RobotSide.LEFT))))
+            self.assertTrue(allclose(setpoints[:, [0, 2]], nparray(trajectory.robot_speeds(RobotSide.RIGHT))))
+
+    def test_benchmark(self):
+        latency = benchmark(self.replanner, (0.2, 0.1, -10), 1.2, self.target, budget=ReplannerTests.LATENCY_BUDGET)
+        self.assertLess(latency['p99'], ReplannerTests.LATENCY_BUDGET)
+        self.assertLessEqual(latency['p50'], latency['p95'])
+        self.assertLessEqual(latency['p95'], latency['p99'])
+        self.assertLessEqual(latency['p99'], latency['max'])
+
+        with self.assertRaises(ValueError):
+            benchmark(self.replanner, (0.2, 0.1, -10), 1.2, self.target, iterations=10, budget=1e-9)
+
+    def test_reuses_buffers(self):
+        first = self.replanner.replan((0.2, 0.1, -10), 1.2, self.target)
+        second = self.replanner.replan((0, 0, 0), 0, self.target)
+        self.assertIs(first, second)
+        self.assertIs(second, self.replanner.setpoints)
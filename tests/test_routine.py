@@ -0,0 +1,109 @@
+import unittest
+import tempfile
+import os
+
+from numpy import allclose
+from csv import DictWriter
+from math import sqrt
+from trajectory import Trajectory, RobotSide
+from outputs import CSVOutput
+from curve import CurveType
+from waypoint import Waypoint
+from routine import Routine
+from robot import Robot
+
+
+def write_reference_csv(trajectory: Trajectory, filename: str):
+    """
+    Writes a trajectory's CSV the way CSVOutput did before it used Trajectory.table().
+    """
+    with open(filename, 'w', newline='') as file:
+        writer = DictWriter(file, fieldnames=CSVOutput.FIELDS)
+        writer.writeheader()
+
+        middle_position = trajectory.curve(CurveType.POSITION, concat=True)
+        middle_velocity = trajectory.curve(CurveType.VELOCITY, concat=True)
+        middle_acceleration = trajectory.curve(CurveType.ACCELERATION, concat=True)
+        headings = trajectory.headings()[0]
+        left_speed = trajectory.robot_speeds(RobotSide.LEFT)
+        right_speed = trajectory.robot_speeds(RobotSide.RIGHT)
+
+        for i in range(trajectory.num_of_segments * (trajectory.sample_size + 1)):
+            writer.writerow({
+                'time': left_speed[i][0],
+                'x': middle_position[i, 0],
+                'y': middle_position[i, 1],
+                'dx': middle_velocity[i, 0],
+                'dy': middle_velocity[i, 1],
+                'heading': 90 - headings[i],
+                'vleft': left_speed[i][1],
+                'vright': right_speed[i][1],
+                'acceleration': sqrt(middle_acceleration[i, 0] ** 2 + middle_acceleration[i, 1] ** 2)
+            })
+
+
+class RoutineTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+
+        # The second trajectory is the first one shifted, so the velocities in the join match
+        self.first = Trajectory([Waypoint([0, 0], 45, 0), Waypoint([1, 2], 45, 1.5)], self.robot, 'first')
+        self.second = Trajectory([Waypoint([1, 2], 45, 0), Waypoint([2, 4], 45, 1.5)], self.robot, 'second')
+
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_continuity(self):
+        self.assertEqual(Routine([self.first, self.second]).continuity_errors(), [])
+
+        shifted = Trajectory([Waypoint([1.5, 2], 45, 0), Waypoint([2, 4], 45, 1.5)], self.robot, 'shifted')
+        routine = Routine([self.first, shifted], name='broken')
+        errors = routine.continuity_errors()
+        self.assertTrue(any('positions' in error for error in errors))
+        self.assertTrue(all(error.startswith('first -> shifted') for error in errors))
+        with self.assertRaises(ValueError):
+            routine.check_continuity()
+        with self.assertRaises(ValueError):
+            routine.compile(workers=1)
+
+    def test_compile(self):
+        first, second = self.first.table(), self.second.table()
+        compiled = Routine([self.first, self.second]).compile(workers=1)
+
+        self.assertEqual(compiled.shape, (len(first) + len(second) - 1, len(Routine.FIELDS)))
+        self.assertTrue(allclose(compiled[:len(first), :-1], first))
+        self.assertTrue(allclose(compiled[len(first):, 1:-1], second[1:, 1:]))
+
+        # The second trajectory's times continue from the end of the first one
+        self.assertTrue(allclose(compiled[len(first):, 0], second[1:, 0] + first[-1, 0]))
+        self.assertTrue((compiled[1:, 0] >= compiled[:-1, 0]).all())
+        self.assertTrue((compiled[:len(first), -1] == 0).all())
+        self.assertTrue((compiled[len(first):, -1] == 1).all())
+
+    def test_csv_output(self):
+        trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5)
+        ], self.robot, 'csv')
+        expected = os.path.join(self.directory.name, 'expected.csv')
+        actual = os.path.join(self.directory.name, 'actual.csv')
+
+        write_reference_csv(trajectory, expected)
+        output = CSVOutput(trajectory, actual)
+        output.render()
+        output.file.close()
+
+        with open(expected, 'rb') as expected_file, open(actual, 'rb') as actual_file:
+            self.assertEqual(actual_file.read(), expected_file.read())
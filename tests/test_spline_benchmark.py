@@ -0,0 +1,46 @@
+import unittest
+
+from spline_benchmark import benchmark, curvature_jumps
+from trajectory import Trajectory
+from curve import SplineType
+from waypoint import Waypoint, TangentMode
+from robot import Robot
+
+
+class SplineBenchmarkTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.waypoints = [
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5),
+            Waypoint([3, 4], 0, 3.5)
+        ]
+
+    def test_spline_types(self):
+        for spline_type in SplineType:
+            trajectory = Trajectory(self.waypoints, self.robot, spline_type=spline_type)
+            table = trajectory.table()
+            self.assertEqual(table.shape, (3 * (trajectory.sample_size + 1), len(Trajectory.TABLE_FIELDS)))
+            self.assertEqual(len(curvature_jumps(trajectory)), 2)
+
+    def test_benchmark(self):
+        results = benchmark(self.waypoints, self.robot, repeats=2)
+        self.assertEqual(set(results), {spline_type.name for spline_type in SplineType})
+        self.assertAlmostEqual(results['CUBIC_HERMITE']['curvature_jump'], results['CUBIC_BEZIER']['curvature_jump'])
+        self.assertLess(results['QUINTIC_HERMITE']['curvature_jump'], results['CUBIC_HERMITE']['curvature_jump'])
+
+    def test_global_tangents(self):
+        for tangent_mode in [TangentMode.NATURAL, TangentMode.CLAMPED]:
+            for spline_type in SplineType:
+                trajectory = Trajectory(self.waypoints, self.robot, spline_type=spline_type, tangent_mode=tangent_mode)
+                self.assertLess(curvature_jumps(trajectory).max(), 1e-9)
@@ -0,0 +1,65 @@
+import unittest
+import tempfile
+import os
+
+from numpy import array as nparray, abs as npabs
+from spline_evaluator import SplineEvaluator
+from outputs import CoefficientOutput
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+from math import hypot
+
+
+class SplineEvaluatorTests(unittest.TestCase):
+    TOLERANCE = 1e-9
+
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectory = Trajectory([
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1.5),
+            Waypoint([2.5, 2.5], 90, 2.5)
+        ], self.robot, 'evaluated')
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'evaluated.coef.json')
+        CoefficientOutput(self.trajectory, self.filename).render()
+        self.evaluator = SplineEvaluator.from_json(self.filename)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_table(self):
+        table = self.trajectory.table()
+        samples = self.trajectory.sample_size + 1
+
+        for (i, row) in enumerate(table):
+            # The first derivative's scale may change between segments, so the boundary rows are evaluated in the
+            # segment they were sampled from
+            t = row[0] - 1e-12 if i % samples == samples - 1 else row[0]
+            evaluated = [
+                *self.evaluator.position(t),
+                *self.evaluator.velocity(t),
+                self.evaluator.heading(t),
+                *self.evaluator.wheel_speeds(t),
+                hypot(*self.evaluator.acceleration(t))
+            ]
+            difference = npabs(nparray(evaluated) - row[1:9])
+            difference[4] = min(difference[4], 360 - difference[4])
+            self.assertLess(difference.max(), self.TOLERANCE)
+
+    def test_clamps_to_segments(self):
+        self.assertEqual(self.evaluator.position(-1), self.evaluator.position(0))
+        self.assertEqual(self.evaluator.position(10), self.evaluator.position(2.5))
+        self.assertAlmostEqual(self.evaluator.position(2.5)[0], 2.5, delta=self.TOLERANCE)
+        self.assertAlmostEqual(self.evaluator.position(2.5)[1], 2.5, delta=self.TOLERANCE)
@@ -0,0 +1,60 @@
+import unittest
+import asyncio
+
+from streaming import TrajectoryServer, TrajectoryClient, TrajectoryServerError, benchmark
+from trajectory import Trajectory
+from waypoint import Waypoint
+from robot import Robot
+
+
+class StreamingTests(unittest.TestCase):
+    def setUp(self):
+        robot = Robot(mass=60, base_width=0.7, free_speed=3.5, stall_torque=2.4, gear_ratio=10.7, wheel_radius=0.076,
+                      num_of_drive_motors=4)
+        self.trajectory = Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5)], robot, 'first')
+
+    def test_get(self):
+        async def run():
+            server = TrajectoryServer([self.trajectory], port=0)
+            await server.start()
+            clients = [TrajectoryClient(port=server.port) for _ in range(4)]
+            await asyncio.gather(*[client.connect() for client in clients])
+
+            self.assertEqual(await clients[0].names(), ['first'])
+            tables = await asyncio.gather(*[client.get('first') for client in clients])
+            rebuilt = await clients[0].get('first', rebuild=True)
+            with self.assertRaises(KeyError):
+                await clients[1].get('missing')
+
+            stats = await benchmark('127.0.0.1', server.port, 'first', clients=2, requests=5)
+
+            await asyncio.gather(*[client.close() for client in clients])
+            await server.close()
+            return tables, rebuilt, stats
+
+        tables, rebuilt, stats = asyncio.run(run())
+        expected = self.trajectory.table().tolist()
+        for table in tables + [rebuilt]:
+            self.assertEqual(table.tolist(), expected)
+        self.assertGreater(stats['requests_per_second'], 0)
+
+    def test_failed_build(self):
+        broken = Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5)], self.trajectory.robot, 'broken')
+        broken.table = lambda: 1 / 0
+
+        async def run():
+            server = TrajectoryServer([self.trajectory, broken], port=0)
+            await server.start()
+            client = TrajectoryClient(port=server.port)
+            await client.connect()
+
+            with self.assertRaisesRegex(TrajectoryServerError, 'division by zero'):
+                await client.get('broken')
+
+            # The connection survives the failed request
+            table = await client.get('first')
+            await client.close()
+            await server.close()
+            return table
+
+        self.assertEqual(asyncio.run(run()).tolist(), self.trajectory.table().tolist())
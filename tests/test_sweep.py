@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+
+from trajectory import Trajectory, RobotSide
+from waypoint import Waypoint
+from sweep import RobotSweep
+from robot import Robot
+
+
+class RobotSweepTests(unittest.TestCase):
+    def setUp(self):
+        self.robot = Robot(
+            name='Test Robot',
+            mass=60,
+            base_width=0.7,
+            free_speed=3.5,
+            stall_torque=2.4,
+            gear_ratio=10.7,
+            wheel_radius=0.076,
+            num_of_drive_motors=4
+        )
+        self.trajectories = [
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([1, 2], 45, 1.5), Waypoint([2.5, 2.5], 90, 2.5)], self.robot,
+                       'slow'),
+            Trajectory([Waypoint([0, 0], 0, 0), Waypoint([2, 3], 30, 1)], self.robot, 'fast')
+        ]
+        self.sweep = RobotSweep(self.robot, self.trajectories)
+
+    def test_base_robot(self):
+        result = self.sweep.evaluate()
+        self.assertEqual(result.shape, (1,))
+        for name in result.metrics:
+            self.assertEqual(result[name].shape, (1, 2))
+
+        self.assertTrue(np.allclose(result['free_speed'], self.robot.free_speed))
+        self.assertTrue(np.allclose(result['max_acceleration'], self.robot.max_acceleration()))
+        self.assertTrue(np.allclose(result['time_to_max'], self.robot.time_to_max()))
+
+        for (i, trajectory) in enumerate(self.trajectories):
+            # Trajectory.robot_speeds clamps the wheel speeds to the free speed
+            speeds = np.concatenate([np.array(trajectory.robot_speeds(side))[:, 1] for side in RobotSide])
+            peak = min(result['peak_wheel_speed'][0, i], self.robot.free_speed)
+            self.assertAlmostEqual(peak, np.abs(speeds).max())
+            self.assertEqual(result['saturation'][0, i] > 0, result['peak_wheel_speed'][0, i] > self.robot.free_speed)
+
+    def test_feasible(self):
+        result = self.sweep.evaluate(gear_ratio=[4, 10.7, 40], mass=[30, 60])
+        self.assertEqual(result.shape, (3, 2))
+
+        expected = (result['saturation'] == 0) & (result['peak_wheel_acceleration'] <= result['max_acceleration'])
+        self.assertTrue((result['feasible'] == expected).all())
+        self.assertTrue((result.feasible() == expected.all(axis=-1)).all())
+
+        variants = result.variants()
+        self.assertEqual(len(variants), result.feasible().sum())
+        for variant in variants:
+            index = (
+                [4, 10.7, 40].index(variant['gear_ratio']),
+                [30, 60].index(variant['mass'])
+            )
+            self.assertTrue(result.feasible()[index])
+            self.assertEqual(variant['wheel_radius'], self.robot.wheel_radius)
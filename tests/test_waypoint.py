@@ -0,0 +1,105 @@
+import unittest
+
+from waypoint import Waypoint, WaypointArray, TangentMode
+from curve import Curve, SplineType, CurveType
+from numpy import array as nparray, allclose
+from utils import solve_tridiagonal
+import numpy as np
+
+
+class WaypointArrayTests(unittest.TestCase):
+    def setUp(self):
+        self.waypoints = [
+            Waypoint([0, 0], 0, 0),
+            Waypoint([1, 2], 45, 1, tangent_scale=1.2),
+            Waypoint([2.5, 2.5], 90, 2, curvature_scale=0.3),
+            Waypoint([3, 4.5], -10, 3)
+        ]
+        self.array = WaypointArray.from_waypoints(self.waypoints)
+
+    def test_control_points(self):
+        expected = []
+        for (p0, p1) in zip(self.waypoints[:-1], self.waypoints[1:]):
+            dist = p0.distance_to(p1)
+            expected.append([
+                p0.point,
+                p0.first_derivative(scale=p0.tangent_scale * dist),
+                p0.second_derivative(scale=p0.curvature_scale),
+                p1.point,
+                p1.first_derivative(scale=p1.tangent_scale * dist),
+                p1.second_derivative(scale=p1.curvature_scale)
+            ])
+
+        self.assertTrue(allclose(self.array.control_points(), nparray(expected), rtol=0, atol=1e-12))
+
+    def test_cubic_control_points(self):
+        quintic = self.array.control_points()
+        hermite = self.array.control_points(SplineType.CUBIC_HERMITE)
+        bezier = self.array.control_points(SplineType.CUBIC_BEZIER)
+        self.assertEqual(hermite.shape, (3, 4, 2))
+        self.assertTrue(allclose(hermite, quintic[:, [0, 3, 1, 4]]))
+
+        # Both cubic layouts describe the same curve, with the quintic curve's end points and first derivatives
+        for (h, b, q) in zip(hermite, bezier, quintic):
+            for curve_type in [CurveType.POSITION, CurveType.VELOCITY]:
+                for t in [0.0, 0.3, 1.0]:
+                    hermite_value = Curve(SplineType.CUBIC_HERMITE, h).calculate(t, curve_type)
+                    bezier_value = Curve(SplineType.CUBIC_BEZIER, b).calculate(t, curve_type)
+                    self.assertTrue(allclose(hermite_value, bezier_value, rtol=0, atol=1e-12))
+                    if t != 0.3:
+                        quintic_value = Curve(SplineType.QUINTIC_HERMITE, q).calculate(t, curve_type)
+                        self.assertTrue(allclose(hermite_value, quintic_value, rtol=0, atol=1e-12))
+
+    def test_indexing(self):
+        self.assertEqual(len(self.array), len(self.waypoints))
+        for (waypoint, expected) in zip(self.array, self.waypoints):
+            self.assertEqual(waypoint.point, expected.point)
+            self.assertEqual(waypoint.angle, expected.angle)
+            self.assertEqual(waypoint.time, expected.time)
+            self.assertEqual(waypoint.tangent_scale, expected.tangent_scale)
+            self.assertEqual(waypoint.curvature_scale, expected.curvature_scale)
+
+    def test_solve_tridiagonal(self):
+        n = 50
+        generator = np.random.default_rng(0)
+        lower, upper = generator.random(n), generator.random(n)
+        diagonal = 2 + lower + upper
+        rhs = generator.random((n, 2))
+        matrix = np.diag(diagonal) + np.diag(lower[1:], -1) + np.diag(upper[:-1], 1)
+        self.assertTrue(allclose(solve_tridiagonal(lower, diagonal, upper, rhs), np.linalg.solve(matrix, rhs)))
+        solution = solve_tridiagonal(lower, diagonal, upper, rhs[:, 0])
+        self.assertTrue(allclose(solution, np.linalg.solve(matrix, rhs[:, 0])))
+
+    def test_global_tangents(self):
+        for tangent_mode in [TangentMode.NATURAL, TangentMode.CLAMPED]:
+            for spline_type in SplineType:
+                control_points = self.array.control_points(spline_type, tangent_mode)
+                curves = [Curve(spline_type, points) for points in control_points]
+
+                # The segments are parametrized by their lengths, so the chord length derivatives are continuous
+                dist = self.array.distances()
+                for (power, curve_type) in enumerate([CurveType.POSITION, CurveType.VELOCITY, CurveType.ACCELERATION]):
+                    end = nparray([c.calculate(1.0, curve_type)[0] for c in curves[:-1]]) / dist[:-1, None] ** power
+                    start = nparray([c.calculate(0.0, curve_type)[0] for c in curves[1:]]) / dist[1:, None] ** power
+                    self.assertTrue(allclose(end, start, rtol=0, atol=1e-9))
+
+                first = curves[0].calculate(0.0, CurveType.VELOCITY)[0] / dist[0]
+                last = curves[-1].calculate(1.0, CurveType.VELOCITY)[0] / dist[-1]
+                if tangent_mode == TangentMode.CLAMPED:
+                    for (derivative, waypoint) in [(first, self.waypoints[0]), (last, self.waypoints[-1])]:
+                        direction = [np.cos(np.radians(90 - waypoint.angle)), np.sin(np.radians(90 - waypoint.angle))]
+                        self.assertTrue(allclose(derivative, direction, rtol=0, atol=1e-12))
+                else:
+                    # Natural ends have no curvature
+                    for (curve, t) in [(curves[0], 0.0), (curves[-1], 1.0)]:
+                        self.assertTrue(allclose(curve.calculate(t, CurveType.ACCELERATION)[0], 0, rtol=0, atol=1e-9))
+
+    def test_global_tangents_repeated_point(self):
+        array = WaypointArray.from_waypoints([Waypoint([0, 0], 0, 0), Waypoint([0, 0], 0, 1), Waypoint([1, 1], 0, 2)])
+        with self.assertRaises(ValueError):
+            array.control_points(tangent_mode=TangentMode.NATURAL)
+
+        single = WaypointArray.from_waypoints([Waypoint([0, 0], 0, 0)])
+        for tangent_mode in [TangentMode.NATURAL, TangentMode.CLAMPED]:
+            with self.assertRaises(ValueError):
+                single.global_derivatives(clamped=tangent_mode == TangentMode.CLAMPED)
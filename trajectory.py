@@ -1,11 +1,12 @@
 import json
 
-from numpy import array as nparray, concatenate as npconcat, cos as npcos, sin as npsin, radians as nprads
+from numpy import array as nparray, concatenate as npconcat, cos as npcos, sin as npsin, radians as nprads, \
+    column_stack as npcolumns, sqrt as npsqrt, ndarray
 from utils import angle_from_slope, linspace, clamp_to_bounds, length_integral
-from curve import Curve, SplineType, CurveType
-from waypoint import Waypoint
+from curve import Curve, SplineType, CurveType, Precision
+from waypoint import Waypoint, WaypointArray, TangentMode
 from robot import Robot
-from typing import List
+from typing import List, Union
 from enum import Enum
 from math import sqrt
 
@@ -21,22 +22,49 @@ class Trajectory:
     curves for the given robot's profile and according to the given waypoints.
     """
 
-    # The number of samples to use in the calculations
+    # The default number of samples to use in the calculations
     SAMPLE_SIZE = 100
 
-    # The number of samples to use in length calculations
+    # The default number of samples to use in length calculations
     L_SAMPLE_SIZE = 600
 
-    def __init__(self, waypoints: List[Waypoint], robot: Robot, name: str = 'generic-path'):
+    # The columns of the trajectory's output table
+    TABLE_FIELDS = ['time', 'x', 'y', 'dx', 'dy', 'heading', 'vleft', 'vright', 'acceleration']
+
+    def __init__(self,
+                 waypoints: Union[List[Waypoint], WaypointArray],
+                 robot: Robot,
+                 name: str = 'generic-path',
+                 precision: Precision = Precision.DOUBLE,
+                 sample_size: int = None,
+                 length_sample_size: int = None,
+                 spline_type: SplineType = SplineType.QUINTIC_HERMITE,
+                 tangent_mode: TangentMode = TangentMode.LOCAL):
         """
         Creates a new Trajectory.
-        :param waypoints: The waypoints the trajectory should go through
+        :param waypoints: The waypoints the trajectory should go through. Kept as a WaypointArray
         :param robot: The robot profile to use
+        :param name: The name of the trajectory
+        :param precision: The precision the curves are evaluated and the output table is stored in. Angular quantities
+                          (which divide by the squared speed) and the arc length accumulation are always calculated
+                          in double precision.
+        :param sample_size: The number of samples in each segment. Defaults to SAMPLE_SIZE
+        :param length_sample_size: The number of samples in each length integral. Defaults to L_SAMPLE_SIZE
+        :param spline_type: The spline type of the segments. The cubic splines take about half of the arithmetic of the
+                            quintic Hermite, but only match the first derivatives in the waypoints, so their curvature
+                            isn't continuous
+        :param tangent_mode: The way to set the derivatives in the waypoints. The global modes (NATURAL and CLAMPED)
+                             solve for a curvature continuous path through all of the points, for every spline type
         """
-        self.waypoints = waypoints
+        self.waypoints = waypoints if isinstance(waypoints, WaypointArray) else WaypointArray.from_waypoints(waypoints)
         self.robot = robot
         self.name = name
         self.num_of_segments = len(waypoints) - 1
+        self.precision = precision
+        self.sample_size = Trajectory.SAMPLE_SIZE if sample_size is None else sample_size
+        self.length_sample_size = Trajectory.L_SAMPLE_SIZE if length_sample_size is None else length_sample_size
+        self.spline_type = spline_type
+        self.tangent_mode = tangent_mode
 
     @classmethod
     def from_json(cls, trajectory_filename: str, robot_filename: str):
@@ -53,38 +81,43 @@ class Trajectory:
             Waypoint(
                 point=waypoint['point'],
                 angle=waypoint['heading'],
-                time=waypoint['time']
+                time=waypoint['time'],
+                tangent_scale=waypoint.get('tangent-scale', 1.5),
+                curvature_scale=waypoint.get('curvature-scale', 0.15)
             )
             for waypoint in decoded['waypoints']
         ]
         robot = Robot.from_json(robot_filename)
         name = decoded['name']
-        return cls(waypoints, robot, name)
-
-    def control_points(self):
+        return cls(
+            waypoints,
+            robot,
+            name,
+            sample_size=decoded.get('sample-size'),
+            length_sample_size=decoded.get('length-sample-size'),
+            spline_type=SplineType[decoded.get('spline-type', SplineType.QUINTIC_HERMITE.name)],
+            tangent_mode=TangentMode[decoded.get('tangent-mode', TangentMode.LOCAL.name)]
+        )
+
+    def control_points(self) -> ndarray:
         """
         Calculates the control points needed to calculate the curves.
-        :return: A list of numpy vectors holding all of the needed info for the curve.
-        """
-        lw = len(self.waypoints)
-        control_points = []
-        for i in range(lw - 1):
-            p0 = self.waypoints[i]
-            p1 = self.waypoints[i + 1]
-            dist = p0.distance_to(p1)
-
-            control_points.append(
-                nparray([
-                    p0.point,
-                    p0.first_derivative(scale=1.5 * dist),
-                    p0.second_derivative(),
-                    p1.point,
-                    p1.first_derivative(scale=1.5 * dist),
-                    p1.second_derivative()
-                ])
-            )
+        :return: A numpy array of shape (segments, 6, 2) (or (segments, 4, 2) for cubic splines) holding all of the
+                 needed info for each segment's curve.
+        """
+        return self.waypoints.control_points(self.spline_type, self.tangent_mode)
 
-        return control_points
+    def curves(self, precision: Precision = None) -> List[Curve]:
+        """
+        Creates the curves of all of the trajectory's segments.
+        :param precision: The precision to evaluate the curves in. Defaults to the trajectory's precision
+        :return: A list of curves, one for each segment
+        """
+        precision = self.precision if precision is None else precision
+        return [
+            Curve(control_points=points, spline_type=self.spline_type, precision=precision)
+            for points in self.control_points()
+        ]
 
     def curve(self, curve_type: CurveType, concat: bool = True):
         """
@@ -93,13 +126,8 @@ class Trajectory:
         :param concat: Should concat the segments or not. Default - false
         :return: A list of numpy point vectors if concat is false. Else - one huge numpy vector
         """
-        cp = self.control_points()
-
-        t = linspace(0, 1, samples=Trajectory.SAMPLE_SIZE + 1)
-        curves = [
-            Curve(control_points=points, spline_type=SplineType.QUINTIC_HERMITE).calculate(t, curve_type)
-            for points in cp
-        ]
+        t = linspace(0, 1, samples=self.sample_size + 1)
+        curves = [c.calculate(t, curve_type) for c in self.curves()]
 
         return npconcat(curves) if concat else curves
 
@@ -109,14 +137,14 @@ class Trajectory:
         :return: A numpy list of vectors [t, s(t)] for the time and speed values
         """
         velocities = self.curve(CurveType.VELOCITY, concat=False)
-        times = [w.time for w in self.waypoints]
+        times = self.waypoints.times
         speeds = [
             [
                 [
-                    (times[i + 1] - times[i]) * (j / Trajectory.SAMPLE_SIZE) + times[i],
+                    (times[i + 1] - times[i]) * (j / self.sample_size) + times[i],
                     sqrt(velocities[i][j][0] ** 2 + velocities[i][j][1] ** 2),
                 ]
-                for j in range(Trajectory.SAMPLE_SIZE + 1)
+                for j in range(self.sample_size + 1)
             ]
             for i in range(self.num_of_segments)
         ]
@@ -129,13 +157,11 @@ class Trajectory:
         in each point on the curve (theta'(t)).
         :return: A tuple consisting of the values of theta(t) and theta'(t) through the curve.
         """
-        cp = self.control_points()
+        t = linspace(0, 1, samples=self.sample_size + 1)
+        curves = self.curves()
 
-        t = linspace(0, 1, samples=Trajectory.SAMPLE_SIZE + 1)
-        curves = [Curve(control_points=points, spline_type=SplineType.QUINTIC_HERMITE) for points in cp]
-
-        dx, dy = npconcat([c.calculate(t, CurveType.VELOCITY) for c in curves]).T
-        d2x, d2y = npconcat([c.calculate(t, CurveType.ACCELERATION) for c in curves]).T
+        dx, dy = npconcat([c.calculate(t, CurveType.VELOCITY) for c in curves]).T.astype(float)
+        d2x, d2y = npconcat([c.calculate(t, CurveType.ACCELERATION) for c in curves]).T.astype(float)
 
         return angle_from_slope(dx, dy), ((d2y * dx - d2x * dy) / (dx ** 2 + dy ** 2))
 
@@ -146,14 +172,9 @@ class Trajectory:
         :param side: The side to use in the calculation
         :return: The points of the calculated curve
         """
-        coeff = (self.robot.robot_info[3] / 2) * (1 if side == RobotSide.LEFT else -1)
-        cp = self.control_points()
-
-        t = linspace(0, 1, samples=Trajectory.SAMPLE_SIZE + 1)
-        curves = [
-            Curve(control_points=points, spline_type=SplineType.QUINTIC_HERMITE)
-            for points in cp
-        ]
+        coeff = (self.robot.base_width / 2) * (1 if side == RobotSide.LEFT else -1)
+        t = linspace(0, 1, samples=self.sample_size + 1)
+        curves = self.curves()
 
         dx, dy = npconcat([c.calculate(t, CurveType.VELOCITY) for c in curves]).T
         theta = nprads(angle_from_slope(dx, dy))
@@ -172,7 +193,7 @@ class Trajectory:
         :param side: The side to use in the calculation
         :return: The speeds of the robot side
         """
-        free_speed = self.robot.chassis_info[0]
+        free_speed = self.robot.free_speed
         speed = self.speed()
         _, angular_speed = self.headings()
         index = 0 if side == RobotSide.LEFT else 1
@@ -194,18 +215,14 @@ class Trajectory:
         Calculates the distance passed by the middle of the robot through the curve.
         :return: The distance passed through the curve
         """
-        cp = self.control_points()
-        curves = [
-            Curve(control_points=points, spline_type=SplineType.QUINTIC_HERMITE)
-            for points in cp
-        ]
+        curves = self.curves(Precision.DOUBLE)
 
         seg_lengths = [
             length_integral(
                 0,
                 1,
                 lambda u: curves[i].calculate(u, CurveType.VELOCITY),
-                Trajectory.L_SAMPLE_SIZE
+                self.length_sample_size
             )
             for i in range(self.num_of_segments)
         ]
@@ -218,17 +235,41 @@ class Trajectory:
         lengths = [
             [
                 [
-                    i + j / Trajectory.SAMPLE_SIZE,
+                    i + j / self.sample_size,
                     length_integral(
                         0,
-                        j / Trajectory.SAMPLE_SIZE,
+                        j / self.sample_size,
                         lambda u: curves[i].calculate(u, CurveType.VELOCITY),
-                        Trajectory.L_SAMPLE_SIZE
+                        self.length_sample_size
                     ) + sums[i]
                 ]
-                for j in range(Trajectory.SAMPLE_SIZE + 1)
+                for j in range(self.sample_size + 1)
             ]
             for i in range(self.num_of_segments)
         ]
 
         return npconcat(lengths) if concat else lengths
+
+    def table(self) -> ndarray:
+        """
+        Calculates the trajectory's output table - one row per sample, with the columns given in TABLE_FIELDS.
+        :return: A numpy array of shape (samples, len(TABLE_FIELDS)), in the trajectory's precision
+        """
+        middle_position = self.curve(CurveType.POSITION, concat=True)
+        middle_velocity = self.curve(CurveType.VELOCITY, concat=True)
+        middle_acceleration = self.curve(CurveType.ACCELERATION, concat=True)
+        headings = self.headings()[0]
+        left_speed = nparray(self.robot_speeds(RobotSide.LEFT))
+        right_speed = nparray(self.robot_speeds(RobotSide.RIGHT))
+
+        return npcolumns([
+            left_speed[:, 0],
+            middle_position[:, 0],
+            middle_position[:, 1],
+            middle_velocity[:, 0],
+            middle_velocity[:, 1],
+            90 - headings,
+            left_speed[:, 1],
+            right_speed[:, 1],
+            npsqrt(middle_acceleration[:, 0] ** 2 + middle_acceleration[:, 1] ** 2)
+        ]).astype(self.precision.dtype)
@@ -55,8 +55,10 @@ def length_integral(t0: float, t1: float, df: Callable[[float], Any], n: int):
     f0 = hypot(df_fix(t0)[0], df_fix(t0)[1])
     fn = hypot(df_fix(t1)[0], df_fix(t1)[1])
 
-    fs1 = np.array([df_fix((t0 + (dx * 2 * k)) / n) for k in range(1, int(n / 2))])
-    fs2 = np.array([df_fix((t0 + (dx * (2 * k - 1))) / n) for k in range(1, int(n / 2) + 1)])
+    # All of the inner nodes are evaluated in a single call, as a (1, samples) time vector
+    k = np.arange(1, int(n / 2) + 1)
+    fs1 = df((t0 + dx * 2 * k[:-1] / n)[np.newaxis, :]).reshape(-1, 2)
+    fs2 = df((t0 + dx * (2 * k - 1) / n)[np.newaxis, :]).reshape(-1, 2)
 
     sum1 = 2 * np.hypot(fs1[:, 0], fs1[:, 1]).sum()
     sum2 = 4 * np.hypot(fs2[:, 0], fs2[:, 1]).sum()
@@ -102,3 +104,40 @@ def sign(x: Union[float, int, np.float]) -> int:
     :return: The sign of the input x
     """
     return int(x) and (1, -1)[x < 0]
+
+
+def solve_tridiagonal(lower: np.ndarray, diagonal: np.ndarray, upper: np.ndarray, rhs: np.ndarray) -> np.ndarray:
+    """
+    Solves a tridiagonal linear system in O(n), using the Thomas algorithm (Gaussian elimination without pivoting, so
+    the matrix should be diagonally dominant - like the matrices of spline fitting).
+    The i-th equation is: lower[i] * x[i - 1] + diagonal[i] * x[i] + upper[i] * x[i + 1] = rhs[i]
+    :param lower: The sub-diagonal, shaped (n,). lower[0] is ignored
+    :param diagonal: The main diagonal, shaped (n,)
+    :param upper: The super-diagonal, shaped (n,). upper[n - 1] is ignored
+    :param rhs: The right hand side, shaped (n,) or (n, k) for k systems with the same matrix
+    :return: The solution, shaped like rhs
+    """
+    # The elimination is inherently sequential, and on plain floats each step is far cheaper than on numpy scalars
+    a = np.asarray(lower, dtype=float).tolist()
+    b = np.asarray(diagonal, dtype=float).tolist()
+    c = np.asarray(upper, dtype=float).tolist()
+    shape = np.shape(rhs)
+    d = np.asarray(rhs, dtype=float).reshape(len(b), -1).tolist()
+    n, k = len(b), len(d[0]) if len(d) > 0 else 0
+
+    for i in range(1, n):
+        w = a[i] / b[i - 1]
+        b[i] -= w * c[i - 1]
+        previous, current = d[i - 1], d[i]
+        for j in range(k):
+            current[j] -= w * previous[j]
+
+    x = d
+    for j in range(k):
+        x[n - 1][j] /= b[n - 1]
+    for i in range(n - 2, -1, -1):
+        following, current = x[i + 1], x[i]
+        for j in range(k):
+            current[j] = (current[j] - c[i] * following[j]) / b[i]
+
+    return np.array(x, dtype=float).reshape(shape)
@@ -1,6 +1,10 @@
+import numpy as np
+
 from math import cos, sin, radians, sqrt
-from typing import List
-from utils import Point
+from typing import List, Iterator
+from utils import Point, solve_tridiagonal
+from curve import SplineType
+from enum import Enum
 
 
 class Waypoint:
@@ -8,16 +12,25 @@ class Waypoint:
     A class representing a path's waypoint
     """
 
-    def __init__(self, point: Point, angle: float, time: float):
+    def __init__(self,
+                 point: Point,
+                 angle: float,
+                 time: float,
+                 tangent_scale: float = 1.5,
+                 curvature_scale: float = 0.15):
         """
         Initialize a new Waypoint object.
         :param point: The point in R^2 where the waypoint lays
         :param angle: The robot's heading angle when in the waypoint
         :param time: The time the robot should be on the waypoint
+        :param tangent_scale: The first derivative's magnitude in the waypoint, relative to the segment's length
+        :param curvature_scale: The second derivative's magnitude in the waypoint
         """
         self.point = point
         self.angle = angle
         self.time = time
+        self.tangent_scale = tangent_scale
+        self.curvature_scale = curvature_scale
 
     def first_derivative(self, velocity: bool = False, scale: float = 1.75) -> List[float]:
         rads = radians(90 - self.angle if not velocity else self.angle)
@@ -35,3 +48,183 @@ class Waypoint:
         dx = waypoint.point[0] - self.point[0]
         dy = waypoint.point[1] - self.point[1]
         return sqrt(dx ** 2 + dy ** 2)
+
+
+class TangentMode(Enum):
+    """
+    The ways to set the derivatives of the curve in the waypoints:
+    - LOCAL - each waypoint's derivatives follow its own heading, scaled by its tangent and curvature scales
+    - NATURAL - the derivatives of a global C2 cubic spline through all of the points, with no curvature in the ends
+    - CLAMPED - like NATURAL, but the first and last waypoints' tangents follow their headings
+    In the global modes only the points (and the end headings, when clamped) are used - the tangents and curvatures in
+    the inner waypoints are solved for, so the curvature is continuous along the whole path.
+    """
+    LOCAL = 1
+    NATURAL = 2
+    CLAMPED = 3
+
+
+class WaypointArray:
+    """
+    A class holding a path's waypoints as a struct of arrays - each of the waypoints' properties is kept in one
+    contiguous numpy array, so the derivatives and control points of all segments are calculated at once.
+    """
+
+    def __init__(self,
+                 points: np.ndarray,
+                 angles: np.ndarray,
+                 times: np.ndarray,
+                 tangent_scales: np.ndarray = None,
+                 curvature_scales: np.ndarray = None):
+        """
+        Initialize a new WaypointArray object.
+        :param points: The waypoints' points in R^2, shaped (n, 2)
+        :param angles: The robot's heading angles in the waypoints, shaped (n,)
+        :param times: The times the robot should be on the waypoints, shaped (n,)
+        :param tangent_scales: The first derivatives' magnitudes, relative to the segments' lengths. Defaults to 1.5
+        :param curvature_scales: The second derivatives' magnitudes. Defaults to 0.15
+        """
+        self.points = np.asarray(points, dtype=float).reshape(-1, 2)
+        self.angles = np.asarray(angles, dtype=float)
+        self.times = np.asarray(times, dtype=float)
+
+        n = len(self.points)
+        self.tangent_scales = np.full(n, 1.5) if tangent_scales is None else np.asarray(tangent_scales, dtype=float)
+        self.curvature_scales = np.full(n, 0.15) if curvature_scales is None else \
+            np.asarray(curvature_scales, dtype=float)
+
+    @classmethod
+    def from_waypoints(cls, waypoints: List[Waypoint]):
+        """
+        Creates a new WaypointArray out of a list of waypoints.
+        :param waypoints: The list of waypoints
+        :return: A new WaypointArray instance
+        """
+        return cls(
+            points=[w.point for w in waypoints],
+            angles=[w.angle for w in waypoints],
+            times=[w.time for w in waypoints],
+            tangent_scales=[w.tangent_scale for w in waypoints],
+            curvature_scales=[w.curvature_scale for w in waypoints]
+        )
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def __getitem__(self, i: int) -> Waypoint:
+        return Waypoint(
+            point=self.points[i].tolist(),
+            angle=float(self.angles[i]),
+            time=float(self.times[i]),
+            tangent_scale=float(self.tangent_scales[i]),
+            curvature_scale=float(self.curvature_scales[i])
+        )
+
+    def __iter__(self) -> Iterator[Waypoint]:
+        return (self[i] for i in range(len(self)))
+
+    def directions(self) -> np.ndarray:
+        """
+        :return: The unit vectors in the direction of each waypoint's heading, shaped (n, 2)
+        """
+        rads = np.radians(90 - self.angles)
+        return np.array([np.cos(rads), np.sin(rads)]).T
+
+    def normals(self) -> np.ndarray:
+        """
+        :return: The unit vectors perpendicular to each waypoint's heading, shaped (n, 2)
+        """
+        rads = np.radians(90 - self.angles)
+        return np.array([-np.sin(rads), np.cos(rads)]).T
+
+    def distances(self) -> np.ndarray:
+        """
+        :return: The distances between every two consecutive waypoints, shaped (n - 1,)
+        """
+        deltas = self.points[1:] - self.points[:-1]
+        return np.sqrt(deltas[:, 0] ** 2 + deltas[:, 1] ** 2)
+
+    def global_derivatives(self, clamped: bool = False):
+        """
+        Fits a C2 cubic spline through all of the points, parametrized by the chord length (the i-th segment spans
+        the distance between its points). The slopes are the solution of the tridiagonal system of the second
+        derivative's continuity in the inner points, which is solved in O(n):
+          h_i * m_(i-1) + 2 * (h_(i-1) + h_i) * m_i + h_(i-1) * m_(i+1) = 3 * (h_i * d_(i-1) + h_(i-1) * d_i)
+        where h_i is the i-th segment's length and d_i = (p_(i+1) - p_i) / h_i is its chord direction.
+        The natural ends have no curvature: 2 * m_0 + m_1 = 3 * d_0. The clamped ends have unit tangents in the
+        direction of the end headings.
+        :param clamped: Should the ends be clamped to the end headings
+        :return: A tuple: (first_derivatives, second_derivatives), each shaped (n, 2), by the chord length
+        """
+        if len(self.points) < 2:
+            raise ValueError('A global spline needs at least 2 waypoints, got {}'.format(len(self.points)))
+
+        h = self.distances()
+        if (h <= 0).any():
+            raise ValueError('Consecutive waypoints should not share the same point')
+
+        chords = (self.points[1:] - self.points[:-1]) / h[:, None]
+        n = len(self.points)
+        lower = np.zeros(n)
+        diagonal = np.zeros(n)
+        upper = np.zeros(n)
+        rhs = np.zeros((n, 2))
+
+        lower[1:-1] = h[1:]
+        diagonal[1:-1] = 2 * (h[:-1] + h[1:])
+        upper[1:-1] = h[:-1]
+        rhs[1:-1] = 3 * (h[1:, None] * chords[:-1] + h[:-1, None] * chords[1:])
+
+        if clamped:
+            directions = self.directions()
+            diagonal[[0, -1]] = 1
+            rhs[0], rhs[-1] = directions[0], directions[-1]
+        else:
+            diagonal[[0, -1]] = 2
+            upper[0] = lower[-1] = 1
+            rhs[0], rhs[-1] = 3 * chords[0], 3 * chords[-1]
+
+        first = solve_tridiagonal(lower, diagonal, upper, rhs)
+
+        # The second derivative in the start of each segment, and in the end of the last one
+        second = np.empty((n, 2))
+        second[:-1] = (6 * chords - 4 * first[:-1] - 2 * first[1:]) / h[:, None]
+        second[-1] = (-6 * chords[-1] + 2 * first[-2] + 4 * first[-1]) / h[-1]
+
+        return first, second
+
+    def control_points(self,
+                       spline_type: SplineType = SplineType.QUINTIC_HERMITE,
+                       tangent_mode: TangentMode = TangentMode.LOCAL) -> np.ndarray:
+        """
+        Calculates the control points of all segments, in the layout of the given spline type's basis matrix. The
+        first derivatives are scaled by the segment's length, and only the quintic Hermite uses the second derivatives:
+        - QUINTIC_HERMITE: [p0, dp0, d2p0, p1, dp1, d2p1]
+        - CUBIC_HERMITE: [p0, p1, dp0, dp1]
+        - CUBIC_BEZIER: [p0, p0 + dp0 / 3, p1 - dp1 / 3, p1] - the Bézier polygon with the same end derivatives
+        In the global tangent modes, every spline type reproduces the same C2 cubic spline.
+        :param spline_type: The spline type of the segments
+        :param tangent_mode: The way to set the derivatives in the waypoints
+        :return: The control points, shaped (n - 1, 6, 2) for quintic splines and (n - 1, 4, 2) for cubic ones
+        """
+        dist = self.distances()[:, None]
+        p0, p1 = self.points[:-1], self.points[1:]
+
+        if tangent_mode == TangentMode.LOCAL:
+            directions = self.directions()
+            dp0 = directions[:-1] * (self.tangent_scales[:-1, None] * dist)
+            dp1 = directions[1:] * (self.tangent_scales[1:, None] * dist)
+            second = self.curvature_scales[:, None] * self.normals()
+            d2p0, d2p1 = second[:-1], second[1:]
+        else:
+            # The spline's derivatives are by the chord length, and each segment's parameter spans its length
+            first, second = self.global_derivatives(clamped=tangent_mode == TangentMode.CLAMPED)
+            dp0, dp1 = first[:-1] * dist, first[1:] * dist
+            d2p0, d2p1 = second[:-1] * dist ** 2, second[1:] * dist ** 2
+
+        if spline_type == SplineType.CUBIC_HERMITE:
+            return np.stack([p0, p1, dp0, dp1], axis=1)
+        if spline_type == SplineType.CUBIC_BEZIER:
+            return np.stack([p0, p0 + dp0 / 3, p1 - dp1 / 3, p1], axis=1)
+
+        return np.stack([p0, dp0, d2p0, p1, dp1, d2p1], axis=1)